@@ -0,0 +1,77 @@
+"""
+Benchmark per-sample training code over mini-batches: run eagerly and backpropagated
+vertex by vertex, or deferred in an AutoBatch and backpropagated level by level along
+the batch's own schedule, so the matching operations of all samples run as one kernel
+call in both directions.
+
+Run with:
+    python -m benchmarks.autobatch
+"""
+
+import random
+import time
+
+from src.auto import AutoBatch, Vertex, wavefront_backward
+from src.functions import add, square
+from src.nn import Linear, Sequential, Vector, tanh
+
+
+def build_model(h: int) -> Sequential:
+    return Sequential(
+        [Linear(4, h, activation=tanh)]
+        + [Linear(h, h, activation=tanh) for _ in range(2)]
+        + [Linear(h, 1)]
+    )
+
+
+def batch_loss(model: Sequential, X: list, y: list) -> Vertex:
+    # Written per sample, as in main.py
+    losses = []
+    for x_j, y_j in zip(X, y):
+        x = Vector([Vertex(v, requires_grad=False) for v in x_j])
+        losses.append(square(model(x)[0] - y_j))
+    return add(*losses)
+
+
+def eager(model: Sequential, X: list, y: list) -> Vertex:
+    loss = batch_loss(model, X, y)
+    loss.backward()
+    return loss
+
+
+def autobatch(model: Sequential, X: list, y: list) -> Vertex:
+    with AutoBatch() as batch:
+        loss = batch_loss(model, X, y)
+    wavefront_backward(loss, levels=batch.levels)
+    return loss
+
+
+def train(step, model: Sequential, X: list, y: list, batch_size: int) -> float:
+    begin = time.perf_counter()
+    for j in range(0, len(X), batch_size):
+        loss = step(model, X[j : j + batch_size], y[j : j + batch_size])
+        loss.zero_grad()
+    return time.perf_counter() - begin
+
+
+def main():
+    random.seed(42)
+    n = 512
+    X = [[random.uniform(-1, 1) for _ in range(4)] for _ in range(n)]
+    y = [random.uniform(-1, 1) for _ in range(n)]
+
+    print(f"{'batch':<8}{'eager':>14}{'autobatch':>14}{'speedup':>10}")
+    for batch_size in (8, 32, 128):
+        times = [
+            min(train(step, build_model(16), X, y, batch_size) for _ in range(3))
+            for step in (eager, autobatch)
+        ]
+        rates = [n / t for t in times]
+        print(
+            f"{batch_size:<8}{rates[0]:>10,.0f} s/s{rates[1]:>10,.0f} s/s"
+            f"{times[0] / times[1]:>9.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""
+Benchmark peak memory and time of a training step with and without checkpointing.
+
+Run with:
+    python -m benchmarks.checkpoint
+"""
+
+import time
+import tracemalloc
+
+from src.functions import square
+from src.nn import Linear, Sequential, Vector, relu
+
+
+def build_model(h: int, checkpoint: int | None) -> Sequential:
+    return Sequential(
+        [Linear(1, h, activation=relu)]
+        + [Linear(h, h, activation=relu) for _ in range(8)]
+        + [Linear(h, 1)],
+        checkpoint=checkpoint,
+    )
+
+
+def step(model: Sequential) -> tuple[float, float, float]:
+    x = Vector([0.5], requires_grad=False)
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    loss = square(model(x)[0] - 1.0)
+    retained, _ = tracemalloc.get_traced_memory()
+    loss.backward()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    loss.zero_grad()
+    return elapsed, retained, peak
+
+
+def main():
+    h = 32
+
+    print(
+        f"{'checkpoint':<12}{'graph (KiB)':>13}{'peak (KiB)':>12}{'time (ms)':>12}"
+        f"{'saved':>10}{'recomputed':>12}"
+    )
+    for checkpoint in (None, 1, 2, 5):
+        model = build_model(h, checkpoint)
+        elapsed, retained, peak = step(model)
+        stats = model.checkpoint_stats
+        print(
+            f"{str(checkpoint):<12}{retained / 1024:>13,.0f}{peak / 1024:>12,.0f}"
+            f"{1e3 * elapsed:>12.2f}"
+            f"{stats.saved_vertices:>10}{stats.recomputed_vertices:>12}"
+        )
+
+
+if __name__ == "__main__":
+    main()
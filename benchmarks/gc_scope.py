@@ -0,0 +1,123 @@
+"""
+Benchmark garbage collection and allocations of training loops, as in main.py, with
+the default collector settings, in a training_scope, and with a VertexPool.
+
+The one-off collection on entering the training_scope is not included.
+
+Run with:
+    python -m benchmarks.gc_scope
+"""
+
+import gc
+import random
+import time
+
+from src.auto import StaticGraph, Vertex, VertexPool, training_scope
+from src.functions import square
+from src.nn import SGD, Linear, Matrix, Sequential, Vector, relu
+
+
+class GCMonitor:
+    def __init__(self) -> None:
+        self.collections = 0
+        self.pause_time = 0.0
+        self._start = 0.0
+
+    def __call__(self, phase: str, info: dict) -> None:
+        if phase == "start":
+            self._start = time.perf_counter()
+        else:
+            self.collections += 1
+            self.pause_time += time.perf_counter() - self._start
+
+
+def build_model(h: int) -> Sequential:
+    return Sequential(
+        [Linear(1, h, activation=relu)]
+        + [Linear(h, h, activation=relu) for _ in range(8)]
+        + [Linear(h, 1)]
+    )
+
+
+def train_static(X: Matrix, y: Vector, pool: VertexPool | None) -> None:
+    model = build_model(10)
+    opt = SGD(model.parameters, nu=0.001)
+
+    x_j, y_j = Vector([0.0]), Vertex(0.0)
+    graph = StaticGraph(square(model(x_j)[0] - y_j), inputs=[*x_j, y_j])
+    for j in range(len(X)):
+        graph(*X[j], y[j])
+        graph.backward()
+        opt.step()
+        graph.zero_grad()
+
+
+def train_dynamic(X: Matrix, y: Vector, pool: VertexPool | None) -> None:
+    model = build_model(10)
+    opt = SGD(model.parameters, nu=0.001)
+
+    for j in range(len(X)):
+        if pool is None:
+            loss = square(model(X[j])[0] - y[j])
+            loss.backward()
+        else:
+            with pool:
+                loss = square(model(X[j])[0] - y[j])
+                loss.backward()
+        opt.step()
+        loss.zero_grad()
+        if pool is not None:
+            pool.reset()
+
+
+def main():
+    random.seed(42)
+    n = 2000
+    # A large, long-lived dataset, which every full collection scans again
+    X = Matrix([[random.uniform(-1, 1)] for _ in range(n)], requires_grad=False)
+    y = Vector([random.uniform(-1, 1) for _ in range(n)], requires_grad=False)
+    data = [Vertex(random.random(), requires_grad=False) for _ in range(200_000)]
+
+    monitor = GCMonitor()
+    gc.callbacks.append(monitor)
+
+    print(
+        f"{'workload':<10}{'mode':<8}{'time (ms)':>11}{'collections':>13}"
+        f"{'gc (ms)':>10}{'new/all vertices':>18}"
+    )
+    for name, train in (("static", train_static), ("dynamic", train_dynamic)):
+        for mode in ("default", "scope", "pool"):
+            if mode == "pool" and train is train_static:
+                continue
+            pool = VertexPool() if mode == "pool" else None
+            scope = training_scope() if mode != "default" else None
+
+            gc.collect()
+            if scope is None:
+                monitor.collections, monitor.pause_time = 0, 0.0
+                start = time.perf_counter()
+                train(X, y, pool)
+                elapsed = time.perf_counter() - start
+            else:
+                with scope:
+                    monitor.collections, monitor.pause_time = 0, 0.0
+                    start = time.perf_counter()
+                    train(X, y, pool)
+                    elapsed = time.perf_counter() - start
+
+            allocated = (
+                ""
+                if pool is None
+                else f"{pool.allocated:,}/{pool.allocated + pool.reused:,}"
+            )
+            print(
+                f"{name:<10}{mode:<8}{1e3 * elapsed:>11.0f}{monitor.collections:>13}"
+                f"{1e3 * monitor.pause_time:>10.1f}{allocated:>18}"
+            )
+
+    gc.callbacks.remove(monitor)
+    del data
+
+
+if __name__ == "__main__":
+    main()
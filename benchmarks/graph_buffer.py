@@ -0,0 +1,68 @@
+"""
+Benchmark shipping a recorded graph: pickling its vertices, against serialising it
+to a GraphBuffer. Times dumping, loading the buffer (zero-copy views) and rebuilding
+the vertices, and compares sizes. Pickling deep graphs fails outright.
+
+Run with:
+    python -m benchmarks.graph_buffer
+"""
+
+import pickle
+import sys
+import time
+from functools import partial
+
+from src.auto import GraphBuffer, Vertex
+from src.functions import square
+from src.nn import Linear, Sequential, Vector, tanh
+
+
+def build_loss(h: int) -> Vertex:
+    model = Sequential(
+        [Linear(4, h, activation=tanh)]
+        + [Linear(h, h, activation=tanh) for _ in range(2)]
+        + [Linear(h, 1)]
+    )
+    x = Vector([Vertex(v) for v in (0.1, -0.2, 0.3, -0.4)])
+    return square(model(x)[0] - 0.5)
+
+
+def timed(fn) -> tuple[float, object]:
+    best = float("inf")
+    for _ in range(5):
+        begin = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - begin)
+    return best, result
+
+
+def main():
+    print(f"{'graph':<10}{'format':<10}{'kB':>10}{'dump ms':>10}{'load ms':>10}")
+    for h in (16, 64):
+        loss = build_loss(h)
+
+        dump, data = timed(partial(pickle.dumps, loss))
+        load, _ = timed(partial(pickle.loads, data))
+        print(f"{f'h={h}':<10}{'pickle':<10}{len(data) / 1e3:>10.1f}", end="")
+        print(f"{1e3 * dump:>10.2f}{1e3 * load:>10.2f}")
+
+        dump, data = timed(lambda loss=loss: GraphBuffer.from_graph(loss).tobytes())
+        view, buffer = timed(partial(GraphBuffer, data))
+        load, _ = timed(buffer.to_graph)
+        print(f"{'':<10}{'buffer':<10}{len(data) / 1e3:>10.1f}", end="")
+        print(f"{1e3 * dump:>10.2f}{1e3 * load:>10.2f}")
+        print(f"{'':<10}{'views':<10}{'':>10}{'':>10}{1e3 * view:>10.3f}")
+
+    z = Vertex(1.0)
+    for _ in range(sys.getrecursionlimit() * 10):
+        z = z * 1.0001
+    try:
+        pickle.dumps(z)
+        print("\npickling a deep chain succeeded")
+    except RecursionError:
+        print("\npickling a deep chain: RecursionError")
+    print(f"serialising it: {GraphBuffer.from_graph(z)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Benchmark re-evaluating a large graph after changing a single leaf: rebuilding it,
+replaying the whole StaticGraph, or recomputing only the affected IncrementalGraph
+region (forward and backward).
+
+Run with:
+    python -m benchmarks.incremental
+"""
+
+import random
+import time
+
+from src.auto import IncrementalGraph, StaticGraph, Vertex
+from src.functions import add, exp, mult, sin, square
+
+
+def build(xs: list[Vertex], w: Vertex) -> Vertex:
+    return mult(add(*[square(sin(x * w) + exp(x)) for x in xs]), w)
+
+
+def main():
+    random.seed(42)
+    n = 5_000
+    updates = 200
+    values = [random.uniform(-1, 1) for _ in range(n)]
+    changes = [(random.randrange(n), random.uniform(-1, 1)) for _ in range(updates)]
+
+    xs = [Vertex(v) for v in values]
+    w = Vertex(0.7)
+    start = time.perf_counter()
+    for i, value in changes:
+        xs[i] = Vertex(value)
+        z = build(xs, w)
+        z.backward()
+        z.zero_grad()
+    rebuild = time.perf_counter() - start
+
+    xs = [Vertex(v) for v in values]
+    graph = StaticGraph(build(xs, w), inputs=xs)
+    start = time.perf_counter()
+    for i, value in changes:
+        xs[i].value = value
+        graph.forward()
+        graph.backward()
+        graph.zero_grad()
+    replay = time.perf_counter() - start
+
+    xs = [Vertex(v) for v in values]
+    graph = IncrementalGraph(build(xs, w))
+    graph.backward()
+    start = time.perf_counter()
+    for i, value in changes:
+        graph.set(xs[i], value)
+        graph.recompute()
+        graph.backward()
+    incremental = time.perf_counter() - start
+
+    print(f"{'mode':<14}{'ms / update':>12}")
+    for name, elapsed in (
+        ("rebuild", rebuild),
+        ("static", replay),
+        ("incremental", incremental),
+    ):
+        print(f"{name:<14}{1e3 * elapsed / updates:>12.3f}")
+
+
+if __name__ == "__main__":
+    main()
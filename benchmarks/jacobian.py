@@ -0,0 +1,52 @@
+"""
+Benchmark a full Jacobian from one backward per output versus the batched jacobian.
+
+Run with:
+    python -m benchmarks.jacobian
+"""
+
+import random
+import time
+
+from src.auto import jacobian
+from src.nn import Linear, Sequential, Vector, tanh
+
+
+def jacobian_per_output(model: Sequential, point: list[float]) -> list[list[float]]:
+    x = Vector(point)
+    outputs = model(x)
+
+    rows = []
+    for y in outputs:
+        y.backward(retain_graph=True)
+        rows.append([v.grad for v in x])
+        y.zero_grad()
+    return rows
+
+
+def main():
+    random.seed(42)
+    n = 20
+    repeats = 10
+    point = [random.uniform(-1, 1) for _ in range(n)]
+
+    print(f"{'shape':<10}{'per-output (ms)':>18}{'batched (ms)':>15}")
+    for m in (1, 5, 20, 50):
+        model = Sequential([Linear(n, 20, activation=tanh), Linear(20, m)])
+
+        start = time.perf_counter()
+        for _ in range(repeats):
+            jacobian_per_output(model, point)
+        mid = time.perf_counter()
+        for _ in range(repeats):
+            jacobian(lambda *x, model=model: model(Vector(x)), point)
+        end = time.perf_counter()
+
+        print(
+            f"{f'{m}x{n}':<10}{1e3 * (mid - start) / repeats:>18.2f}"
+            f"{1e3 * (end - mid) / repeats:>15.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
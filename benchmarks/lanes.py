@@ -0,0 +1,71 @@
+"""
+Benchmark a mini-batch training step recorded once per sample, against recording it
+once per mini-batch with every vertex holding one value per sample (LaneBatch).
+
+Run with:
+    python -m benchmarks.lanes
+"""
+
+import random
+import time
+
+from src.auto import LaneBatch, Vertex
+from src.functions import square
+from src.nn import SGD, Linear, Sequential, Vector, relu
+from src.nn.components.Sequential import _flatten
+
+
+def build_model(h: int) -> Sequential:
+    return Sequential(
+        [Linear(4, h, activation=relu)]
+        + [Linear(h, h, activation=relu) for _ in range(2)]
+        + [Linear(h, 1)]
+    )
+
+
+def per_sample(model: Sequential, X: list, y: list) -> None:
+    for x_j, y_j in zip(X, y):
+        x = Vector([Vertex(v, requires_grad=False) for v in x_j])
+        square(model(x)[0] - y_j).backward()
+
+
+def lanes(model: Sequential, X: list, y: list) -> None:
+    with LaneBatch() as batch:
+        x = Vector([batch.lanes(column) for column in zip(*X)])
+        loss = square(model(x)[0] - batch.lanes(y))
+    loss.backward()
+
+
+def train(step, model: Sequential, X: list, y: list, batch_size: int) -> float:
+    opt = SGD(model.parameters, nu=0.001)
+    parameters = _flatten(model.parameters)
+    begin = time.perf_counter()
+    for j in range(0, len(X), batch_size):
+        step(model, X[j : j + batch_size], y[j : j + batch_size])
+        opt.step()
+        for p in parameters:
+            p.grad = 0
+    return time.perf_counter() - begin
+
+
+def main():
+    random.seed(42)
+    n = 1024
+    X = [[random.uniform(-1, 1) for _ in range(4)] for _ in range(n)]
+    y = [random.uniform(-1, 1) for _ in range(n)]
+
+    print(f"{'batch':<8}{'per-sample':>14}{'lanes':>14}{'speedup':>10}")
+    for batch_size in (8, 32, 128):
+        times = []
+        for step in (per_sample, lanes):
+            random.seed(0)
+            times.append(train(step, build_model(16), X, y, batch_size))
+        rates = [n / t for t in times]
+        print(
+            f"{batch_size:<8}{rates[0]:>10,.0f} s/s{rates[1]:>10,.0f} s/s"
+            f"{times[0] / times[1]:>9.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Benchmark starting up a compiled training step: compiling the graph from scratch,
+or loading its program from the on-disk cache as a later process would. Also times
+training with CachedStep, which records the first steps and then replays.
+
+Run with:
+    python -m benchmarks.program_cache
+"""
+
+import random
+import tempfile
+import time
+
+from src.auto import CachedStep, CompiledGraph, ProgramCache, Vertex
+from src.functions import square
+from src.nn import SGD, Linear, Sequential, Vector, relu
+
+
+def build_model(h: int) -> Sequential:
+    return Sequential(
+        [Linear(1, h, activation=relu)]
+        + [Linear(h, h, activation=relu) for _ in range(8)]
+        + [Linear(h, 1)]
+    )
+
+
+def loss_fn(model: Sequential):
+    return lambda x, y: square(model(Vector([x]))[0] - y)
+
+
+def start(model: Sequential, cache: ProgramCache | None) -> float:
+    begin = time.perf_counter()
+    x, y = Vertex(0.0), Vertex(0.0)
+    CompiledGraph(loss_fn(model)(x, y), inputs=[x, y], cache=cache)
+    return time.perf_counter() - begin
+
+
+def train(step, opt: SGD, xs: list[float], ys: list[float]) -> float:
+    begin = time.perf_counter()
+    for x, y in zip(xs, ys):
+        step(x, y)
+        opt.step()
+        step.zero_grad()
+    return time.perf_counter() - begin
+
+
+class Recorded:
+    # Records and backpropagates through the graph on every call
+    def __init__(self, model: Sequential) -> None:
+        self.fn = loss_fn(model)
+        self.loss: Vertex | None = None
+
+    def __call__(self, x: float, y: float) -> None:
+        self.loss = self.fn(Vertex(x), Vertex(y))
+        self.loss.backward()
+
+    def zero_grad(self) -> None:
+        self.loss.zero_grad()
+
+
+def main():
+    random.seed(42)
+    n = 500
+    xs = [random.uniform(-1, 1) for _ in range(n)]
+    ys = [random.uniform(-1, 1) for _ in range(n)]
+
+    with tempfile.TemporaryDirectory() as directory:
+        cold = start(build_model(10), None)
+        start(build_model(10), ProgramCache(directory))
+        warm = start(build_model(10), ProgramCache(directory))
+
+    print(f"{'start':<10}{'ms':>10}")
+    print(f"{'cold':<10}{1e3 * cold:>10.1f}")
+    print(f"{'warm':<10}{1e3 * warm:>10.1f}")
+    print()
+
+    print(f"{'mode':<10}{'steps/s':>10}")
+    for name, make in (
+        ("recorded", Recorded),
+        ("cached", lambda m: CachedStep(loss_fn(m))),
+    ):
+        model = build_model(10)
+        elapsed = train(make(model), SGD(model.parameters, nu=0.001), xs, ys)
+        print(f"{name:<10}{n / elapsed:>10,.0f}")
+
+
+if __name__ == "__main__":
+    main()
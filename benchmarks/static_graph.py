@@ -0,0 +1,82 @@
+"""
+Benchmark per-sample training steps which rebuild the graph versus replaying a StaticGraph
+or a CompiledGraph.
+
+Run with:
+    python -m benchmarks.static_graph
+"""
+
+import random
+import time
+
+from src.auto import CompiledGraph, StaticGraph, Vertex
+from src.functions import square
+from src.nn import SGD, Linear, Sequential, Vector, relu
+
+
+def build_model(h: int) -> Sequential:
+    return Sequential(
+        [Linear(1, h, activation=relu)]
+        + [Linear(h, h, activation=relu) for _ in range(8)]
+        + [Linear(h, 1)]
+    )
+
+
+def train_dynamic(model: Sequential, xs: list[float], ys: list[float]) -> float:
+    opt = SGD(model.parameters, nu=0.001)
+
+    start = time.perf_counter()
+    for x, y in zip(xs, ys):
+        loss = square(model(Vector([x]))[0] - y)
+        loss.backward()
+        opt.step()
+        loss.zero_grad()
+    return time.perf_counter() - start
+
+
+def train_static(model: Sequential, xs: list[float], ys: list[float]) -> float:
+    opt = SGD(model.parameters, nu=0.001)
+
+    start = time.perf_counter()
+    x_ph, y_ph = Vertex(0.0), Vertex(0.0)
+    graph = StaticGraph(square(model(Vector([x_ph]))[0] - y_ph), inputs=[x_ph, y_ph])
+    for x, y in zip(xs, ys):
+        graph(x, y)
+        graph.backward()
+        opt.step()
+        graph.zero_grad()
+    return time.perf_counter() - start
+
+
+def train_compiled(model: Sequential, xs: list[float], ys: list[float]) -> float:
+    opt = SGD(model.parameters, nu=0.001)
+
+    start = time.perf_counter()
+    x_ph, y_ph = Vertex(0.0), Vertex(0.0)
+    graph = CompiledGraph(square(model(Vector([x_ph]))[0] - y_ph), inputs=[x_ph, y_ph])
+    for x, y in zip(xs, ys):
+        graph(x, y)
+        graph.backward()
+        opt.step()
+        graph.zero_grad()
+    return time.perf_counter() - start
+
+
+def main():
+    random.seed(42)
+    n = 500
+    xs = [random.uniform(-1, 1) for _ in range(n)]
+    ys = [random.uniform(-1, 1) for _ in range(n)]
+
+    print(f"{'mode':<10}{'steps/s':>12}")
+    for name, train in (
+        ("dynamic", train_dynamic),
+        ("static", train_static),
+        ("compiled", train_compiled),
+    ):
+        elapsed = train(build_model(10), xs, ys)
+        print(f"{name:<10}{n / elapsed:>12,.0f}")
+
+
+if __name__ == "__main__":
+    main()
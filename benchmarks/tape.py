@@ -0,0 +1,60 @@
+"""
+Benchmark per-sample training steps recorded as a linked graph versus on a Tape.
+
+Run with:
+    python -m benchmarks.tape
+"""
+
+import random
+import time
+from contextlib import nullcontext
+
+from src.auto import Tape
+from src.functions import square
+from src.nn import SGD, Linear, Sequential, Vector, relu
+
+
+def train(
+    model: Sequential, xs: list[Vector], ys: list[float], use_tape: bool
+) -> tuple[float, float]:
+    opt = SGD(model.parameters, nu=0.001)
+
+    forward = backward = 0.0
+    for x, y in zip(xs, ys):
+        start = time.perf_counter()
+        with Tape() if use_tape else nullcontext():
+            loss = square(model(x)[0] - y)
+        mid = time.perf_counter()
+        loss.backward()
+        loss.zero_grad()
+        end = time.perf_counter()
+
+        opt.step()
+        forward += mid - start
+        backward += end - mid
+    return forward, backward
+
+
+def main():
+    random.seed(42)
+    h = 10
+    n = 500
+    xs = [Vector([random.uniform(-1, 1)]) for _ in range(n)]
+    ys = [random.uniform(-1, 1) for _ in range(n)]
+
+    print(f"{'mode':<8}{'forward (ms)':>15}{'backward (ms)':>15}{'steps/s':>12}")
+    for name, use_tape in (("graph", False), ("tape", True)):
+        model = Sequential(
+            [Linear(1, h, activation=relu)]
+            + [Linear(h, h, activation=relu) for _ in range(8)]
+            + [Linear(h, 1)]
+        )
+        forward, backward = train(model, xs, ys, use_tape)
+        print(
+            f"{name:<8}{1e3 * forward / n:>15.3f}{1e3 * backward / n:>15.3f}"
+            f"{n / (forward + backward):>12,.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
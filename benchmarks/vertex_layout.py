@@ -0,0 +1,58 @@
+"""
+Benchmark the memory footprint and construction rate of Vertex objects.
+
+Compares the current slotted Vertex against a replica of the previous
+__dict__ based layout, where every leaf allocated its own backward closure.
+
+Run with:
+    python -m benchmarks.vertex_layout
+"""
+
+import timeit
+import tracemalloc
+
+from src.auto import Vertex
+
+
+class DictVertex:
+    """Replica of the Vertex layout prior to the introduction of __slots__."""
+
+    def __init__(self, value, _parents=None, _backward=None):
+        self.value = value
+        self.grad = 0
+        self._parents = tuple() if _parents is None else _parents
+        self._backward = lambda *args: (
+            tuple(0.0 for _ in range(len(args))) if _backward is None else _backward
+        )
+        self._topo_sort = None
+
+
+def bytes_per_vertex(cls: type, n: int = 100_000) -> float:
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    vertices = [cls(float(i)) for i in range(n)]
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    # Exclude the list holding the vertices
+    list_bytes = vertices.__sizeof__()
+    return (after - before - list_bytes) / n
+
+
+def construction_rate(cls: type, n: int = 100_000, repeat: int = 5) -> float:
+    best = min(
+        timeit.repeat(lambda: [cls(1.0) for _ in range(n)], number=1, repeat=repeat)
+    )
+    return n / best
+
+
+def main():
+    print(f"{'layout':<12}{'bytes/vertex':>15}{'vertices/s':>15}")
+    for name, cls in (("dict", DictVertex), ("slots", Vertex)):
+        print(
+            f"{name:<12}{bytes_per_vertex(cls):>15.1f}{construction_rate(cls):>15,.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Benchmark backpropagating through a chain of matrix products, vertex by vertex or
+level by level with one batched kernel call per Function and level.
+
+Run with:
+    python -m benchmarks.wavefront
+"""
+
+import random
+import time
+
+from src.auto import Vertex, dependency_levels, wavefront_backward
+from src.functions import add, square
+from src.nn import Matrix
+
+
+def build(n: int) -> tuple[Vertex, list[Vertex]]:
+    a, b, c = (
+        Matrix([[random.uniform(-1, 1) for _ in range(n)] for _ in range(n)])
+        for _ in range(3)
+    )
+    out = (a @ b) @ c
+    loss = add(*[square(v) for row in out for v in row])
+    return loss, [v for m in (a, b, c) for row in m for v in row]
+
+
+def main():
+    random.seed(42)
+    n = 30
+    repeats = 20
+
+    loss, leaves = build(n)
+    levels = dependency_levels(loss)
+    widths = [sum(map(len, level.values())) for level in levels]
+    print(f"{len(levels)} levels, widths {widths}")
+
+    start = time.perf_counter()
+    for _ in range(repeats):
+        loss.backward(retain_graph=True)
+    vertexwise = time.perf_counter() - start
+    expected = [v.grad for v in leaves]
+
+    for v in leaves:
+        v.grad = 0
+    start = time.perf_counter()
+    for _ in range(repeats):
+        wavefront_backward(loss, retain_graph=True)
+    wavefront = time.perf_counter() - start
+    error = max(abs(v.grad - g) for v, g in zip(leaves, expected))
+
+    for v in leaves:
+        v.grad = 0
+    start = time.perf_counter()
+    for _ in range(repeats):
+        wavefront_backward(loss, retain_graph=True, levels=levels)
+    scheduled = time.perf_counter() - start
+
+    print(f"{'mode':<22}{'ms / backward':>14}")
+    for name, elapsed in (
+        ("vertex by vertex", vertexwise),
+        ("wavefront", wavefront),
+        ("wavefront, reused", scheduled),
+    ):
+        print(f"{name:<22}{1e3 * elapsed / repeats:>14.3f}")
+    print(f"max gradient difference {error:.2e}")
+
+
+if __name__ == "__main__":
+    main()
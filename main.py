@@ -3,7 +3,7 @@ import random
 
 import matplotlib.pyplot as plt
 
-from src.auto import Vertex
+from src.auto import StaticGraph, Vertex, no_grad, training_scope
 from src.functions import square
 from src.nn import Adam, Linear, Matrix, Sequential, Vector, relu, He, MomentumSGD
 
@@ -26,30 +26,37 @@ def linear_data_gen_experiment():
     random.seed(42)
     m = 5
     n = 10_000
-    X = Matrix([[random.uniform(-1, 1) for _ in range(m)] for _ in range(n)])
+    X = Matrix(
+        [[random.uniform(-1, 1) for _ in range(m)] for _ in range(n)],
+        requires_grad=False,
+    )
 
-    beta = Vector([random.gauss(-1, 1) for _ in range(m)])
-    noise = Vector([random.gauss(0, 0.1) for _ in range(n)])
+    beta = Vector([random.gauss(-1, 1) for _ in range(m)], requires_grad=False)
+    noise = Vector([random.gauss(0, 0.1) for _ in range(n)], requires_grad=False)
     y = X @ beta + noise
 
     model = Sequential([Linear(m, 1, bias=False)])
 
     opt = MomentumSGD(model.parameters, nu=0.01, momentum=0.9)
 
+    # Build the per-sample graph once over placeholders, and replay it for each sample
+    x_j = Vector([0.0] * m)
+    y_j = Vertex(0.0)
+    loss = loss_fn(model(x_j)[0], y_j) / n
+    graph = StaticGraph(loss, inputs=[*x_j, y_j])
+
     epochs = 100
-    for i in range(1, epochs + 1):
-        loss_total = 0
-        for j in range(n):
-            pred_j = model(X[j])[0]
-            loss = loss_fn(pred_j, y[j])
-            loss = loss / n
-            loss_total += loss.value
+    with training_scope():
+        for i in range(1, epochs + 1):
+            loss_total = 0
+            for j in range(n):
+                loss_total += graph(*X[j], y[j])
 
-            loss.backward()
-            opt.step()
-            loss.zero_grad()
+                graph.backward()
+                opt.step()
+                graph.zero_grad()
 
-        print(f"{i} / {epochs} - {loss_total=}")
+            print(f"{i} / {epochs} - {loss_total=}")
 
     print("True Parameter - Learned Parameter")
     for true_param, learned_param in zip(beta, model.parameters["0"]["W"][0]):
@@ -69,7 +76,7 @@ def non_linear_data_gen_experiment():
     """
     random.seed(42)
     n = 1000
-    X = Matrix([[random.uniform(-1, 1)] for i in range(n)])
+    X = Matrix([[random.uniform(-1, 1)] for i in range(n)], requires_grad=False)
 
     def f(X: float) -> float:
         if X < 0:
@@ -77,8 +84,8 @@ def non_linear_data_gen_experiment():
         else:
             return math.exp(1.5 * X) * math.sin(10 * X)
 
-    y = Vector([f(X[i][0].value) for i in range(n)])
-    noise = Vector([random.gauss(0, 0.1) for _ in range(n)])
+    y = Vector([f(X[i][0].value) for i in range(n)], requires_grad=False)
+    noise = Vector([random.gauss(0, 0.1) for _ in range(n)], requires_grad=False)
     y = y + noise
 
     h = 10
@@ -99,20 +106,24 @@ def non_linear_data_gen_experiment():
 
     opt = Adam(model.parameters, nu=0.001, beta_1=0.9, beta_2=0.999)
 
+    # Build the per-sample graph once over placeholders, and replay it for each sample
+    x_j = Vector([0.0])
+    y_j = Vertex(0.0)
+    loss = loss_fn(model(x_j)[0], y_j) / n
+    graph = StaticGraph(loss, inputs=[*x_j, y_j])
+
     epochs = 100
-    for i in range(1, epochs + 1):
-        loss_total = 0
-        for j in range(n):
-            pred_j = model(X[j])[0]
-            loss = loss_fn(pred_j, y[j])
-            loss = loss / n
-            loss_total += loss.value
+    with training_scope():
+        for i in range(1, epochs + 1):
+            loss_total = 0
+            for j in range(n):
+                loss_total += graph(*X[j], y[j])
 
-            loss.backward()
-            opt.step()
-            loss.zero_grad()
+                graph.backward()
+                opt.step()
+                graph.zero_grad()
 
-        print(f"{i} / {epochs} - {loss_total=}")
+            print(f"{i} / {epochs} - {loss_total=}")
 
     plt.figure(figsize=(10, 6))
     plt.style.use("seaborn-v0_8-notebook")
@@ -139,7 +150,8 @@ def non_linear_data_gen_experiment():
     )
 
     # Plot the model's predictions
-    ys_pred = [model(Vector([x]))[0].value for x in xs_curve]
+    with no_grad():
+        ys_pred = [model(Vector([x]))[0].value for x in xs_curve]
     plt.plot(
         xs_curve,
         ys_pred,
@@ -0,0 +1,187 @@
+from typing import ClassVar, Self
+
+import src.auto.grad_mode as grad_mode
+from src.auto.DualLevel import DualLevel
+from src.auto.Function import _DISCARDED, Context, Function
+from src.auto.Tape import Tape
+from src.auto.Vertex import Vertex
+from src.auto.wavefront import Levels
+
+# Function.__call__ outside of any batch
+_CALL = Function.__dict__["__call__"]
+
+
+def _deferred_call(cls: type[Function], *args: Vertex) -> Vertex:
+    # Function.__call__ while a batch is active, forward mode still runs eagerly
+    if DualLevel._active is not None:
+        return _CALL.__func__(cls, *args)
+    return AutoBatch._active.defer(cls, args)
+
+
+class AutoBatch:
+    """
+    A scope which defers function applications, to run them in batches on exit.
+
+    While an AutoBatch is active, each function application is recorded with its
+    parents and context, but without computing its value. On exit, the deferred
+    applications are grouped by depth (one past the deepest deferred parent), then
+    by Function, and every group is computed by a single `forward_batch` call. So
+    per-sample code looping over a mini-batch records B isomorphic subgraphs whose
+    matching operations, all at the same depth, are computed together.
+
+    The scope installs its own `Function.__call__` on entry and restores the
+    original on exit, so calls outside of a batch do not check for one.
+
+    The recorded graph is an ordinary linked graph. `wavefront_backward` batches its
+    backward the same way, grouping by dependency level and Function, while
+    `Vertex.backward` still works vertex by vertex. After a run, `levels` holds the
+    batch's own groups as a schedule for `wavefront_backward`, which then does not
+    need to sort the graph again. The schedule covers every recorded application of
+    the batch, so is only meant for roots which all of them lead to (e.g. the loss
+    summed over the batch), and is None if the batch depends on applications
+    recorded outside of it.
+
+    Values of deferred vertices are None until the batch runs, so code inside the
+    scope must not branch on them. Call `run` to compute them early.
+
+    Example:
+        with AutoBatch() as batch:
+            loss = add(*(loss_fn(model(Vector(X[j]))[0], y[j]) for j in samples))
+        wavefront_backward(loss, levels=batch.levels)
+    """
+
+    # Batch that function applications are currently deferred to, if any
+    _active: ClassVar["AutoBatch | None"] = None
+
+    def __init__(self) -> None:
+        """
+        Initialize an empty batch scope.
+        """
+        # Deferred applications and their depth (one past the deepest deferred
+        # parent), and those which are not recorded
+        self._depth: dict[Vertex, int] = {}
+        self._constants: list[Vertex] = []
+
+        # Per depth, the deferred applications grouped by Function
+        self._levels: Levels = []
+
+        # Whether no deferred application has a parent recorded outside the batch
+        self._closed = True
+
+        # Recorded applications of the last run as a `wavefront_backward` schedule,
+        # None if their graph reaches applications recorded outside the batch
+        self.levels: Levels | None = None
+
+        # Number of forward_batch calls, and of applications they computed
+        self.n_kernels = 0
+        self.n_applied = 0
+
+    def __repr__(self) -> str:
+        return (
+            f"{type(self).__name__}(n_kernels={self.n_kernels}, "
+            f"n_applied={self.n_applied})"
+        )
+
+    def __enter__(self) -> Self:
+        if AutoBatch._active is not None:
+            raise ValueError("AutoBatch scopes cannot be nested.")
+        AutoBatch._active = self
+        Function.__call__ = classmethod(_deferred_call)
+        return self
+
+    def __exit__(self, exc_type, *exc_info) -> None:
+        Function.__call__ = _CALL
+        AutoBatch._active = None
+        if exc_type is None:
+            self.run()
+        else:
+            self._release()
+
+    def defer(self, op: type[Function], args: tuple[Vertex, ...]) -> Vertex:
+        """
+        Record a function application whose value is computed when the batch runs.
+
+        Args:
+            op: Function to apply
+            args: Input vertices
+
+        Returns:
+            Vertex: Output vertex, whose value is None until the batch runs
+        """
+        if Tape._active is not None:
+            raise ValueError("Deferred applications cannot be recorded on a tape.")
+
+        recorded = False
+        if grad_mode.enabled:
+            for v in args:
+                if v.requires_grad:
+                    recorded = True
+                    break
+
+        if recorded:
+            z = Vertex(None, True, args, op, Context() if op.saves else _DISCARDED)
+        else:
+            # Parents are only kept until the batch runs
+            z = Vertex(None, False, args, op, _DISCARDED)
+            self._constants.append(z)
+
+        # Parents recorded outside the batch are ready, i.e. at depth -1
+        get = self._depth.get
+        d = 0
+        for v in args:
+            e = get(v)
+            if e is None:
+                if v._op is not None or v._tape is not None:
+                    self._closed = False
+            elif e >= d:
+                d = e + 1
+        self._depth[z] = d
+
+        levels = self._levels
+        if d == len(levels):
+            levels.append({})
+        group = levels[d].get(op)
+        if group is None:
+            levels[d][op] = [z]
+        else:
+            group.append(z)
+
+        return z
+
+    def run(self) -> None:
+        """
+        Compute the values of all deferred applications, one kernel call per group.
+        """
+        levels = self._levels
+        for level in levels:
+            for op, group in level.items():
+                op.forward_batch(group)
+                self.n_kernels += 1
+        self.n_applied += len(self._depth)
+
+        # The schedule lists the levels closest to the roots first
+        if not self._closed:
+            self.levels = None
+        elif self._constants:
+            self.levels = []
+            for level in reversed(levels):
+                recorded = {}
+                for op, group in level.items():
+                    group = [u for u in group if u.requires_grad]
+                    if group:
+                        recorded[op] = group
+                self.levels.append(recorded)
+        else:
+            self.levels = levels[::-1]
+        self._release()
+
+    def _release(self) -> None:
+        # Drop the parents of vertices which are not recorded
+        for u in self._constants:
+            u._parents = ()
+            u._op = None
+            u._ctx = None
+        self._constants = []
+        self._depth = {}
+        self._levels = []
+        self._closed = True
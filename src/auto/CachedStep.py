@@ -0,0 +1,123 @@
+from collections.abc import Callable
+
+from src.auto.CompiledGraph import CompiledGraph
+from src.auto.compiler import _Layout
+from src.auto.ProgramCache import ProgramCache
+from src.auto.Vertex import Vertex
+
+
+class CachedStep:
+    """
+    A training step which switches to a compiled program once its graph is stable.
+
+    Each call records `fn` on fresh input vertices holding the given values, and
+    backpropagates through the recorded graph as usual. Once `warmup` consecutive
+    calls record structurally identical graphs with the same constant values, or
+    as soon as the cache already holds the program for a graph without constants
+    (e.g. from a previous run), the graph is compiled and later calls replay it
+    without recording anything.
+
+    Replaying assumes the structure of the graph does not depend on the values
+    passed in (no data-dependent control flow), and that all data which varies
+    between calls is passed as an argument. Data captured as a constant (e.g. a
+    sample closed over by fn) which changes during warmup keeps the step recording,
+    since the compiled graph would hold on to the first values.
+
+    Example:
+        step = CachedStep(lambda *xy: loss_fn(model(Vector(xy[:-1]))[0], xy[-1]))
+        for j in range(n):
+            step(*X[j], y[j])  # parameter gradients accumulate
+            opt.step()
+            step.zero_grad()
+    """
+
+    def __init__(
+        self,
+        fn: Callable[..., Vertex],
+        cache: ProgramCache | None = None,
+        warmup: int = 2,
+    ) -> None:
+        """
+        Initialize a step which records fn until its graph is found to be stable.
+
+        Args:
+            fn: Function of one Vertex per input, returning a scalar Vertex
+            cache: Cache to look up and store compiled programs in
+            warmup: Number of consecutive identical graphs before compiling
+        """
+        if warmup < 1:
+            raise ValueError(f"Warmup must be at least one call, got {warmup}.")
+
+        self.fn = fn
+        self.cache = cache
+        self.warmup = warmup
+
+        # Compiled graph, once the recorded graphs were found to be stable
+        self.graph: CompiledGraph | None = None
+
+        # Fingerprint and constant values of the last recorded graph, and how many
+        # calls in a row had them
+        self._fingerprint: str | None = None
+        self._constants: tuple[float, ...] = ()
+        self._streak = 0
+        self._root: Vertex | None = None
+
+        # Number of calls which recorded fn
+        self.n_recorded = 0
+
+    def __repr__(self) -> str:
+        return (
+            f"{type(self).__name__}(compiled={self.graph is not None}, "
+            f"n_recorded={self.n_recorded})"
+        )
+
+    def __call__(self, *values: float | Vertex) -> float:
+        """
+        Evaluate fn on the given values, and accumulate its parameter gradients.
+
+        Args:
+            *values: One value per input of fn
+
+        Returns:
+            float: Value of fn
+        """
+        if self.graph is not None:
+            value = self.graph(*values)
+            self.graph.backward()
+            return value
+
+        inputs = [Vertex(x.value if isinstance(x, Vertex) else x) for x in values]
+        root = self.fn(*inputs)
+        self.n_recorded += 1
+
+        layout = _Layout(root, inputs, None)
+        key = layout.fingerprint()
+        constants = tuple(v.value for v in layout.constants)
+        if key == self._fingerprint and constants == self._constants:
+            self._streak += 1
+        else:
+            self._fingerprint = key
+            self._constants = constants
+            self._streak = 1
+
+        # A cached program is only trusted on sight if no constant could vary
+        if self._streak >= self.warmup or (
+            self.cache is not None and not constants and key in self.cache
+        ):
+            self.graph = CompiledGraph(root, inputs, cache=self.cache)
+            self._root = None
+            self.graph.backward()
+            return root.value
+
+        root.backward()
+        self._root = root
+        return root.value
+
+    def zero_grad(self) -> None:
+        """
+        Reset the parameter gradients of the last call to zero.
+        """
+        if self.graph is not None:
+            self.graph.zero_grad()
+        elif self._root is not None:
+            self._root.zero_grad()
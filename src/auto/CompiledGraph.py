@@ -0,0 +1,132 @@
+from collections.abc import Sequence
+
+import src.auto.grad_mode as grad_mode
+from src.auto.compiler import _Layout, load
+from src.auto.ProgramCache import ProgramCache
+from src.auto.StaticGraph import StaticGraph
+from src.auto.Vertex import Vertex
+
+
+class CompiledGraph(StaticGraph):
+    """
+    A static graph compiled to a straight-line Python function.
+
+    The recorded graph is translated once into Python source with one local
+    variable per vertex (see `src.auto.compiler`), computing the root value and
+    the gradients of the parameters without any per-vertex dispatch. Only the
+    value of the root is written back, intermediate vertices keep their recorded
+    values.
+
+    Parameters are the leaves requiring gradients other than the inputs, and are
+    read on every call, so optimisers can update them in place. Constants are read
+    once when compiling, so are assumed not to be modified afterwards.
+
+    With a `ProgramCache`, the program is looked up by the structural fingerprint
+    of the graph, so recompiling the same architecture (e.g. in a later process)
+    skips generating and compiling its source.
+
+    Example:
+        x = Vector([0.0] * m)
+        y = Vertex(0.0)
+        graph = CompiledGraph(loss_fn(model(x)[0], y), inputs=[*x, y])
+
+        for j in range(n):
+            graph(*X[j], y[j])
+            graph.backward()
+            opt.step()
+            graph.zero_grad()
+    """
+
+    def __init__(
+        self,
+        root: Vertex,
+        inputs: Sequence[Vertex],
+        wrt: Sequence[Vertex] | None = None,
+        cache: ProgramCache | None = None,
+    ) -> None:
+        """
+        Initialize a compiled graph from a recorded root vertex.
+
+        Args:
+            root: Output vertex of the recorded graph
+            inputs: Placeholder leaf vertices which are fed on each call
+            wrt: Leaves to compute gradients for, by default the parameters
+            cache: Cache to look the program up in by structural fingerprint, and
+                to store it in if missing, rather than always compiling it
+        """
+        super().__init__(root, inputs)
+
+        # Gradients of the inputs are not computed unless asked for, so are dead code
+        self._layout = _Layout(root, self.inputs, wrt)
+        self.parameters = tuple(self._layout.parameters)
+        self.wrt = tuple(self._layout.wrt)
+        self._constants = tuple(v.value for v in self._layout.constants)
+
+        if cache is None:
+            self.fingerprint = None
+            program = self.source
+        else:
+            self.fingerprint = self._layout.fingerprint()
+            program = cache.get(self.fingerprint)
+            if program is None:
+                program = compile(self.source, "<compiled graph>", "exec")
+                cache.put(self.fingerprint, program)
+        self._value, self._value_and_grad = load(program, self._layout.bindings())
+
+        # Gradients computed alongside the last forward, until backward consumes them
+        self._grads: tuple[float, ...] | None = None
+
+    @property
+    def source(self) -> str:
+        """
+        Python source of the compiled `value` and `value_and_grad` functions.
+        """
+        return self._layout.source()
+
+    def forward(self) -> float:
+        """
+        Evaluate the compiled function from the current leaf values.
+
+        With gradients enabled, the gradients are computed in the same call, and
+        accumulated into the leaves by the following backward.
+
+        Returns:
+            float: Value of the root
+        """
+        inputs = tuple(v.value for v in self.inputs)
+        parameters = tuple(v.value for v in self.parameters)
+        if grad_mode.enabled:
+            value, self._grads = self._value_and_grad(
+                inputs, parameters, self._constants
+            )
+        else:
+            value = self._value(inputs, parameters, self._constants)
+            self._grads = None
+
+        self.root.value = value
+        return value
+
+    def backward(self) -> None:
+        """
+        Accumulate the gradients of the root into the `wrt` leaves.
+
+        Uses the gradients computed by the last forward, or evaluates the compiled
+        function again if that forward did not compute them (e.g. under `no_grad`).
+        """
+        grads = self._grads
+        if grads is None:
+            _, grads = self._value_and_grad(
+                tuple(v.value for v in self.inputs),
+                tuple(v.value for v in self.parameters),
+                self._constants,
+            )
+        for v, g in zip(self.wrt, grads):
+            v.grad += g
+        self._grads = None
+
+    def zero_grad(self) -> None:
+        """
+        Reset the gradients of the `wrt` leaves to zero.
+        """
+        for v in self.wrt:
+            v.grad = 0
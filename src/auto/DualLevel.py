@@ -0,0 +1,92 @@
+import typing
+from typing import ClassVar, Self
+
+if typing.TYPE_CHECKING:
+    from src.auto.Function import Context, Function
+    from src.auto.Vertex import Vertex
+
+
+class DualLevel:
+    """
+    A forward-mode scope in which vertices carry a tangent alongside their value.
+
+    While a DualLevel is active, `Function.__call__` evaluates each function's
+    tangent rule together with its forward computation, i.e. values behave as dual
+    numbers. No graph is recorded, so a Jacobian-vector product costs a single
+    forward pass. Vertices without a tangent are treated as constants.
+
+    Example:
+        with DualLevel() as level:
+            x = level.make_dual(2.0, 1.0)
+            y = f(x)
+        dy = level.tangent(y)
+    """
+
+    # Level that Function.__call__ currently propagates tangents in, if any
+    _active: ClassVar["DualLevel | None"] = None
+
+    def __init__(self) -> None:
+        """
+        Initialize a forward-mode scope without any tangents.
+        """
+        self.tangents: dict["Vertex", float] = {}
+        self._previous: DualLevel | None = None
+
+    def __enter__(self) -> Self:
+        self._previous = DualLevel._active
+        DualLevel._active = self
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        DualLevel._active = self._previous
+        self._previous = None
+
+    def make_dual(self, value: "float | Vertex", tangent: float) -> "Vertex":
+        """
+        Create a vertex carrying the given tangent.
+
+        Args:
+            value: Primal value, or a vertex to read it from
+            tangent: Tangent (direction) of the primal
+
+        Returns:
+            Vertex: New leaf vertex with an associated tangent
+        """
+        from src.auto.Vertex import Vertex
+
+        v = Vertex(value.value if isinstance(value, Vertex) else value)
+        self.tangents[v] = tangent
+        return v
+
+    def tangent(self, v: "Vertex") -> float:
+        """
+        Get the tangent of a vertex.
+
+        Args:
+            v: Vertex computed within this level
+
+        Returns:
+            float: Tangent of the vertex, zero for constants
+        """
+        return self.tangents.get(v, 0.0)
+
+    def push(
+        self,
+        op: type["Function"],
+        ctx: "Context",
+        args: tuple["Vertex", ...],
+        out: "Vertex",
+    ) -> None:
+        """
+        Propagate tangents through the application of a function.
+
+        Args:
+            op: Function which was applied
+            ctx: Context populated by the function's forward
+            args: Input vertices
+            out: Resulting vertex
+        """
+        tangents = self.tangents
+        dargs = tuple(tangents.get(v, 0.0) for v in args)
+        if any(dargs):
+            tangents[out] = op.tangent(ctx, dargs, *args)
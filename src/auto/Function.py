@@ -1,12 +1,59 @@
 from abc import ABC, abstractmethod
 import typing
-from typing import overload
+from typing import ClassVar, overload
+
+import src.auto.grad_mode as grad_mode
+from src.auto.DualLevel import DualLevel
+from src.auto.LaneBatch import LaneBatch
+from src.auto.Tape import Tape
 
 if typing.TYPE_CHECKING:
     # Avoid circular depdency, since Vertex needs to implement Functions
     from src.auto.Vertex import Vertex
 
 
+class Context:
+    """
+    Per-application storage shared between a Function's forward and backward.
+
+    Forward can stash intermediates (including its own output value) with
+    `save_for_backward`, so that backward does not need to recompute them.
+    """
+
+    __slots__ = ("saved",)
+
+    def __init__(self) -> None:
+        """
+        Initialize an empty context.
+        """
+        self.saved: tuple = ()
+
+    def save_for_backward(self, *values) -> None:
+        """
+        Save values computed during forward for use in backward.
+
+        Args:
+            *values: Values to save, available as `ctx.saved`
+        """
+        self.saved = values
+
+
+class _Discarded(Context):
+    """
+    A shared context whose contents are never read, so saving into it is a no-op.
+    """
+
+    __slots__ = ()
+
+    def save_for_backward(self, *values) -> None:
+        pass
+
+
+# Context handed to forward when nothing is recorded, or when the Function saves
+# nothing for backward
+_DISCARDED = _Discarded()
+
+
 class Function(ABC):
     """
     Abstract base class for differentiable functions in the autodiff system.
@@ -15,6 +62,28 @@ class Function(ABC):
     the mechanism for forward and backward propagation in the computational graph.
     """
 
+    # Whether compiled graphs may run the function on their own temporary vertices,
+    # False for functions which share state with the vertices they were recorded on
+    compilable: ClassVar[bool] = True
+
+    # Whether backward returns the partial derivatives with respect to the inputs.
+    # False for functions which send their gradients as a side effect, so only a
+    # full backward through the graph supports them, not grad or jacobian
+    partials: ClassVar[bool] = True
+
+    # Whether applications to the same parents compute the same value, so that
+    # common subexpression elimination may merge them. False for functions whose
+    # context decides what they compute
+    mergeable: ClassVar[bool] = True
+
+    # Whether forward saves values for backward, applications of functions which
+    # save nothing share one empty context rather than allocating their own
+    saves: ClassVar[bool] = True
+
+    # Whether forward rebuilds the context from the inputs alone, so that serialised
+    # graphs may be loaded without storing contexts
+    serialisable: ClassVar[bool] = True
+
     @classmethod
     def __call__(cls, *args: "Vertex") -> "Vertex":
         """
@@ -22,7 +91,10 @@ class Function(ABC):
 
         This method:
         1. Performs the forward computation
-        2. Sets up the computational graph for backpropagation
+        2. Sets up the computational graph (or tape entry) for backpropagation,
+           unless recording is disabled by `no_grad` or no input requires gradients,
+           or propagates tangents when a forward-mode `DualLevel` is active
+           (or applies the function to all lanes when a `LaneBatch` is active)
         3. Returns the resulting Vertex
 
         Args:
@@ -31,21 +103,56 @@ class Function(ABC):
         Returns:
             Vertex: Result of the function application
         """
-        z = cls.forward(*args)
+        level = DualLevel._active
+        if level is not None:
+            # Forward-mode: propagate tangents instead of recording a graph
+            ctx = Context() if cls.saves else _DISCARDED
+            z = cls.forward(ctx, *args)
+            z.requires_grad = False
+            level.push(cls, ctx, args, z)
+            return z
+
+        batch = LaneBatch._active
+        if batch is not None:
+            return batch.apply(cls, args)
+
+        if not grad_mode.enabled:
+            z = cls.forward(_DISCARDED, *args)
+            z.requires_grad = False
+            return z
+
+        for v in args:
+            if v.requires_grad:
+                break
+        else:
+            # Nothing upstream needs gradients, so the result is a constant
+            z = cls.forward(_DISCARDED, *args)
+            z.requires_grad = False
+            return z
+
+        ctx = Context() if cls.saves else _DISCARDED
+        z = cls.forward(ctx, *args)
 
-        # Add parents and backwards function for backprop
-        z._parents = args
-        z._backward = cls.backward
+        tape = Tape._active
+        if tape is not None:
+            # Record onto the flat tape rather than linking the graph
+            tape.record(cls, args, z, ctx)
+        else:
+            # Add parents, the producing function and its context for backprop
+            z._parents = args
+            z._op = cls
+            z._ctx = ctx
 
         return z
 
     @staticmethod
     @abstractmethod
-    def forward(*args: "Vertex") -> "Vertex":
+    def forward(ctx: Context, *args: "Vertex") -> "Vertex":
         """
         Perform the forward computation of the function.
 
         Args:
+            ctx: Context to save intermediates for backward into
             *args: Input Vertex objects
 
         Returns:
@@ -53,16 +160,130 @@ class Function(ABC):
         """
         raise NotImplementedError
 
+    @classmethod
+    def forward_batch(cls, vertices: list["Vertex"]) -> None:
+        """
+        Compute the values of several deferred applications of this function.
+
+        Used by `AutoBatch`, which hands all ready applications of a function to a
+        single call, and by `StaticGraph` to recompute values in place. Each vertex
+        already holds its parents and context, and gets its value set. Defaults to
+        looping over forward, subclasses override this with a kernel which sets the
+        values directly rather than creating a vertex each.
+
+        Args:
+            vertices: Deferred outputs of this function, none of which depends on
+                another
+        """
+        forward = cls.forward
+        for u in vertices:
+            u.value = forward(u._ctx, *u._parents).value
+
     @staticmethod
     @abstractmethod
-    def backward(*args: "Vertex") -> tuple[float, ...]:
+    def backward(ctx: Context, *args: "Vertex") -> tuple[float, ...]:
         """
         Compute the gradients of the function with respect to its inputs.
 
         Args:
+            ctx: Context holding the intermediates saved during forward
             *args: Input Vertex objects
 
         Returns:
             tuple[float, ...]: Gradients with respect to each input
         """
         raise NotImplementedError
+
+    @classmethod
+    def backward_batch(cls, vertices: list["Vertex"]) -> None:
+        """
+        Send the gradients of several applications of this function to their inputs.
+
+        Used by the level-synchronous backward, which hands all applications of a
+        function within one dependency level to a single call. Defaults to looping
+        over backward, subclasses override this with a kernel which reads the input
+        values directly rather than dispatching to backward per vertex.
+
+        Args:
+            vertices: Outputs of this function, none of which depends on another
+        """
+        backward = cls.backward
+        for u in vertices:
+            g = u.grad
+            for v, node_grad in zip(u._parents, backward(u._ctx, *u._parents)):
+                if v.requires_grad:
+                    v.grad += g * node_grad
+
+    @classmethod
+    def tangent(
+        cls, ctx: Context, tangents: tuple[float, ...], *args: "Vertex"
+    ) -> float:
+        """
+        Compute the tangent of the output from the tangents of the inputs (forward-mode).
+
+        Defaults to contracting the input tangents with the partial derivatives
+        from backward. Subclasses override this with a direct rule.
+
+        Args:
+            ctx: Context holding the intermediates saved during forward
+            tangents: Tangent of each input
+            *args: Input Vertex objects
+
+        Returns:
+            float: Tangent of the output
+        """
+        return sum(t * d for t, d in zip(tangents, cls.backward(ctx, *args)))
+
+    @staticmethod
+    def backward_graph(
+        ctx: Context, out: "Vertex", *args: "Vertex"
+    ) -> tuple["Vertex | float", ...]:
+        """
+        Compute the gradients with respect to each input as Vertex operations.
+
+        Used for higher order derivatives (e.g. Hessian-vector products), since the
+        resulting gradients are themselves part of a differentiable graph.
+
+        Args:
+            ctx: Context holding the intermediates saved during forward
+            out: Output vertex of this function application
+            *args: Input Vertex objects
+
+        Returns:
+            tuple[Vertex | float, ...]: Gradients with respect to each input,
+                plain floats for constant gradients
+        """
+        raise NotImplementedError(
+            "Function does not implement backward_graph, so cannot be differentiated twice."
+        )
+
+    @staticmethod
+    def forward_source(*args: str) -> str | None:
+        """
+        Give a Python expression for the output value, used to compile graphs.
+
+        The expression may use the `math` module. Functions without a source form
+        return None, in which case compiled graphs call forward instead.
+
+        Args:
+            *args: Variable names holding the value of each input
+
+        Returns:
+            str | None: Expression for the output value
+        """
+        return None
+
+    @staticmethod
+    def backward_source(out: str, *args: str) -> tuple[str, ...] | None:
+        """
+        Give Python expressions for the gradients with respect to each input.
+
+        Args:
+            out: Variable name holding the output value
+            *args: Variable names holding the value of each input
+
+        Returns:
+            tuple[str, ...] | None: Expression for the gradient with respect to each
+                input, or None if compiled graphs should call backward instead
+        """
+        return None
@@ -0,0 +1,305 @@
+import importlib
+import struct
+import sys
+from array import array
+from collections.abc import Sequence
+from typing import Self
+
+from src.auto.Function import _DISCARDED, Context, Function
+from src.auto.functional import _as_tuple
+from src.auto.graph import topo_sort
+from src.auto.Lanes import Lanes
+from src.auto.Vertex import Vertex
+
+_MAGIC = b"AGRF"
+_VERSION = 1
+
+# Magic, version, number of functions, vertices, edges, roots and inputs
+_HEADER = struct.Struct("<4sHxxIIIII")
+
+# Length prefix of each name in the function table
+_NAME = struct.Struct("<H")
+
+
+def _pad(n: int) -> int:
+    # Sections start on 8 byte boundaries, so every buffer is aligned for its type
+    return -n % 8
+
+
+def _name(op: type[Function]) -> str:
+    if not op.serialisable:
+        raise ValueError(f"{op.__name__} cannot be serialised.")
+    name = f"{op.__module__}:{op.__qualname__}"
+    try:
+        resolved = _resolve(name)
+    except (ImportError, AttributeError, ValueError):
+        resolved = None
+    if resolved is not op:
+        raise ValueError(f"{op.__qualname__} cannot be loaded by name from {name}.")
+    return name
+
+
+def _resolve(name: str) -> type[Function]:
+    module, qualname = name.split(":")
+    op = importlib.import_module(module)
+    for attr in qualname.split("."):
+        op = getattr(op, attr)
+    if not isinstance(op, type) or not issubclass(op, Function):
+        raise ValueError(f"{name} is not a Function.")
+    if not op.serialisable:
+        raise ValueError(f"{name} cannot be serialised.")
+    return op
+
+
+def _section(buffer: array) -> bytes:
+    if sys.byteorder == "big":
+        buffer = array(buffer.typecode, buffer)
+        buffer.byteswap()
+    data = buffer.tobytes()
+    return data + bytes(_pad(len(data)))
+
+
+class GraphBuffer:
+    """
+    A recorded graph in a compact binary format, with zero-copy views onto it.
+
+    Vertices are numbered in topological order (parents before children), and stored
+    as flat typed buffers: the code of each vertex's Function in a table of function
+    names (-1 for leaves), whether it requires gradients, its parent indices in CSR
+    format (`parents[indptr[i]:indptr[i + 1]]`), and its value and gradient. The
+    indices of the roots, and of any inputs marked when serialising, are stored too.
+
+    Loading only parses the header and casts memoryviews onto the given data, so
+    even large graphs load without copying. The views onto a bytearray are writable,
+    e.g. for a worker to write gradients into shared memory. Unlike pickling the
+    vertices, which recurses through deep graphs, GraphBuffer pickles as its bytes.
+
+    Contexts are not stored. `to_graph` rebuilds them by re-running each Function's
+    forward, so functions whose context is prepared by the caller (e.g. the
+    segments of gradient checkpointing) are not `serialisable`. Function names are
+    only resolved to Function subclasses, but loading still imports the modules
+    named in the data, so only load graphs from trusted sources.
+
+    Example:
+        data = GraphBuffer.from_graph(loss, inputs=[*x, y]).tobytes()
+        # In a worker process
+        buffer = GraphBuffer(data)
+        vertices = buffer.to_graph()
+        inputs = [vertices[i] for i in buffer.inputs]
+        graph = CompiledGraph(vertices[buffer.roots[0]], inputs, cache=cache)
+    """
+
+    def __init__(self, data: bytes | bytearray | memoryview) -> None:
+        """
+        Initialize views onto a serialised graph, without copying it.
+
+        Args:
+            data: Serialised graph, e.g. from `tobytes`
+        """
+        view = memoryview(data).cast("B")
+        if len(view) < _HEADER.size:
+            raise ValueError("Data is too short to hold a serialised graph.")
+        magic, version, n_functions, n, n_edges, n_roots, n_inputs = (
+            _HEADER.unpack_from(view)
+        )
+        if magic != _MAGIC:
+            raise ValueError("Data does not hold a serialised graph.")
+        if version != _VERSION:
+            raise ValueError(
+                f"Unsupported graph format version {version}, expected {_VERSION}."
+            )
+
+        offset = _HEADER.size
+        names = []
+        for _ in range(n_functions):
+            (size,) = _NAME.unpack_from(view, offset)
+            offset += _NAME.size
+            names.append(bytes(view[offset : offset + size]).decode())
+            offset += size
+        offset += _pad(offset)
+
+        def take(typecode: str, count: int) -> memoryview:
+            nonlocal offset
+            size = count * array(typecode).itemsize
+            if offset + size > len(view):
+                raise ValueError("Data is truncated.")
+            section = view[offset : offset + size].cast(typecode)
+            offset += size + _pad(size)
+            if sys.byteorder == "big" and section.itemsize > 1:
+                # Stored little-endian, so big-endian hosts pay for one copy
+                swapped = array(typecode, section)
+                swapped.byteswap()
+                section = memoryview(swapped)
+            return section
+
+        # Function of each code
+        self.functions: tuple[type[Function], ...] = tuple(map(_resolve, names))
+
+        self.codes = take("i", n)
+        self.requires_grad = take("B", n)
+        self.indptr = take("i", n + 1)
+        self.parents = take("i", n_edges)
+        self.roots = take("i", n_roots)
+        self.inputs = take("i", n_inputs)
+        self.values = take("d", n)
+        self.grads = take("d", n)
+
+        self._names = names
+        self._data = view[:offset]
+
+    @classmethod
+    def from_graph(
+        cls, roots: Vertex | Sequence[Vertex], inputs: Sequence[Vertex] = ()
+    ) -> Self:
+        """
+        Serialise the graph reachable from the roots.
+
+        Args:
+            roots: Output vertices of the graph
+            inputs: Leaves whose indices to store, e.g. to compile the loaded graph
+
+        Returns:
+            GraphBuffer: Views onto the serialised graph
+        """
+        roots = _as_tuple(roots)
+        order = topo_sort(roots)
+        index = {v: i for i, v in enumerate(order)}
+
+        functions: dict[type[Function], int] = {}
+        codes = array("i")
+        requires_grad = array("B")
+        indptr = array("i", [0])
+        parents = array("i")
+        values = array("d")
+        grads = array("d")
+        for v in order:
+            if v._tape is not None:
+                raise ValueError("Taped vertices do not link their parents.")
+            if isinstance(v.value, Lanes) or isinstance(v.grad, Lanes):
+                raise ValueError("Vertices holding lanes cannot be serialised.")
+
+            if v._op is None:
+                codes.append(-1)
+            elif v._ctx is None:
+                raise RuntimeError(
+                    "Trying to serialise a released graph, "
+                    "call backward with retain_graph=True to keep it."
+                )
+            else:
+                code = functions.get(v._op)
+                if code is None:
+                    code = functions[v._op] = len(functions)
+                codes.append(code)
+
+            requires_grad.append(v.requires_grad)
+            parents.extend([index[p] for p in v._parents])
+            indptr.append(len(parents))
+            values.append(v.value)
+            grads.append(v.grad)
+
+        try:
+            marked = array("i", [index[v] for v in inputs])
+        except KeyError:
+            raise ValueError("Inputs must be part of the graph.") from None
+
+        names = [_name(op).encode() for op in functions]
+        table = b"".join(_NAME.pack(len(name)) + name for name in names)
+        header = _HEADER.pack(
+            _MAGIC,
+            _VERSION,
+            len(names),
+            len(order),
+            len(parents),
+            len(roots),
+            len(marked),
+        )
+        head = header + table
+        data = b"".join(
+            [
+                head + bytes(_pad(len(head))),
+                *map(
+                    _section,
+                    (
+                        codes,
+                        requires_grad,
+                        indptr,
+                        parents,
+                        array("i", [index[u] for u in roots]),
+                        marked,
+                        values,
+                        grads,
+                    ),
+                ),
+            ]
+        )
+        return cls(data)
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def __repr__(self) -> str:
+        return (
+            f"{type(self).__name__}(n_vertices={len(self)}, "
+            f"n_edges={len(self.parents)}, nbytes={self.nbytes})"
+        )
+
+    def __reduce__(self) -> tuple:
+        return (type(self), (self.tobytes(),))
+
+    @property
+    def nbytes(self) -> int:
+        """
+        Size of the serialised graph in bytes.
+        """
+        return len(self._data)
+
+    def tobytes(self) -> bytes:
+        """
+        Get the serialised graph, e.g. to save it or send it to another process.
+
+        Returns:
+            bytes: Serialised graph
+        """
+        return self._data.tobytes()
+
+    def parents_of(self, i: int) -> memoryview:
+        """
+        Get the parent indices of a vertex, without copying them.
+
+        Args:
+            i: Index of the vertex
+
+        Returns:
+            memoryview: Index of each parent
+        """
+        return self.parents[self.indptr[i] : self.indptr[i + 1]]
+
+    def to_graph(self) -> list[Vertex]:
+        """
+        Rebuild the vertices of the graph, with their values and gradients.
+
+        Returns:
+            list[Vertex]: One vertex per index, so `roots` and `inputs` index into it
+        """
+        functions = self.functions
+        codes = self.codes
+        requires_grad = self.requires_grad
+        indptr = self.indptr
+        parents = self.parents
+        values = self.values
+        grads = self.grads
+
+        vertices: list[Vertex] = []
+        for i in range(len(codes)):
+            code = codes[i]
+            if code < 0:
+                v = Vertex(values[i], requires_grad=bool(requires_grad[i]))
+            else:
+                op = functions[code]
+                args = tuple(vertices[p] for p in parents[indptr[i] : indptr[i + 1]])
+                ctx = Context() if op.saves else _DISCARDED
+                op.forward(ctx, *args)
+                v = Vertex(values[i], bool(requires_grad[i]), args, op, ctx)
+            v.grad = grads[i]
+            vertices.append(v)
+        return vertices
@@ -0,0 +1,210 @@
+from collections.abc import Sequence
+from heapq import heapify, heappop, heappush
+
+from src.auto.functional import _check_partials
+from src.auto.StaticGraph import StaticGraph
+from src.auto.Vertex import Vertex
+
+
+class IncrementalGraph(StaticGraph):
+    """
+    A static graph which only re-evaluates the part affected by changed leaves.
+
+    Setting a leaf's value through the graph marks its children stale. `recompute`
+    re-evaluates stale vertices in topological order, and marks their children
+    stale in turn only if their value actually changed, so the cost scales with the
+    affected region rather than the whole graph.
+
+    Backward keeps the adjoint and local partials of every vertex. After the first
+    full sweep, subsequent calls only propagate the changes in adjoints caused by
+    the recomputed vertices, keeping the leaf gradients up to date. `zero_grad`
+    discards this state, so the next backward is a full sweep again.
+
+    Example:
+        graph = IncrementalGraph(loss, inputs=[x, y])
+        graph.backward()
+
+        graph.set(x, 0.5)
+        graph.recompute()
+        graph.backward()  # x.grad, y.grad and parameter gradients are updated
+    """
+
+    def __init__(self, root: Vertex, inputs: Sequence[Vertex] = ()) -> None:
+        """
+        Initialize an incremental graph from a recorded root vertex.
+
+        Args:
+            root: Output vertex of the recorded graph
+            inputs: Placeholder leaf vertices which are fed on each call
+        """
+        super().__init__(root, inputs)
+        # Backward keeps each vertex's partials, so needs them returned
+        _check_partials(self._ops)
+
+        # Forward topological position of every non-leaf, and the children of
+        # every vertex in the graph (leaves and constants included)
+        self._position = {u: i for i, u in enumerate(self._ops)}
+        self._children: dict[Vertex, list[Vertex]] = {}
+        for u in self._ops:
+            for v in u._parents:
+                self._children.setdefault(v, []).append(u)
+
+        # Positions of vertices to re-evaluate, and those whose partials are stale
+        self._stale: list[int] = []
+        self._queued: set[Vertex] = set()
+        self._changed: set[Vertex] = set()
+
+        # Adjoint and local partials per non-leaf from the last backward, if any
+        self._adjoints: dict[Vertex, float] | None = None
+        self._partials: dict[Vertex, tuple[float, ...]] = {}
+
+        # Number of vertices visited by the last recompute and backward
+        self.n_recomputed = 0
+        self.n_backpropagated = 0
+
+    def _mark(self, v: Vertex) -> None:
+        for u in self._children.get(v, ()):
+            if u not in self._queued:
+                self._queued.add(u)
+                heappush(self._stale, self._position[u])
+
+    def set(self, v: Vertex, value: float) -> None:
+        """
+        Change the value of a leaf, marking its children stale.
+
+        Args:
+            v: Leaf vertex of the graph, e.g. an input or a parameter
+            value: New value
+        """
+        if v._op is not None:
+            raise ValueError(f"Only leaf values can be set, got {v}.")
+        if v not in self._children:
+            raise ValueError(f"{v} is not part of the graph.")
+
+        if value != v.value:
+            v.value = value
+            self._mark(v)
+
+    def feed(self, values: Sequence[float | Vertex]) -> None:
+        """
+        Set the values of the input placeholders, marking changed ones stale.
+
+        Args:
+            values: One value (or vertex to read the value from) per input placeholder
+        """
+        if len(values) != len(self.inputs):
+            raise ValueError(
+                f"Expected {len(self.inputs)} input values, got {len(values)}."
+            )
+
+        for v, value in zip(self.inputs, values):
+            self.set(v, value.value if isinstance(value, Vertex) else value)
+
+    def recompute(self) -> float:
+        """
+        Re-evaluate the stale vertices in topological order.
+
+        Vertices whose value does not change do not mark their children stale.
+
+        Returns:
+            float: Value of the root
+        """
+        n = 0
+        while self._stale:
+            u = self._ops[heappop(self._stale)]
+            self._queued.discard(u)
+            self._changed.add(u)
+            n += 1
+
+            value = u._op.forward(u._ctx, *u._parents).value
+            if value != u.value:
+                u.value = value
+                self._mark(u)
+
+        self.n_recomputed = n
+        return self.root.value
+
+    def forward(self) -> float:
+        """
+        Re-evaluate the vertices affected by changed leaves.
+
+        Returns:
+            float: Value of the root
+        """
+        return self.recompute()
+
+    def backward(self) -> None:
+        """
+        Update the leaf gradients after the recomputed vertices changed.
+
+        The first call (and the first after `zero_grad`) is a full sweep, which
+        accumulates into the leaf gradients as `StaticGraph.backward`.
+        """
+        if self._stale:
+            raise RuntimeError("Stale vertices, call recompute before backward.")
+        if self._adjoints is None:
+            self._full_backward()
+        else:
+            self._incremental_backward()
+        self._changed.clear()
+
+    def _full_backward(self) -> None:
+        adjoints = self._adjoints = {self.root: 1.0}
+        partials = self._partials
+        for u in reversed(self._ops):
+            adjoint = adjoints.get(u, 0.0)
+            node_grads = partials[u] = u._op.backward(u._ctx, *u._parents)
+            for v, node_grad in zip(u._parents, node_grads):
+                if not v.requires_grad:
+                    continue
+                if v._op is None:
+                    v.grad += adjoint * node_grad
+                else:
+                    adjoints[v] = adjoints.get(v, 0.0) + adjoint * node_grad
+        self.n_backpropagated = len(self._ops)
+
+    def _incremental_backward(self) -> None:
+        adjoints = self._adjoints
+        partials = self._partials
+
+        # Children before parents, i.e. in decreasing topological position
+        heap = [-self._position[u] for u in self._changed]
+        heapify(heap)
+        queued = set(self._changed)
+        deltas: dict[Vertex, float] = {}
+
+        n = 0
+        while heap:
+            u = self._ops[-heappop(heap)]
+            n += 1
+
+            old_adjoint = adjoints.get(u, 0.0)
+            adjoint = old_adjoint + deltas.pop(u, 0.0)
+            old_grads = partials[u]
+            if u in self._changed:
+                node_grads = partials[u] = u._op.backward(u._ctx, *u._parents)
+            else:
+                node_grads = old_grads
+            adjoints[u] = adjoint
+
+            for v, old, new in zip(u._parents, old_grads, node_grads):
+                delta = adjoint * new - old_adjoint * old
+                if not delta or not v.requires_grad:
+                    continue
+                if v._op is None:
+                    v.grad += delta
+                else:
+                    deltas[v] = deltas.get(v, 0.0) + delta
+                    if v not in queued:
+                        queued.add(v)
+                        heappush(heap, -self._position[v])
+
+        self.n_backpropagated = n
+
+    def zero_grad(self) -> None:
+        """
+        Reset all gradients in the graph to zero, and the kept backward state.
+        """
+        super().zero_grad()
+        self._adjoints = None
+        self._partials = {}
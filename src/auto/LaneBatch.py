@@ -0,0 +1,101 @@
+import typing
+from collections.abc import Iterable
+from typing import ClassVar, Self
+
+import src.auto.grad_mode as grad_mode
+from src.auto.Lanes import Lanes
+from src.auto.Tape import Tape
+
+if typing.TYPE_CHECKING:
+    from src.auto.Function import Function
+    from src.auto.Vertex import Vertex
+
+
+class LaneBatch:
+    """
+    A batch scope in which vertices may carry one value per sample (lane).
+
+    While a LaneBatch is active, `Function.__call__` runs each function once over
+    all lanes of its inputs, using kernels generated from the function's
+    `forward_source` and `backward_source`, and broadcasts inputs holding a
+    single value (e.g. parameters) across the lanes. So a graph is recorded once
+    per mini-batch rather than once per sample, while model code written against
+    `Vector` and `Linear` stays unchanged.
+
+    Backward from a root with lanes backpropagates the sum over its lanes (e.g. of
+    the per-sample losses), and the lane gradients of leaves holding a single
+    value are summed, so parameters receive the gradient of the whole batch.
+
+    Example:
+        with LaneBatch() as batch:
+            x = Vector([batch.lanes(column) for column in zip(*X[j : j + B])])
+            loss = loss_fn(model(x)[0], batch.lanes(y[j : j + B]))
+        loss.backward()
+    """
+
+    # Batch that Function.__call__ currently applies functions to lanes in, if any
+    _active: ClassVar["LaneBatch | None"] = None
+
+    def __init__(self) -> None:
+        """
+        Initialize a batch scope.
+        """
+        self._previous: LaneBatch | None = None
+
+    def __enter__(self) -> Self:
+        self._previous = LaneBatch._active
+        LaneBatch._active = self
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        LaneBatch._active = self._previous
+        self._previous = None
+
+    def lanes(self, values: Iterable[float], requires_grad: bool = False) -> "Vertex":
+        """
+        Create a leaf vertex holding one value per sample.
+
+        Args:
+            values: One value per lane
+            requires_grad: Whether gradients should be computed per lane, False
+                for data
+
+        Returns:
+            Vertex: New leaf vertex whose value is Lanes
+        """
+        from src.auto.Vertex import Vertex
+
+        return Vertex(Lanes(values), requires_grad=requires_grad)
+
+    def apply(self, op: type["Function"], args: tuple["Vertex", ...]) -> "Vertex":
+        """
+        Apply a function to the lanes of its arguments, recording it if needed.
+
+        Args:
+            op: Function to apply
+            args: Input vertices, each holding lanes or a single value
+
+        Returns:
+            Vertex: Result of the function application
+        """
+        # The kernels build on Function, which itself checks for an active batch
+        from src.auto.Function import Context
+        from src.auto.lane_kernels import LaneFunction, _forward_kernel, _values
+        from src.auto.Vertex import Vertex
+
+        if Tape._active is not None:
+            raise ValueError("Lanes cannot be recorded on a tape.")
+
+        values, is_lane = _values(args)
+        z = Vertex(_forward_kernel(op, is_lane)(*values))
+
+        if not grad_mode.enabled or not any(v.requires_grad for v in args):
+            z.requires_grad = False
+            return z
+
+        ctx = Context()
+        ctx.save_for_backward(op, z.value)
+        z._parents = args
+        z._op = LaneFunction
+        z._ctx = ctx
+        return z
@@ -0,0 +1,104 @@
+from array import array
+from collections.abc import Iterable, Iterator
+from typing import Self
+
+
+class Lanes:
+    """
+    A contiguous buffer of per-sample values, one lane per sample of a batch.
+
+    Used as the value (and gradient) of vertices recorded in a `LaneBatch`.
+    Arithmetic is element-wise between Lanes of the same length, and broadcasts
+    plain numbers across all lanes.
+    """
+
+    __slots__ = ("_data",)
+
+    def __init__(self, values: Iterable[float]) -> None:
+        """
+        Initialize lanes from per-sample values.
+
+        Args:
+            values: One value per lane
+        """
+        self._data = values if isinstance(values, array) else array("d", values)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __iter__(self) -> Iterator[float]:
+        return iter(self._data)
+
+    def __getitem__(self, i: int) -> float:
+        return self._data[i]
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self._data.tolist()})"
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, Lanes):
+            return self._data == other._data
+        return NotImplemented
+
+    __hash__ = None
+
+    def _check(self, other: Self) -> None:
+        if len(self._data) != len(other._data):
+            raise ValueError(
+                f"Lanes must be same length: {len(self._data)} != {len(other._data)}"
+            )
+
+    def __add__(self, other: Self | float) -> Self:
+        if isinstance(other, Lanes):
+            self._check(other)
+            return Lanes([x + y for x, y in zip(self._data, other._data)])
+        return Lanes([x + other for x in self._data])
+
+    __radd__ = __add__
+
+    def __sub__(self, other: Self | float) -> Self:
+        if isinstance(other, Lanes):
+            self._check(other)
+            return Lanes([x - y for x, y in zip(self._data, other._data)])
+        return Lanes([x - other for x in self._data])
+
+    def __rsub__(self, other: float) -> Self:
+        return Lanes([other - x for x in self._data])
+
+    def __mul__(self, other: Self | float) -> Self:
+        if isinstance(other, Lanes):
+            self._check(other)
+            return Lanes([x * y for x, y in zip(self._data, other._data)])
+        return Lanes([x * other for x in self._data])
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, other: Self | float) -> Self:
+        if isinstance(other, Lanes):
+            self._check(other)
+            return Lanes([x / y for x, y in zip(self._data, other._data)])
+        return Lanes([x / other for x in self._data])
+
+    def __rtruediv__(self, other: float) -> Self:
+        return Lanes([other / x for x in self._data])
+
+    def __neg__(self) -> Self:
+        return Lanes([-x for x in self._data])
+
+    def sum(self) -> float:
+        """
+        Sum the values over all lanes.
+
+        Returns:
+            float: Sum of the lanes
+        """
+        return sum(self._data)
+
+    def tolist(self) -> list[float]:
+        """
+        Get the values of all lanes.
+
+        Returns:
+            list[float]: One value per lane
+        """
+        return self._data.tolist()
@@ -0,0 +1,104 @@
+import marshal
+import os
+import sys
+import tempfile
+from pathlib import Path
+from types import CodeType
+
+
+class ProgramCache:
+    """
+    A directory of compiled graph programs, keyed by structural fingerprint.
+
+    Programs are stored as marshalled code objects, so a later process loads them
+    without generating or compiling any source. Marshalled code is specific to the
+    Python version, which is therefore part of every file name. Programs loaded or
+    stored in this process are also kept in memory.
+
+    Example:
+        cache = ProgramCache(".graph_cache")
+        graph = CompiledGraph(loss, inputs=[*x, y], cache=cache)
+    """
+
+    def __init__(self, directory: str | os.PathLike) -> None:
+        """
+        Initialize a cache in the given directory, creating it if needed.
+
+        Args:
+            directory: Directory holding the cached programs
+        """
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._programs: dict[str, CodeType] = {}
+
+        # Number of lookups which found a program, and which did not
+        self.hits = 0
+        self.misses = 0
+
+    def __repr__(self) -> str:
+        return (
+            f"{type(self).__name__}({str(self.directory)!r}, "
+            f"hits={self.hits}, misses={self.misses})"
+        )
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._programs or self._path(key).exists()
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.{sys.implementation.cache_tag}.bin"
+
+    def get(self, key: str) -> CodeType | None:
+        """
+        Look up the program stored for a fingerprint.
+
+        Unreadable files (e.g. truncated by a crashed process) count as missing.
+
+        Args:
+            key: Fingerprint of the graph
+
+        Returns:
+            CodeType | None: Compiled program, or None if there is none
+        """
+        program = self._programs.get(key)
+        if program is None:
+            try:
+                program = marshal.loads(self._path(key).read_bytes())
+            except (OSError, EOFError, ValueError, TypeError):
+                program = None
+            if not isinstance(program, CodeType):
+                self.misses += 1
+                return None
+            self._programs[key] = program
+
+        self.hits += 1
+        return program
+
+    def put(self, key: str, program: CodeType) -> None:
+        """
+        Store the program for a fingerprint.
+
+        The file is written under a temporary name and then renamed, so concurrent
+        processes never read a partially written program.
+
+        Args:
+            key: Fingerprint of the graph
+            program: Compiled program
+        """
+        self._programs[key] = program
+
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(marshal.dumps(program))
+            os.replace(tmp, self._path(key))
+        except BaseException:
+            os.unlink(tmp)
+            raise
+
+    def clear(self) -> None:
+        """
+        Remove every program from the cache, on disk and in memory.
+        """
+        self._programs.clear()
+        for path in self.directory.glob(f"*.{sys.implementation.cache_tag}.bin"):
+            path.unlink(missing_ok=True)
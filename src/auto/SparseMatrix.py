@@ -0,0 +1,109 @@
+from array import array
+from bisect import bisect_left
+from collections.abc import Mapping, Sequence
+from typing import Self
+
+
+class SparseMatrix:
+    """
+    A matrix of floats in compressed sparse row (CSR) format.
+
+    Only structurally non-zero entries are stored. The column indices and values of
+    row r are `indices[indptr[r]:indptr[r + 1]]` and `data[indptr[r]:indptr[r + 1]]`,
+    with the column indices of each row sorted.
+    """
+
+    def __init__(
+        self,
+        shape: tuple[int, int],
+        indptr: Sequence[int],
+        indices: Sequence[int],
+        data: Sequence[float],
+    ) -> None:
+        """
+        Initialize a sparse matrix from its CSR buffers.
+
+        Args:
+            shape: Number of rows and columns
+            indptr: Offsets of each row into indices and data, of length n_rows + 1
+            indices: Column index of each stored entry
+            data: Value of each stored entry
+        """
+        if len(indptr) != shape[0] + 1:
+            raise ValueError(f"Expected {shape[0] + 1} row offsets, got {len(indptr)}.")
+        if len(indices) != len(data):
+            raise ValueError(
+                f"Got {len(indices)} column indices for {len(data)} values."
+            )
+
+        self.shape = shape
+        self.indptr = array("i", indptr)
+        self.indices = array("i", indices)
+        self.data = array("d", data)
+
+    @classmethod
+    def from_rows(cls, rows: Sequence[Mapping[int, float]], n_cols: int) -> Self:
+        """
+        Build a sparse matrix from the stored entries of each row.
+
+        Args:
+            rows: Mapping from column index to value, per row
+            n_cols: Number of columns
+
+        Returns:
+            SparseMatrix: Matrix holding the given entries
+        """
+        indptr = [0]
+        indices = []
+        data = []
+        for row in rows:
+            for c in sorted(row):
+                indices.append(c)
+                data.append(row[c])
+            indptr.append(len(indices))
+        return cls((len(rows), n_cols), indptr, indices, data)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(shape={self.shape}, nnz={self.nnz})"
+
+    def __getitem__(self, key: tuple[int, int]) -> float:
+        r, c = key
+        start, end = self.indptr[r], self.indptr[r + 1]
+        i = bisect_left(self.indices, c, start, end)
+        if i < end and self.indices[i] == c:
+            return self.data[i]
+        return 0.0
+
+    @property
+    def nnz(self) -> int:
+        """
+        Number of stored entries.
+        """
+        return len(self.data)
+
+    def row(self, r: int) -> dict[int, float]:
+        """
+        Get the stored entries of a row.
+
+        Args:
+            r: Row index
+
+        Returns:
+            dict[int, float]: Mapping from column index to value
+        """
+        start, end = self.indptr[r], self.indptr[r + 1]
+        return dict(zip(self.indices[start:end], self.data[start:end]))
+
+    def to_dense(self) -> list[list[float]]:
+        """
+        Expand the matrix into a list of rows, with zeros for entries not stored.
+
+        Returns:
+            list[list[float]]: Dense rows of the matrix
+        """
+        n_rows, n_cols = self.shape
+        dense = [[0.0] * n_cols for _ in range(n_rows)]
+        for r in range(n_rows):
+            for i in range(self.indptr[r], self.indptr[r + 1]):
+                dense[r][self.indices[i]] = self.data[i]
+        return dense
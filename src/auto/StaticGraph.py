@@ -0,0 +1,115 @@
+from collections.abc import Sequence
+
+from src.auto.Vertex import Vertex
+from src.auto.wavefront import dependency_levels
+
+
+class StaticGraph:
+    """
+    A computational graph which is built once and replayed for new inputs.
+
+    The graph is recorded once over placeholder input vertices. Afterwards new
+    values are fed into the placeholders, and the forward and backward passes are
+    re-run in the stored topological order, reusing the existing Vertex objects
+    rather than rebuilding the graph for every sample. The forward pass computes
+    each value in place, with one `forward_batch` call per Function and level.
+
+    Example:
+        x = Vector([0.0] * m)
+        y = Vertex(0.0)
+        graph = StaticGraph(loss_fn(model(x)[0], y), inputs=[*x, y])
+
+        for j in range(n):
+            graph(*X[j], y[j])
+            graph.backward()
+            opt.step()
+            graph.zero_grad()
+    """
+
+    def __init__(self, root: Vertex, inputs: Sequence[Vertex]) -> None:
+        """
+        Initialize a static graph from a recorded root vertex.
+
+        Args:
+            root: Output vertex of the recorded graph
+            inputs: Placeholder leaf vertices which are fed on each replay
+        """
+        if root._tape is not None:
+            raise ValueError("Static graphs cannot be built from taped vertices.")
+        for v in inputs:
+            if v._op is not None:
+                raise ValueError(f"Inputs must be leaf vertices, got {v}.")
+            if not v.requires_grad:
+                # Operations on constants only are not recorded, so could not be replayed
+                raise ValueError(f"Inputs must require gradients, got {v}.")
+
+        self.root = root
+        self.inputs = tuple(inputs)
+
+        # Non-leaf vertices in forward topological order
+        self._ops = [u for u in reversed(root.get_topo_sort()) if u._op is not None]
+
+        # The same vertices grouped by Function within each dependency level, deepest
+        # first, so a replay computes the values in place with one kernel per group
+        self._groups = [
+            (op.forward_batch, group)
+            for level in reversed(dependency_levels(root))
+            for op, group in level.items()
+        ]
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(root={self.root}, n_inputs={len(self.inputs)})"
+
+    def __call__(self, *values: float | Vertex) -> float:
+        """
+        Feed new input values and re-run the forward pass.
+
+        Args:
+            *values: One value per input placeholder
+
+        Returns:
+            float: Value of the root
+        """
+        self.feed(values)
+        return self.forward()
+
+    def feed(self, values: Sequence[float | Vertex]) -> None:
+        """
+        Set the values of the input placeholders.
+
+        Args:
+            values: One value (or vertex to read the value from) per input placeholder
+        """
+        if len(values) != len(self.inputs):
+            raise ValueError(
+                f"Expected {len(self.inputs)} input values, got {len(values)}."
+            )
+
+        for v, value in zip(self.inputs, values):
+            v.value = value.value if isinstance(value, Vertex) else value
+
+    def forward(self) -> float:
+        """
+        Re-evaluate every vertex in the graph from the current leaf values.
+
+        Returns:
+            float: Value of the root
+        """
+        for forward_batch, group in self._groups:
+            forward_batch(group)
+        return self.root.value
+
+    def backward(self) -> None:
+        """
+        Backpropagate from the root, reusing the stored topological order.
+
+        The graph is always retained, since it is replayed for subsequent inputs.
+        Leaf gradients accumulate as with `Vertex.backward`.
+        """
+        self.root.backward(retain_graph=True)
+
+    def zero_grad(self) -> None:
+        """
+        Reset all gradients in the graph to zero.
+        """
+        self.root.zero_grad()
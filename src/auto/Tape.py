@@ -0,0 +1,253 @@
+import typing
+from collections.abc import Callable, Sequence
+from typing import ClassVar, Self
+
+if typing.TYPE_CHECKING:
+    from src.auto.Function import Context, Function
+    from src.auto.Vertex import Vertex
+
+
+def _kernel(op: type["Function"], n: int) -> Callable:
+    # Partials from the output and input values, i.e. a lane kernel without lanes.
+    # Lane kernels build on Function, which records onto tapes, so are only
+    # imported when needed.
+    from src.auto.lane_kernels import _backward_kernel
+
+    return _backward_kernel(op, (False,) * n)
+
+
+def _fallback(op: type["Function"], ctx: "Context", xs: list[float]) -> tuple:
+    # Backward of a function without a source form, on temporary input vertices
+    from src.auto.Vertex import Vertex
+
+    return op.backward(ctx, *[Vertex(x, requires_grad=False) for x in xs])
+
+
+class Tape:
+    """
+    A flat record of a computation (a Wengert list).
+
+    While a Tape is active, `Function.__call__` appends each operation to the tape
+    instead of linking the resulting Vertex to its parents. The returned Vertex is
+    a thin handle into the tape, which holds no reference to it: each entry is its
+    op code, parent indices and output value in flat lists (which append faster than
+    typed arrays, and hold the same floats the vertices do). Entries are stored in
+    execution order, which is already a topological order, so backward is a single
+    reverse loop over those buffers rather than a graph traversal. It computes the
+    partials from the stored values with each Function's `backward_source`, so
+    contexts are only kept for functions without a source form.
+
+    Vertices created outside the tape (e.g. parameters) are recorded as leaves the
+    first time they are used, and gradients stop there.
+
+    Example:
+        with Tape():
+            loss = loss_fn(model(x)[0], y)
+        loss.backward()
+    """
+
+    # Tape that Function.__call__ currently records to, if any
+    _active: ClassVar["Tape | None"] = None
+
+    def __init__(self) -> None:
+        """
+        Initialize an empty tape.
+        """
+        # Entry i was produced by functions[ops[i]] from parents[offsets[i]:offsets[i + 1]]
+        # and has value values[i]. Non-negative parents refer to entries, negative
+        # ones to leaves (~parent).
+        self.ops: list[int] = []
+        self.offsets: list[int] = [0]
+        self.parents: list[int] = []
+        self.values: list[float] = []
+        self.grads: list[float] = []
+        self.leaf_grads: list[float] = []
+
+        # Op code table, and whether each function has a source form for backward
+        self.functions: list[type["Function"]] = []
+        self._codes: dict[type["Function"], int] = {}
+        self._sourced: list[bool] = []
+
+        # Contexts of the entries whose function has no source form
+        self._contexts: dict[int, "Context"] = {}
+
+        # Leaves and their position, numbered in order of insertion
+        self._leaf_index: dict["Vertex", int] = {}
+
+        self._released = False
+        self._previous: Tape | None = None
+
+    def __len__(self) -> int:
+        return len(self.ops)
+
+    def __enter__(self) -> Self:
+        self._previous = Tape._active
+        Tape._active = self
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        Tape._active = self._previous
+        self._previous = None
+
+    def _register(self, op: type["Function"], n: int) -> int:
+        code = self._codes[op] = len(self.functions)
+        self.functions.append(op)
+        self._sourced.append(
+            op.backward_source("out", *[f"a{j}" for j in range(n)]) is not None
+        )
+        return code
+
+    def index(self, v: "Vertex") -> int:
+        """
+        Get the reference to a vertex on the tape, recording it as a leaf if it is unseen.
+
+        Args:
+            v: Vertex to look up
+
+        Returns:
+            int: Entry index, or the bitwise complement of the leaf index for leaves
+        """
+        if v._tape is self:
+            return v._index
+        return self._leaf_index.setdefault(v, ~len(self._leaf_index))
+
+    def record(
+        self,
+        op: type["Function"],
+        args: tuple["Vertex", ...],
+        out: "Vertex",
+        ctx: "Context",
+    ) -> int:
+        """
+        Append the application of a function to the tape.
+
+        Args:
+            op: Function which was applied
+            args: Input vertices
+            out: Resulting vertex, which becomes a handle into the tape
+            ctx: Context the function's forward saved into
+
+        Returns:
+            int: Index of the output on the tape
+        """
+        code = self._codes.get(op)
+        if code is None:
+            code = self._register(op, len(args))
+
+        # Inlined index(), since every parameter is a new leaf on a per-step tape
+        parents = self.parents
+        leaf_index = self._leaf_index
+        for v in args:
+            if v._tape is self:
+                parents.append(v._index)
+            else:
+                j = leaf_index.get(v)
+                if j is None:
+                    j = leaf_index[v] = ~len(leaf_index)
+                parents.append(j)
+
+        i = len(self.ops)
+        self.ops.append(code)
+        self.offsets.append(len(parents))
+        self.values.append(out.value)
+        if not self._sourced[code]:
+            self._contexts[i] = ctx
+
+        out._tape = self
+        out._index = i
+        return i
+
+    def backward(
+        self,
+        root: "Vertex | Sequence[Vertex]",
+        seed: float | Sequence[float] = 1.0,
+        retain_graph: bool = False,
+    ) -> None:
+        """
+        Backpropagate from recorded vertices with a single reverse loop over the tape.
+
+        Gradients are accumulated in the flat `grads` and `leaf_grads` lists, and
+        the latter are then added to the `.grad` of the leaves (e.g. parameters).
+        Gradients of intermediate entries are only kept in the list.
+
+        Unless the graph is retained, the saved contexts and the intermediate
+        gradients are released afterwards. The flat buffers and the leaves are kept,
+        so `zero_grad` remains usable.
+
+        Args:
+            root: Vertex (or vertices) on this tape to differentiate
+            seed: Gradient of each root with respect to itself
+            retain_graph: Keep the tape intact, e.g. to backpropagate through it again
+        """
+        roots = tuple(root) if isinstance(root, Sequence) else (root,)
+        seeds = tuple(seed) if isinstance(seed, Sequence) else (seed,) * len(roots)
+        if len(seeds) != len(roots):
+            raise ValueError(f"Expected {len(roots)} seeds, got {len(seeds)}.")
+        if any(u._tape is not self for u in roots):
+            raise ValueError("Root vertex was not recorded on this tape.")
+        if self._released:
+            raise RuntimeError(
+                "Trying to backpropagate through a released tape, "
+                "call backward with retain_graph=True to keep it."
+            )
+
+        # Entries and leaves share one index space: leaf ~k is element -1 - k, so the
+        # leaves follow the entries in reverse order
+        n = len(self.ops)
+        leaves = list(self._leaf_index)
+        values = self.values + [v.value for v in reversed(leaves)]
+        grads = [0.0] * len(values)
+        for u, g in zip(roots, seeds):
+            grads[u._index] += g
+        end = max(u._index for u in roots) + 1
+
+        ops, offsets, parents = self.ops, self.offsets, self.parents
+        functions, contexts = self.functions, self._contexts
+        kernels: dict[tuple[int, int], Callable] = {}
+        for i in range(end - 1, -1, -1):
+            g = grads[i]
+            if g == 0.0:
+                continue
+
+            start, stop = offsets[i], offsets[i + 1]
+            entry = parents[start:stop]
+            xs = [values[p] for p in entry]
+            if i in contexts:
+                node_grads = _fallback(functions[ops[i]], contexts[i], xs)
+            else:
+                key = (ops[i], stop - start)
+                kernel = kernels.get(key)
+                if kernel is None:
+                    kernel = kernels[key] = _kernel(functions[ops[i]], stop - start)
+                node_grads = kernel(values[i], *xs)
+            for p, node_grad in zip(entry, node_grads):
+                grads[p] += g * node_grad
+
+        leaf_grads = grads[n:][::-1]
+        for v, g in zip(leaves, leaf_grads):
+            if v.requires_grad:
+                v.grad += g
+        self.leaf_grads = leaf_grads
+
+        if retain_graph:
+            self.grads = grads[:n]
+        else:
+            self.release()
+
+    def release(self) -> None:
+        """
+        Drop the saved contexts and the gradients of the recorded entries.
+        """
+        self._contexts = {}
+        self.grads = []
+        self._released = True
+
+    def zero_grad(self) -> None:
+        """
+        Reset the gradients of the leaves on the tape to zero.
+        """
+        for v in self._leaf_index:
+            if v.requires_grad:
+                v.grad = 0
+        self.grads = []
+        self.leaf_grads = []
@@ -1,10 +1,25 @@
 import math
+from functools import partial
 from typing import Callable, Self
 
-from src.auto.Function import Function
+from src.auto.Function import Context, Function
+from src.auto.Lanes import Lanes
+from src.auto.Tape import Tape
+from src.auto.graph import backpropagate, clear_grads, topo_sort
 
 
-class Vertex:
+def _leaf_backward(*args: "Vertex") -> tuple[float, ...]:
+    """Shared backward for leaf vertices, which have no parents to send gradients to."""
+    return (0.0,) * len(args)
+
+
+class _VertexType(type):
+    # Metaclass of Vertex, whose __call__ an active VertexPool overrides to recycle
+    # storage. Without one, vertices are created by type.__call__ as usual.
+    pass
+
+
+class Vertex(metaclass=_VertexType):
     """
     The core class for automatic differentiation in the computational graph.
 
@@ -13,71 +28,91 @@ class Vertex:
     backward method and provides operator overloading for arithmetic operations.
     """
 
+    # Millions of vertices are created per epoch, so avoid a per-instance __dict__
+    __slots__ = (
+        "value",
+        "grad",
+        "requires_grad",
+        "_parents",
+        "_op",
+        "_topo_sort",
+        "_tape",
+        "_index",
+        "_ctx",
+    )
+
     def __init__(
         self,
         value: float,
+        requires_grad: bool = True,
         _parents: tuple[Self, ...] | None = None,
-        _backward: Callable[[tuple[Self, ...]], tuple[float, ...]] | None = None,
+        _op: type[Function] | None = None,
+        _ctx: Context | None = None,
     ):
         """
         Initialize a Vertex with a value and optional parent nodes.
 
         Args:
             value: The scalar value of this vertex
+            requires_grad: Whether gradients should be computed for this vertex,
+                False for data and constants
             _parents: Parent vertices in the computational graph
-            _backward: Function to compute gradients with respect to parents
+            _op: Function that produced this vertex, None for leaves
+            _ctx: Intermediates saved by _op's forward for its backward
         """
         self.value = value
         self.grad = 0
+        self.requires_grad = requires_grad
 
-        # Implementation detials for backpropogation - _backward produces node wise gradients per _parent
-        self._parents = tuple() if _parents is None else _parents
-        self._backward = (
-            lambda *args: tuple(0.0 for _ in range(len(args)))
-            if _backward is None
-            else _backward
-        )
+        # Implementation detials for backpropogation - _op.backward produces node wise gradients per _parent
+        self._parents = () if _parents is None else _parents
+        self._op = _op
+        self._ctx = _ctx
 
-    def __repr__(self) -> str:
+        # Cached topological ordering of the graph rooted at this vertex
+        self._topo_sort: list[Self] | None = None
+
+        # Tape this vertex is a handle into, if it was recorded on one, and its entry
+        self._tape: Tape | None = None
+        self._index = -1
+
+    @property
+    def _backward(self) -> Callable[..., tuple[float, ...]]:
         """
-        Return a string representation of the Vertex.
+        Function computing the node wise gradients with respect to each parent.
 
         Returns:
-            str: String representation including the class name and value
+            Callable: The producing Function's backward, or the shared leaf backward
         """
-        return f"{type(self).__name__}({repr(self.value)})"
+        if self._op is None:
+            return _leaf_backward
+        return partial(self._op.backward, self._ctx)
 
-    def _get_topo_sort(self, topo_sort: list[Self], seen: set[Self]) -> None:
+    def __repr__(self) -> str:
         """
-        Helper method for topological sorting of the computational graph.
-
-        Performs a depth-first search to build a topological ordering.
+        Return a string representation of the Vertex.
 
-        Args:
-            topo_sort: List to store the topological ordering
-            seen: Set of already visited vertices
+        Returns:
+            str: String representation including the class name and value
         """
-        seen.add(self)
-        for parent in self._parents:
-            if parent not in seen:
-                parent._get_topo_sort(topo_sort=topo_sort, seen=seen)
-        topo_sort.append(self)
+        return f"{type(self).__name__}({repr(self.value)})"
 
-    def get_topo_sort(self):
+    def get_topo_sort(self) -> list[Self]:
         """
         Get a topological sorting of the computational graph.
 
+        The ordering is computed once per root and cached, so repeated calls
+        (e.g. `backward` followed by `zero_grad`) share a single traversal.
+        Vertices which do not require gradients are not part of the ordering.
+
         Returns:
             list[Self]: Vertices in topological order (reversed for backpropagation)
         """
-        topo_sort: list[Self] = []
-        seen: set[Self] = set()
-
-        self._get_topo_sort(topo_sort, seen)
+        if self._topo_sort is None:
+            self._topo_sort = topo_sort((self,), skip_constants=True)[::-1]
+        return self._topo_sort
 
-        return topo_sort[::-1]
-
-    def backward(self):
+    def backward(self, retain_graph: bool = False, create_graph: bool = False):
         """
         Perform backpropagation to compute gradients through the computational graph.
 
@@ -85,40 +120,80 @@ class Vertex:
         1. Sets the gradient of this vertex to 1 (seed gradient)
         2. Traverses the computational graph in topological order
         3. Computes and accumulates gradients for all parent vertices
+
+        Unless the graph is retained, gradients of intermediate vertices are reset
+        as soon as they have been consumed, so only the leaf gradients outlive the
+        call, and intermediate vertices also release their parent links and saved
+        context at that point. `zero_grad` remains usable afterwards. A retained
+        graph keeps the gradients of its intermediate vertices until the next
+        backward through it.
+
+        Vertices recorded on a Tape delegate to the tape's reverse loop. A root
+        holding Lanes backpropagates the sum over its lanes, and leaves holding a
+        single value receive the sum of their lane gradients.
+
+        Args:
+            retain_graph: Keep the graph intact, e.g. to backpropagate through it again
+            create_graph: Build the gradients as Vertex operations, so that they can
+                be differentiated again. Implies retain_graph.
         """
+        if self._tape is not None:
+            if create_graph:
+                raise ValueError("Taped vertices cannot create a gradient graph.")
+            self._tape.backward(self, retain_graph=retain_graph)
+            return
+
+        order = self.get_topo_sort()
+        shared = None
+        if isinstance(self.value, Lanes):
+            if create_graph:
+                raise ValueError("Lanes cannot create a gradient graph.")
+            # Leaves shared by all lanes accumulate lane gradients from zero
+            shared = [
+                (v, v.grad)
+                for v in order
+                if v._op is None and not isinstance(v.value, Lanes)
+            ]
+            for v, _ in shared:
+                v.grad = 0
+
         # Set the top level node gradient to one, i.e. its gradient with respect to itself
+        clear_grads(order)
         self.grad = 1
 
         # Send gradients back in topological order,
         # such that all children send gradients back before parent is processed
-        topo_sort = self.get_topo_sort()
-        for u in topo_sort:
-            node_grads = u._backward(*u._parents)
-            for v, node_grad in zip(u._parents, node_grads):
-                v.grad += u.grad * node_grad
+        retain_graph = retain_graph or create_graph
+        leaves = backpropagate(
+            order, retain_graph=retain_graph, create_graph=create_graph
+        )
+
+        if shared is not None:
+            for v, prior in shared:
+                grad = v.grad
+                v.grad = prior + (grad.sum() if isinstance(grad, Lanes) else grad)
+
+        if not retain_graph:
+            # Only the leaves remain reachable for zero_grad
+            self._topo_sort = [self, *leaves]
 
     def zero_grad(self):
         """
         Reset all gradients in the computational graph to zero.
 
-        This method performs a depth-first traversal of the computational graph
-        and sets the gradient of each vertex to zero.
+        This method reuses the cached topological ordering of the graph rather
+        than performing a fresh traversal.
         """
-        seen = set()
-
-        def dfs(root: Self):
-            root.grad = 0
-            seen.add(root)
+        if self._tape is not None:
+            self._tape.zero_grad()
+            return
 
-            for parent in root._parents:
-                if parent not in seen:
-                    dfs(parent)
-
-        dfs(self)
+        for u in self.get_topo_sort():
+            u.grad = 0
 
     def _parse_other(self, other: Self | float | int) -> Self:
         if isinstance(other, float) or isinstance(other, int):
-            other = type(self)(other)
+            other = type(self)(other, requires_grad=False)
         return other
 
     def __add__(self, other: Self | float | int) -> "Vertex":
@@ -140,71 +215,269 @@ class Vertex:
     def __neg__(self) -> "Vertex":
         return neg(self)
 
+    def __radd__(self, other: float | int) -> "Vertex":
+        other = self._parse_other(other)
+        return add(other, self)
+
+    def __rsub__(self, other: float | int) -> "Vertex":
+        other = self._parse_other(other)
+        return sub(other, self)
+
+    def __rmul__(self, other: float | int) -> "Vertex":
+        other = self._parse_other(other)
+        return mul(other, self)
+
+    def __rtruediv__(self, other: float | int) -> "Vertex":
+        other = self._parse_other(other)
+        return div(other, self)
+
 
 class Add(Function):
+    saves = False
+
     @staticmethod
-    def forward(x: Vertex, y: Vertex) -> Vertex:
+    def forward(ctx: Context, x: Vertex, y: Vertex) -> Vertex:
         z = Vertex(x.value + y.value)
         return z
 
     @staticmethod
-    def backward(x: Vertex, y: Vertex) -> tuple[float, float]:
+    def forward_batch(vertices: list[Vertex]) -> None:
+        for u in vertices:
+            x, y = u._parents
+            u.value = x.value + y.value
+
+    @staticmethod
+    def backward(ctx: Context, x: Vertex, y: Vertex) -> tuple[float, float]:
         return (1.0, 1.0)
 
+    @staticmethod
+    def backward_batch(vertices: list[Vertex]) -> None:
+        for u in vertices:
+            g = u.grad
+            x, y = u._parents
+            if x.requires_grad:
+                x.grad += g
+            if y.requires_grad:
+                y.grad += g
+
+    @staticmethod
+    def tangent(
+        ctx: Context, tangents: tuple[float, float], x: Vertex, y: Vertex
+    ) -> float:
+        dx, dy = tangents
+        return dx + dy
+
+    @staticmethod
+    def backward_graph(
+        ctx: Context, out: Vertex, x: Vertex, y: Vertex
+    ) -> tuple[float, float]:
+        return (1.0, 1.0)
+
+    @staticmethod
+    def forward_source(x: str, y: str) -> str:
+        return f"{x} + {y}"
+
+    @staticmethod
+    def backward_source(out: str, x: str, y: str) -> tuple[str, str]:
+        return ("1.0", "1.0")
+
 
 add = Add()
 
 
 class Sub(Function):
+    saves = False
+
     @staticmethod
-    def forward(x: Vertex, y: Vertex) -> Vertex:
+    def forward(ctx: Context, x: Vertex, y: Vertex) -> Vertex:
         z = Vertex(x.value - y.value)
         return z
 
     @staticmethod
-    def backward(x: Vertex, y: Vertex) -> tuple[float, float]:
+    def forward_batch(vertices: list[Vertex]) -> None:
+        for u in vertices:
+            x, y = u._parents
+            u.value = x.value - y.value
+
+    @staticmethod
+    def backward(ctx: Context, x: Vertex, y: Vertex) -> tuple[float, float]:
         return (1.0, -1.0)
 
+    @staticmethod
+    def backward_batch(vertices: list[Vertex]) -> None:
+        for u in vertices:
+            g = u.grad
+            x, y = u._parents
+            if x.requires_grad:
+                x.grad += g
+            if y.requires_grad:
+                y.grad -= g
+
+    @staticmethod
+    def tangent(
+        ctx: Context, tangents: tuple[float, float], x: Vertex, y: Vertex
+    ) -> float:
+        dx, dy = tangents
+        return dx - dy
+
+    @staticmethod
+    def backward_graph(
+        ctx: Context, out: Vertex, x: Vertex, y: Vertex
+    ) -> tuple[float, float]:
+        return (1.0, -1.0)
+
+    @staticmethod
+    def forward_source(x: str, y: str) -> str:
+        return f"{x} - {y}"
+
+    @staticmethod
+    def backward_source(out: str, x: str, y: str) -> tuple[str, str]:
+        return ("1.0", "-1.0")
+
 
 sub = Sub()
 
 
 class Mul(Function):
+    saves = False
+
     @staticmethod
-    def forward(x: Vertex, y: Vertex) -> Vertex:
+    def forward(ctx: Context, x: Vertex, y: Vertex) -> Vertex:
         z = Vertex(x.value * y.value)
         return z
 
     @staticmethod
-    def backward(x: Vertex, y: Vertex) -> tuple[float, float]:
+    def forward_batch(vertices: list[Vertex]) -> None:
+        for u in vertices:
+            x, y = u._parents
+            u.value = x.value * y.value
+
+    @staticmethod
+    def backward(ctx: Context, x: Vertex, y: Vertex) -> tuple[float, float]:
         return (y.value, x.value)
 
+    @staticmethod
+    def backward_batch(vertices: list[Vertex]) -> None:
+        for u in vertices:
+            g = u.grad
+            x, y = u._parents
+            if x.requires_grad:
+                x.grad += g * y.value
+            if y.requires_grad:
+                y.grad += g * x.value
+
+    @staticmethod
+    def tangent(
+        ctx: Context, tangents: tuple[float, float], x: Vertex, y: Vertex
+    ) -> float:
+        dx, dy = tangents
+        return dx * y.value + x.value * dy
+
+    @staticmethod
+    def backward_graph(
+        ctx: Context, out: Vertex, x: Vertex, y: Vertex
+    ) -> tuple[Vertex, Vertex]:
+        return (y, x)
+
+    @staticmethod
+    def forward_source(x: str, y: str) -> str:
+        return f"{x} * {y}"
+
+    @staticmethod
+    def backward_source(out: str, x: str, y: str) -> tuple[str, str]:
+        return (y, x)
+
 
 mul = Mul()
 
 
 class Div(Function):
     @staticmethod
-    def forward(x: Vertex, y: Vertex) -> Vertex:
+    def forward(ctx: Context, x: Vertex, y: Vertex) -> Vertex:
         z = Vertex(x.value / y.value)
+        ctx.save_for_backward(z.value)
         return z
 
     @staticmethod
-    def backward(x: Vertex, y: Vertex) -> tuple[float, float]:
-        return (1 / y.value, -x.value / (y.value**2))
+    def forward_batch(vertices: list[Vertex]) -> None:
+        for u in vertices:
+            x, y = u._parents
+            u.value = z = x.value / y.value
+            u._ctx.save_for_backward(z)
+
+    @staticmethod
+    def backward(ctx: Context, x: Vertex, y: Vertex) -> tuple[float, float]:
+        # d/dy x / y = -(x / y) / y
+        (z,) = ctx.saved
+        inv_y = 1 / y.value
+        return (inv_y, -z * inv_y)
+
+    @staticmethod
+    def tangent(
+        ctx: Context, tangents: tuple[float, float], x: Vertex, y: Vertex
+    ) -> float:
+        dx, dy = tangents
+        (z,) = ctx.saved
+        return (dx - z * dy) / y.value
+
+    @staticmethod
+    def backward_graph(
+        ctx: Context, out: Vertex, x: Vertex, y: Vertex
+    ) -> tuple[Vertex, Vertex]:
+        return (1 / y, -out / y)
+
+    @staticmethod
+    def forward_source(x: str, y: str) -> str:
+        return f"{x} / {y}"
+
+    @staticmethod
+    def backward_source(out: str, x: str, y: str) -> tuple[str, str]:
+        return (f"1 / {y}", f"-{out} / {y}")
 
 
 div = Div()
 
 
 class Neg(Function):
+    saves = False
+
     @staticmethod
-    def forward(x: Vertex) -> Vertex:
+    def forward(ctx: Context, x: Vertex) -> Vertex:
         return Vertex(-x.value)
 
     @staticmethod
-    def backward(x: Vertex) -> tuple[float]:
+    def forward_batch(vertices: list[Vertex]) -> None:
+        for u in vertices:
+            (x,) = u._parents
+            u.value = -x.value
+
+    @staticmethod
+    def backward(ctx: Context, x: Vertex) -> tuple[float]:
         return (-1.0,)
 
+    @staticmethod
+    def backward_batch(vertices: list[Vertex]) -> None:
+        for u in vertices:
+            (x,) = u._parents
+            if x.requires_grad:
+                x.grad -= u.grad
+
+    @staticmethod
+    def tangent(ctx: Context, tangents: tuple[float], x: Vertex) -> float:
+        (dx,) = tangents
+        return -dx
+
+    @staticmethod
+    def backward_graph(ctx: Context, out: Vertex, x: Vertex) -> tuple[float]:
+        return (-1.0,)
+
+    @staticmethod
+    def forward_source(x: str) -> str:
+        return f"-{x}"
+
+    @staticmethod
+    def backward_source(out: str, x: str) -> tuple[str]:
+        return ("-1.0",)
+
 
 neg = Neg()
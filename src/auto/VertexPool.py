@@ -0,0 +1,114 @@
+from typing import ClassVar, Self
+
+from src.auto.Vertex import Vertex
+
+
+def _pooled_call(cls: type[Vertex], *args, **kwargs) -> Vertex:
+    # Creates vertices while a pool is active, in place of type.__call__
+    v = VertexPool._active.take(cls)
+    v.__init__(*args, **kwargs)
+    return v
+
+
+class VertexPool:
+    """
+    A recycling pool of Vertex objects for graphs which are rebuilt every step.
+
+    While a pool is active, new vertices take their storage from the pool's free
+    list instead of allocating a new object. The outermost pool installs this on
+    entry and removes it on exit, so vertices created outside of any pool are
+    allocated as usual, without checking for one. `reset` hands every vertex taken since
+    the previous reset back to the free list, so the next step reuses them rather
+    than allocating (and later collecting) fresh objects.
+
+    Vertices created inside the pool must not be used after a reset, so long-lived
+    vertices such as parameters should be created outside of it.
+
+    The pool saves allocations and collections rather than time: taking storage
+    from it runs Python code, which costs more per vertex than CPython's allocator
+    (see benchmarks/gc_scope.py).
+
+    Example:
+        pool = VertexPool()
+        for x, y in data:
+            with pool:
+                loss = loss_fn(model(x)[0], y)
+                loss.backward()
+            opt.step()
+            loss.zero_grad()
+            pool.reset()
+    """
+
+    # Pool that new vertices currently take storage from, if any
+    _active: ClassVar["VertexPool | None"] = None
+
+    def __init__(self) -> None:
+        """
+        Initialize an empty pool.
+        """
+        # Free storage per Vertex class, and everything handed out since the last reset
+        self._free: dict[type[Vertex], list[Vertex]] = {}
+        self._used: list[Vertex] = []
+
+        # Number of vertices which were newly allocated and which were recycled
+        self.allocated = 0
+        self.reused = 0
+
+        self._previous: VertexPool | None = None
+
+    def __len__(self) -> int:
+        return sum(len(free) for free in self._free.values())
+
+    def __repr__(self) -> str:
+        return (
+            f"{type(self).__name__}(free={len(self)}, in_use={len(self._used)}, "
+            f"allocated={self.allocated}, reused={self.reused})"
+        )
+
+    def __enter__(self) -> Self:
+        self._previous = VertexPool._active
+        VertexPool._active = self
+        if self._previous is None:
+            type(Vertex).__call__ = _pooled_call
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        VertexPool._active = self._previous
+        if self._previous is None:
+            del type(Vertex).__call__
+        self._previous = None
+
+    def take(self, cls: type[Vertex]) -> Vertex:
+        """
+        Get uninitialised storage for a vertex, recycled where possible.
+
+        Args:
+            cls: Vertex class to get storage for
+
+        Returns:
+            Vertex: Object of the given class, to be initialised by its __init__
+        """
+        free = self._free.get(cls)
+        if free:
+            v = free.pop()
+            self.reused += 1
+        else:
+            v = object.__new__(cls)
+            self.allocated += 1
+        self._used.append(v)
+        return v
+
+    def reset(self) -> None:
+        """
+        Return every vertex taken since the previous reset to the free list.
+
+        References held by the vertices (parents, saved contexts and cached
+        orderings) are dropped, so the rest of the old graph is freed right away.
+        """
+        for v in self._used:
+            v._parents = ()
+            v._ctx = None
+            v._topo_sort = None
+            v._tape = None
+            self._free.setdefault(type(v), []).append(v)
+        self._used.clear()
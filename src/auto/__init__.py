@@ -1,2 +1,28 @@
 from .Vertex import Vertex
-from .Function import Function
+from .Function import Context, Function
+from .Tape import Tape
+from .VertexPool import VertexPool
+from .StaticGraph import StaticGraph
+from .IncrementalGraph import IncrementalGraph
+from .CompiledGraph import CompiledGraph
+from .ProgramCache import ProgramCache
+from .CachedStep import CachedStep
+from .Lanes import Lanes
+from .LaneBatch import LaneBatch
+from .AutoBatch import AutoBatch
+from .GraphBuffer import GraphBuffer
+from .grad_mode import enable_grad, is_grad_enabled, no_grad
+from .gc_mode import training_scope
+from .functional import backward, grad, hvp, jacobian, jvp
+from .DualLevel import DualLevel
+from .SparseMatrix import SparseMatrix
+from .sparse import sparse_hessian, sparse_jacobian, sparsity_pattern
+from .wavefront import dependency_levels, wavefront_backward
+from .compiler import compile_graph, fingerprint
+from .passes import (
+    eliminate_common_subexpressions,
+    fold_constants,
+    fuse_reductions,
+    intern_constants,
+    optimise,
+)
@@ -0,0 +1,355 @@
+import hashlib
+import math
+import re
+from collections.abc import Callable, Sequence
+from types import CodeType
+
+from src.auto.Function import Context, Function
+from src.auto.graph import topo_sort
+from src.auto.Vertex import Vertex
+
+# Part of every fingerprint, so programs cached by older versions are not reused
+_VERSION = 1
+
+# Values are named v<i>, adjoints g<i> and partials of functions without source d<i>
+_NAME = re.compile(r"\b[vgd]\d+\b")
+_ATOM = re.compile(r"-?[\w.]+(\[\d+\])?")
+
+# Names and numbers, which are substituted into other expressions without parentheses
+_BARE = re.compile(r"[\w.]+(\[\d+\])?")
+
+# Inlined expressions nest, and Python's compiler recurses into nested expressions
+_MAX_DEPTH = 32
+
+# Longer sums are written as a call, since chains of + nest just as deeply
+_MAX_TERMS = 32
+
+
+def _fallback(op: type[Function], ctx: Context) -> tuple[Callable, Callable]:
+    # Run a function without source form on temporary constant vertices
+    def forward(*values: float) -> float:
+        return op.forward(ctx, *[Vertex(x, requires_grad=False) for x in values]).value
+
+    def backward(*values: float) -> tuple[float, ...]:
+        return op.backward(ctx, *[Vertex(x, requires_grad=False) for x in values])
+
+    return forward, backward
+
+
+def _sum(terms: list[str]) -> str:
+    if not terms:
+        return "0.0"
+    if len(terms) > _MAX_TERMS:
+        return f"sum(({', '.join(terms)},))"
+    return " + ".join(terms)
+
+
+def _term(adjoint: str, partial: str) -> str | None:
+    # Contribution of a child's adjoint times its partial, simplified for constants
+    if partial in ("0", "0.0"):
+        return None
+    if partial in ("1", "1.0"):
+        return adjoint
+    if partial == "-1.0":
+        return f"-{adjoint}"
+    if adjoint == "1.0":
+        return partial
+    if not _ATOM.fullmatch(partial):
+        partial = f"({partial})"
+    return f"{adjoint} * {partial}"
+
+
+def _tuple(items: list[str]) -> str:
+    return f"({', '.join(items)},)" if items else "()"
+
+
+def _unpack(names: list[str], arg: str) -> list[str]:
+    return [f"{_tuple(names)} = {arg}"] if names else []
+
+
+class _Builder:
+    # Straight-line statements in SSA form, i.e. every name is assigned once
+    def __init__(self) -> None:
+        self.statements: list[tuple[str, str, bool]] = []
+
+    def assign(self, name: str, expr: str, pure: bool = True) -> None:
+        self.statements.append((name, expr, pure))
+
+    def emit(self, result: str) -> list[str]:
+        # Drop statements whose result is never used, walking backwards
+        live = set(_NAME.findall(result))
+        kept = []
+        for name, expr, pure in reversed(self.statements):
+            if name in live or not pure:
+                live.update(_NAME.findall(expr))
+                kept.append((name, expr, pure))
+        kept.reverse()
+
+        uses: dict[str, int] = {}
+        for _, expr, _ in kept:
+            for used in _NAME.findall(expr):
+                uses[used] = uses.get(used, 0) + 1
+        for used in _NAME.findall(result):
+            uses[used] = uses.get(used, 0) + 1
+
+        # Inline pure expressions used exactly once into their user, and copies
+        # (e.g. the adjoint passed through an addition) into all of their users
+        inlined: dict[str, tuple[str, int]] = {}
+
+        def substitute(expr: str) -> tuple[str, int]:
+            if expr in inlined:
+                return inlined[expr]
+            depth = 0
+
+            def replace(match: re.Match) -> str:
+                nonlocal depth
+                inner = inlined.get(match.group())
+                if inner is None:
+                    return match.group()
+                if _BARE.fullmatch(inner[0]):
+                    return inner[0]
+                depth = max(depth, inner[1] + 1)
+                return f"({inner[0]})"
+
+            return _NAME.sub(replace, expr), depth
+
+        lines = []
+        for name, expr, pure in kept:
+            expr, depth = substitute(expr)
+            if pure and (
+                _ATOM.fullmatch(expr) or (uses.get(name, 0) == 1 and depth < _MAX_DEPTH)
+            ):
+                inlined[name] = (expr, depth)
+            else:
+                lines.append(f"{name} = {expr}")
+        lines.append(f"return {substitute(result)[0]}")
+        return lines
+
+
+class _Layout:
+    # Ordering of a graph and the roles of its leaves, shared by the fingerprint,
+    # the generated source and the values passed to it
+    __slots__ = (
+        "root",
+        "inputs",
+        "order",
+        "index",
+        "ops",
+        "parameters",
+        "constants",
+        "wrt",
+    )
+
+    def __init__(
+        self, root: Vertex, inputs: Sequence[Vertex], wrt: Sequence[Vertex] | None
+    ) -> None:
+        self.root = root
+        self.inputs = tuple(inputs)
+        self.order = topo_sort((root,))
+        self.index = {u: i for i, u in enumerate(self.order)}
+        is_input = set(inputs)
+
+        self.ops = [u for u in self.order if u._op is not None]
+        for u in self.ops:
+            if not u._op.compilable:
+                raise ValueError(f"{u._op.__name__} cannot be compiled.")
+        leaves = [u for u in self.order if u._op is None and u not in is_input]
+        self.parameters = [u for u in leaves if u.requires_grad]
+        self.constants = [u for u in leaves if not u.requires_grad]
+
+        self.wrt = self.parameters if wrt is None else list(wrt)
+        for v in (*inputs, *self.wrt):
+            if v._op is not None:
+                raise ValueError(f"Inputs and wrt must be leaf vertices, got {v}.")
+
+    def name(self, v: Vertex) -> str:
+        return f"v{self.index[v]}"
+
+    def bindings(self) -> dict[str, object]:
+        # Globals of the generated source, for functions without source form
+        bindings: dict[str, object] = {}
+        for u in self.ops:
+            args = [self.name(v) for v in u._parents]
+            if (
+                u._op.forward_source(*args) is None
+                or u._op.backward_source(self.name(u), *args) is None
+            ):
+                i = self.index[u]
+                bindings[f"f{i}"], bindings[f"b{i}"] = _fallback(u._op, u._ctx)
+        return bindings
+
+    def fingerprint(self) -> str:
+        roles = {v: f"input {k}" for k, v in enumerate(self.inputs)}
+        roles.update((v, "parameter") for v in self.parameters)
+        roles.update((v, "constant") for v in self.constants)
+
+        lines = [f"version {_VERSION}"]
+        for u in self.order:
+            if u._op is None:
+                lines.append(roles[u])
+            else:
+                parents = " ".join(str(self.index[v]) for v in u._parents)
+                lines.append(f"{u._op.__module__}.{u._op.__qualname__} {parents}")
+        lines.append(f"root {self.index[self.root]}")
+        for v in self.inputs:
+            lines.append(f"input at {self.index.get(v, -1)}")
+        for v in self.wrt:
+            lines.append(f"wrt {self.index.get(v, -1)}")
+        return hashlib.sha256("\n".join(lines).encode()).hexdigest()
+
+    def source(self) -> str:
+        index, name, root = self.index, self.name, self.root
+        header = [
+            *_unpack([name(v) if v in index else "_" for v in self.inputs], "inputs"),
+            *_unpack([name(v) for v in self.parameters], "parameters"),
+            *_unpack([name(v) for v in self.constants], "constants"),
+        ]
+
+        forward = _Builder()
+        backward_partials: dict[Vertex, list[str] | None] = {}
+        for u in self.ops:
+            i = index[u]
+            args = [name(v) for v in u._parents]
+            expr = u._op.forward_source(*args)
+            if expr is None:
+                forward.assign(name(u), f"f{i}({', '.join(args)})", pure=False)
+            else:
+                forward.assign(name(u), expr)
+            backward_partials[u] = u._op.backward_source(name(u), *args)
+
+        # Only vertices depending on a wrt leaf carry an adjoint
+        reaches = set(self.wrt)
+        for u in self.ops:
+            if any(v in reaches for v in u._parents):
+                reaches.add(u)
+
+        both = _Builder()
+        both.statements = list(forward.statements)
+        terms: dict[Vertex, list[str]] = {u: [] for u in reaches}
+        for u in reversed(self.ops):
+            if u not in reaches:
+                continue
+            i = index[u]
+            if u is root:
+                adjoint = "1.0"
+            else:
+                adjoint = f"g{i}"
+                both.assign(adjoint, _sum(terms.pop(u)))
+
+            partials = backward_partials[u]
+            if partials is None:
+                args = ", ".join(name(v) for v in u._parents)
+                both.assign(f"d{i}", f"b{i}({args})", pure=False)
+                partials = [f"d{i}[{k}]" for k in range(len(u._parents))]
+
+            for v, partial in zip(u._parents, partials):
+                if v in reaches:
+                    term = _term(adjoint, partial)
+                    if term is not None:
+                        terms[v].append(term)
+
+        grads = []
+        for v in self.wrt:
+            if v is root:
+                grads.append("1.0")
+            elif v in terms:
+                both.assign(f"g{index[v]}", _sum(terms.pop(v)))
+                grads.append(f"g{index[v]}")
+            elif v in index:
+                grads.append(f"g{index[v]}")
+            else:
+                grads.append("0.0")
+
+        return "\n".join(
+            [
+                "def value(inputs, parameters, constants):",
+                *(f"    {line}" for line in header + forward.emit(name(root))),
+                "",
+                "",
+                "def value_and_grad(inputs, parameters, constants):",
+                *(
+                    f"    {line}"
+                    for line in header + both.emit(f"{name(root)}, {_tuple(grads)}")
+                ),
+                "",
+            ]
+        )
+
+
+def compile_graph(
+    root: Vertex,
+    inputs: Sequence[Vertex],
+    wrt: Sequence[Vertex] | None = None,
+) -> tuple[str, dict[str, object], list[Vertex], list[Vertex]]:
+    """
+    Generate straight-line Python source evaluating a recorded graph.
+
+    Two functions of `(inputs, parameters, constants)` are generated: `value`
+    computes the value of the root, and `value_and_grad` also computes the
+    gradients of the root with respect to `wrt`, returned as `(value, grads)`.
+    Every vertex becomes a local variable, using each Function's `forward_source`
+    and `backward_source`. Functions without source form run their forward and
+    backward on temporary vertices instead.
+
+    Statements whose result is never used are dropped (e.g. gradients flowing only
+    into the inputs), and expressions used once are inlined into their user.
+
+    Args:
+        root: Output vertex of the recorded graph
+        inputs: Leaf vertices whose values are passed as `inputs`
+        wrt: Leaf vertices to compute gradients with respect to, by default the
+            parameters, i.e. the leaves requiring gradients other than the inputs
+
+    Returns:
+        tuple[str, dict[str, object], list[Vertex], list[Vertex]]: Source of both
+            functions, the globals it needs besides `math`, and the leaves whose
+            values are passed as `parameters` and `constants`, in that order
+    """
+    layout = _Layout(root, inputs, wrt)
+    return layout.source(), layout.bindings(), layout.parameters, layout.constants
+
+
+def fingerprint(
+    root: Vertex,
+    inputs: Sequence[Vertex],
+    wrt: Sequence[Vertex] | None = None,
+) -> str:
+    """
+    Hash the structure of a recorded graph, independently of its values.
+
+    The hash covers the Function and parents of every vertex and the role of every
+    leaf (input, parameter or constant), so graphs recorded by the same code, e.g.
+    one training step of a fixed architecture, share a fingerprint across
+    processes. Since values are passed to the compiled source as arguments,
+    graphs with the same fingerprint share the same compiled program.
+
+    Args:
+        root: Output vertex of the recorded graph
+        inputs: Leaf vertices whose values are passed as `inputs`
+        wrt: Leaf vertices to compute gradients with respect to, by default the
+            parameters
+
+    Returns:
+        str: Hexadecimal SHA-256 digest of the structure
+    """
+    return _Layout(root, inputs, wrt).fingerprint()
+
+
+def load(
+    program: str | CodeType, bindings: dict[str, object]
+) -> tuple[Callable, Callable]:
+    """
+    Load generated source, or its compiled code, as its two functions.
+
+    Args:
+        program: Source generated by `compile_graph`, or the code object it compiles to
+        bindings: Globals the source needs besides `math`
+
+    Returns:
+        tuple[Callable, Callable]: The `value` and `value_and_grad` functions
+    """
+    if isinstance(program, str):
+        program = compile(program, "<compiled graph>", "exec")
+    namespace = {"math": math, **bindings}
+    exec(program, namespace)
+    return namespace["value"], namespace["value_and_grad"]
@@ -0,0 +1,337 @@
+import typing
+from collections.abc import Callable, Sequence
+
+from src.auto.DualLevel import DualLevel
+from src.auto.graph import backpropagate, clear_grads, topo_sort
+from src.auto.Vertex import Vertex
+
+if typing.TYPE_CHECKING:
+    from src.nn.Matrix import Matrix
+
+
+def _as_tuple(vertices: Vertex | Sequence[Vertex]) -> tuple[Vertex, ...]:
+    return (vertices,) if isinstance(vertices, Vertex) else tuple(vertices)
+
+
+def backward(
+    roots: Vertex | Sequence[Vertex],
+    seeds: Sequence[float] | None = None,
+    retain_graph: bool = False,
+) -> None:
+    """
+    Backpropagate from several roots with a single shared reverse sweep.
+
+    Each root is seeded with its upstream gradient, so a vector-Jacobian product
+    (e.g. backpropagating a Vector of per-sample losses) costs one traversal of
+    the graph rather than one per root. Gradients accumulate into `.grad` as with
+    `Vertex.backward`.
+
+    Args:
+        roots: Output vertices to backpropagate from
+        seeds: Upstream gradient of each root, ones by default
+        retain_graph: Keep the graph intact, e.g. to backpropagate through it again
+    """
+    roots = _as_tuple(roots)
+    if seeds is None:
+        seeds = (1.0,) * len(roots)
+    if len(seeds) != len(roots):
+        raise ValueError(f"Expected {len(roots)} seeds, got {len(seeds)}.")
+
+    tapes = {u._tape for u in roots}
+    if tapes != {None}:
+        if len(tapes) > 1:
+            raise ValueError("Roots must all be recorded on the same tape.")
+        tapes.pop().backward(roots, seeds, retain_graph=retain_graph)
+        return
+
+    order = topo_sort(roots, skip_constants=True)[::-1]
+    clear_grads(order)
+    for u in roots:
+        u.grad = 0
+    for u, g in zip(roots, seeds):
+        u.grad += g
+
+    leaves = backpropagate(order, retain_graph=retain_graph)
+
+    if not retain_graph:
+        # Only the leaves remain reachable for zero_grad
+        for u in roots:
+            u._topo_sort = [u, *leaves]
+
+
+def _check_partials(order: Sequence[Vertex]) -> None:
+    for u in order:
+        if u._op is not None and not u._op.partials:
+            raise ValueError(
+                f"{u._op.__name__} does not return partial derivatives, e.g. for "
+                "gradient checkpointing, so only backward supports it."
+            )
+
+
+def _path_sort(outputs: Sequence[Vertex], inputs: Sequence[Vertex]) -> list[Vertex]:
+    # Topological order of the vertices on an input-output path, found in a single
+    # search from the outputs which does not descend into constants and keeps a
+    # vertex once it is finished if it is an input or one of its parents was kept
+    on_path: list[Vertex] = []
+    relevant = set(inputs)
+    seen: set[Vertex] = set()
+
+    for root in outputs:
+        if root in seen:
+            continue
+        seen.add(root)
+
+        stack = [(root, iter(root._parents))]
+        while stack:
+            node, parents = stack[-1]
+            for parent in parents:
+                if parent not in seen and (parent.requires_grad or parent in relevant):
+                    seen.add(parent)
+                    stack.append((parent, iter(parent._parents)))
+                    break
+            else:
+                stack.pop()
+                if node in relevant or any(v in relevant for v in node._parents):
+                    relevant.add(node)
+                    on_path.append(node)
+
+    return on_path
+
+
+def grad(
+    outputs: Vertex | Sequence[Vertex],
+    inputs: Vertex | Sequence[Vertex],
+    grad_outputs: Sequence[float] | None = None,
+    create_graph: bool = False,
+) -> tuple[float, ...] | tuple[Vertex | float, ...]:
+    """
+    Compute the gradients of the outputs with respect to a chosen set of inputs.
+
+    Only vertices on a path from one of the inputs to one of the outputs have their
+    backward evaluated, and gradients are accumulated in a local table, so the
+    `.grad` of vertices in the graph is left untouched and the graph is retained.
+
+    Args:
+        outputs: Vertices to differentiate
+        inputs: Vertices to differentiate with respect to
+        grad_outputs: Gradients to seed each output with, ones by default
+        create_graph: Build the gradients as Vertex operations (using each
+            Function's `backward_graph`), so they can be differentiated again
+
+    Returns:
+        tuple: Gradient of the (seeded) sum of outputs for each input, as Vertices
+            where they depend on the inputs if create_graph is set
+    """
+    outputs = _as_tuple(outputs)
+    inputs = _as_tuple(inputs)
+    if any(u._tape is not None for u in outputs):
+        raise ValueError("Taped vertices do not link their parents, use Tape.backward.")
+    if grad_outputs is None:
+        grad_outputs = (1.0,) * len(outputs)
+    if len(grad_outputs) != len(outputs):
+        raise ValueError(
+            f"Expected {len(outputs)} output gradients, got {len(grad_outputs)}."
+        )
+
+    on_path = _path_sort(outputs, inputs)
+    relevant = set(on_path)
+    _check_partials(on_path)
+
+    grads: dict[Vertex, float] = {}
+    for u, g in zip(outputs, grad_outputs):
+        grads[u] = grads.get(u, 0.0) + g
+
+    for u in reversed(on_path):
+        g = grads.get(u)
+        if not g or u._op is None:
+            continue
+        if u._ctx is None:
+            raise RuntimeError("Trying to differentiate through a released graph.")
+
+        if create_graph:
+            node_grads = u._op.backward_graph(u._ctx, u, *u._parents)
+        else:
+            node_grads = u._op.backward(u._ctx, *u._parents)
+        for v, node_grad in zip(u._parents, node_grads):
+            if v in relevant:
+                grads[v] = grads.get(v, 0.0) + g * node_grad
+
+    return tuple(grads.get(v, 0.0) for v in inputs)
+
+
+def jvp(
+    f: Callable[..., Vertex | Sequence[Vertex]],
+    primals: Sequence[float | Vertex],
+    tangents: Sequence[float],
+) -> tuple[float, float] | tuple[tuple[float, ...], tuple[float, ...]]:
+    """
+    Compute a Jacobian-vector product with forward-mode automatic differentiation.
+
+    The function is evaluated once on dual numbers, i.e. every function application
+    also evaluates its tangent rule, giving one column of the Jacobian (for a unit
+    tangent) without recording a graph.
+
+    Args:
+        f: Function of one Vertex per primal, returning a Vertex or a sequence of them
+        primals: Point to evaluate the function at
+        tangents: Direction to differentiate in, one entry per primal
+
+    Returns:
+        tuple: Value(s) of the function, and the matching tangent(s) of the output(s)
+    """
+    if len(tangents) != len(primals):
+        raise ValueError(f"Expected {len(primals)} tangents, got {len(tangents)}.")
+
+    with DualLevel() as level:
+        inputs = [level.make_dual(p, t) for p, t in zip(primals, tangents)]
+        outputs = f(*inputs)
+
+    if isinstance(outputs, Vertex):
+        return outputs.value, level.tangent(outputs)
+    return (
+        tuple(v.value for v in outputs),
+        tuple(level.tangent(v) for v in outputs),
+    )
+
+
+def hvp(
+    output: Vertex, inputs: Sequence[Vertex], v: Sequence[float]
+) -> tuple[float, ...]:
+    """
+    Compute a Hessian-vector product by differentiating through backward.
+
+    The gradient of the output is first built as a graph of Vertex operations,
+    its inner product with v is then differentiated again. This costs roughly two
+    gradient evaluations, rather than one per input with finite differences.
+
+    Args:
+        output: Scalar vertex to take the Hessian of, e.g. a loss
+        inputs: Vertices to differentiate with respect to, e.g. parameters
+        v: Vector to multiply the Hessian with, one entry per input
+
+    Returns:
+        tuple[float, ...]: Entries of the product of the Hessian with v
+    """
+    inputs = _as_tuple(inputs)
+    if len(v) != len(inputs):
+        raise ValueError(f"Expected {len(inputs)} vector entries, got {len(v)}.")
+
+    grads = grad(output, inputs, create_graph=True)
+
+    # Constant gradients do not depend on the inputs, so do not contribute
+    terms = [g * v_i for g, v_i in zip(grads, v) if isinstance(g, Vertex)]
+    if not terms:
+        return (0.0,) * len(inputs)
+
+    return grad(sum(terms[1:], terms[0]), inputs)
+
+
+def _identity(n: int) -> list[list[float]]:
+    return [[float(i == j) for j in range(n)] for i in range(n)]
+
+
+def _jacobian_forward(
+    order: list[Vertex],
+    inputs: tuple[Vertex, ...],
+    outputs: tuple[Vertex, ...],
+    seeds: list[list[float]],
+) -> list[list[float]]:
+    # Push k tangent directions through the graph, seeds[j] holds input j's entries,
+    # and the result is the (n_outputs, k) product of the Jacobian with the seeds
+    _check_partials(order)
+    k = len(seeds[0]) if seeds else 0
+    tangents: dict[Vertex, list[float]] = dict(zip(inputs, seeds))
+
+    for u in order:
+        if u._op is None:
+            continue
+        t = [0.0] * k
+        partials = u._op.backward(u._ctx, *u._parents)
+        for v, d in zip(u._parents, partials):
+            t_v = tangents.get(v)
+            if t_v is None or not d:
+                continue
+            for c in range(k):
+                t[c] += d * t_v[c]
+        tangents[u] = t
+
+    zeros = [0.0] * k
+    return [list(tangents.get(u, zeros)) for u in outputs]
+
+
+def _jacobian_reverse(
+    order: list[Vertex],
+    inputs: tuple[Vertex, ...],
+    outputs: tuple[Vertex, ...],
+    seeds: list[list[float]],
+) -> list[list[float]]:
+    # Pull k adjoint directions through the graph, seeds[i] holds output i's entries,
+    # and the result is the (k, n_inputs) product of the seeds with the Jacobian
+    _check_partials(order)
+    k = len(seeds[0]) if seeds else 0
+    adjoints: dict[Vertex, list[float]] = {u: [0.0] * k for u in order}
+    for u, seed in zip(outputs, seeds):
+        a = adjoints[u]
+        for c in range(k):
+            a[c] += seed[c]
+
+    for u in reversed(order):
+        a = adjoints[u]
+        if u._op is None or not any(a):
+            continue
+        partials = u._op.backward(u._ctx, *u._parents)
+        for v, d in zip(u._parents, partials):
+            a_v = adjoints.get(v)
+            if a_v is None or not d:
+                continue
+            for c in range(k):
+                a_v[c] += d * a[c]
+
+    zeros = [0.0] * k
+    columns = [adjoints.get(x, zeros) for x in inputs]
+    return [[column[c] for column in columns] for c in range(k)]
+
+
+def jacobian(
+    f: Callable[..., Vertex | Sequence[Vertex]],
+    inputs: Sequence[float | Vertex],
+    mode: str | None = None,
+) -> "Matrix":
+    """
+    Compute the full Jacobian of a function with a single traversal of its graph.
+
+    The graph is recorded and sorted once. Instead of one backward per output, all
+    seed directions are propagated together, so each vertex evaluates its local
+    partials once. Forward accumulation carries one tangent per input, reverse
+    accumulation one adjoint per output, and by default the cheaper of the two is
+    chosen.
+
+    Args:
+        f: Function of one Vertex per input, returning a Vertex or a sequence of them
+        inputs: Point to evaluate the Jacobian at
+        mode: "forward" or "reverse", by default forward if there are fewer inputs
+            than outputs and reverse otherwise
+
+    Returns:
+        Matrix: Constant matrix of shape (n_outputs, n_inputs)
+    """
+    # src.nn builds on src.auto, so is only imported when needed
+    from src.nn.Matrix import Matrix
+
+    xs = tuple(Vertex(float(x.value if isinstance(x, Vertex) else x)) for x in inputs)
+    outputs = _as_tuple(f(*xs))
+    if any(u._tape is not None for u in outputs):
+        raise ValueError("Taped vertices do not link their parents.")
+
+    if mode is None:
+        mode = "forward" if len(xs) < len(outputs) else "reverse"
+
+    order = topo_sort(outputs, skip_constants=True)
+    if mode == "forward":
+        rows = _jacobian_forward(order, xs, outputs, _identity(len(xs)))
+    elif mode == "reverse":
+        rows = _jacobian_reverse(order, xs, outputs, _identity(len(outputs)))
+    else:
+        raise ValueError(f"Mode must be 'forward' or 'reverse', got {mode!r}.")
+
+    return Matrix(rows, requires_grad=False)
@@ -0,0 +1,67 @@
+from contextlib import ContextDecorator
+
+# Whether Function applications are recorded for backpropagation
+enabled = True
+
+
+def is_grad_enabled() -> bool:
+    """
+    Check whether graph recording is currently enabled.
+
+    Returns:
+        bool: False inside a `no_grad` block, True otherwise
+    """
+    return enabled
+
+
+class no_grad(ContextDecorator):
+    """
+    Context manager (and decorator) which turns off graph recording.
+
+    Inside the block, functions produce bare leaf vertices: no parents, producing
+    function or saved context are attached, so nothing is kept alive for a
+    backward pass that will never happen.
+
+    Example:
+        with no_grad():
+            y_pred = model(x)
+
+        @no_grad()
+        def predict(x): ...
+    """
+
+    def __init__(self) -> None:
+        self._previous: list[bool] = []
+
+    def __enter__(self) -> None:
+        global enabled
+        self._previous.append(enabled)
+        enabled = False
+
+    def __exit__(self, *exc_info) -> None:
+        global enabled
+        enabled = self._previous.pop()
+
+
+class enable_grad(ContextDecorator):
+    """
+    Context manager (and decorator) which turns graph recording back on, e.g. for a
+    backward which records a graph of its own while the caller is under `no_grad`.
+
+    Example:
+        with no_grad():
+            with enable_grad():
+                y = model(x)  # recorded
+    """
+
+    def __init__(self) -> None:
+        self._previous: list[bool] = []
+
+    def __enter__(self) -> None:
+        global enabled
+        self._previous.append(enabled)
+        enabled = True
+
+    def __exit__(self, *exc_info) -> None:
+        global enabled
+        enabled = self._previous.pop()
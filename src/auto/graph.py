@@ -0,0 +1,110 @@
+import typing
+from collections.abc import Iterable
+
+if typing.TYPE_CHECKING:
+    from src.auto.Vertex import Vertex
+
+
+def topo_sort(
+    roots: Iterable["Vertex"], skip_constants: bool = False
+) -> list["Vertex"]:
+    """
+    Compute a topological ordering of the graph(s) reachable from the roots.
+
+    The traversal is an iterative depth-first search with an explicit stack,
+    so arbitrarily deep graphs (e.g. long chains of additions) do not hit
+    Python's recursion limit.
+
+    Args:
+        roots: Vertices to start the traversal from
+        skip_constants: Do not descend into parents which do not require gradients
+
+    Returns:
+        list[Vertex]: Vertices ordered such that every parent precedes its children
+    """
+    order: list["Vertex"] = []
+    seen: set["Vertex"] = set()
+
+    for root in roots:
+        if root in seen:
+            continue
+        seen.add(root)
+
+        stack = [(root, iter(root._parents))]
+        while stack:
+            node, parents = stack[-1]
+            for parent in parents:
+                if parent not in seen and (parent.requires_grad or not skip_constants):
+                    seen.add(parent)
+                    stack.append((parent, iter(parent._parents)))
+                    break
+            else:
+                stack.pop()
+                order.append(node)
+
+    return order
+
+
+def clear_grads(order: Iterable["Vertex"]) -> None:
+    """
+    Reset the gradients of the intermediate vertices, before seeding a sweep.
+
+    A retained graph keeps the gradients of its intermediate vertices after
+    backward, so they are cleared before backpropagating through it again.
+
+    Args:
+        order: Vertices of the graph
+    """
+    for u in order:
+        if u._op is not None:
+            u.grad = 0
+
+
+def backpropagate(
+    order: list["Vertex"], retain_graph: bool = False, create_graph: bool = False
+) -> list["Vertex"]:
+    """
+    Send gradients from children to parents in a single reverse sweep.
+
+    The gradients of the roots must already be seeded, on top of intermediate
+    gradients cleared by `clear_grads`. Unless the graph is retained, the gradients
+    of intermediate vertices are reset as soon as they have been consumed, and the
+    vertices release their parent links and saved context at that point. A retained
+    graph keeps them, e.g. to inspect the gradient of a hidden activation.
+
+    Args:
+        order: Vertices in reverse topological order, i.e. children before parents
+        retain_graph: Keep the graph intact, e.g. to backpropagate through it again
+        create_graph: Build the gradients as Vertex operations (using each
+            Function's `backward_graph`), so they can be differentiated again
+
+    Returns:
+        list[Vertex]: Leaves encountered in the sweep, whose gradients were accumulated
+    """
+    leaves = []
+    for u in order:
+        if u._op is None:
+            leaves.append(u)
+            continue
+        if u._ctx is None:
+            raise RuntimeError(
+                "Trying to backpropagate through a released graph, "
+                "call backward with retain_graph=True to keep it."
+            )
+
+        if create_graph:
+            node_grads = u._op.backward_graph(u._ctx, u, *u._parents)
+        else:
+            node_grads = u._op.backward(u._ctx, *u._parents)
+        for v, node_grad in zip(u._parents, node_grads):
+            if v.requires_grad:
+                v.grad += u.grad * node_grad
+
+        if not retain_graph:
+            # Intermediate gradients are consumed, so they do not leak into later passes
+            u.grad = 0
+            u._parents = ()
+            u._ctx = None
+            u._topo_sort = None
+
+    return leaves
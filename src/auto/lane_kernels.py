@@ -0,0 +1,98 @@
+import math
+import re
+from collections.abc import Callable, Iterable
+
+from src.auto.Function import Context, Function
+from src.auto.Lanes import Lanes
+from src.auto.Vertex import Vertex
+
+# Lane kernels per Function, direction and pattern of lane-valued arguments
+_kernels: dict[tuple, Callable] = {}
+
+
+def _uses(expr: str, names: list[str]) -> list[str]:
+    return [n for n in names if re.search(rf"\b{n}\b", expr)]
+
+
+def _lanewise(expr: str, lanes: list[str]) -> str:
+    # Evaluate expr once per lane, rebinding the lane names to that lane's value
+    if not lanes:
+        return expr
+    if len(lanes) == 1:
+        return f"Lanes([{expr} for {lanes[0]} in {lanes[0]}])"
+    names = ", ".join(lanes)
+    return f"Lanes([{expr} for {names} in zip({names})])"
+
+
+def _compile(name: str, params: list[str], body: str) -> Callable:
+    source = f"def {name}({', '.join(params)}):\n    return {body}\n"
+    namespace = {"math": math, "Lanes": Lanes}
+    exec(compile(source, f"<lane kernel {name}>", "exec"), namespace)
+    return namespace[name]
+
+
+def _forward_kernel(op: type[Function], is_lane: tuple[bool, ...]) -> Callable:
+    key = (op, "forward", is_lane)
+    kernel = _kernels.get(key)
+    if kernel is None:
+        names = [f"a{i}" for i in range(len(is_lane))]
+        expr = op.forward_source(*names)
+        if expr is None:
+            raise NotImplementedError(
+                f"{op.__name__} has no source form, so cannot be applied to lanes."
+            )
+        lanes = [n for n, lane in zip(names, is_lane) if lane]
+        kernel = _kernels[key] = _compile("forward", names, _lanewise(expr, lanes))
+    return kernel
+
+
+def _backward_kernel(op: type[Function], is_lane: tuple[bool, ...]) -> Callable:
+    key = (op, "backward", is_lane)
+    kernel = _kernels.get(key)
+    if kernel is None:
+        names = [f"a{i}" for i in range(len(is_lane))]
+        partials = op.backward_source("out", *names)
+        if partials is None:
+            raise NotImplementedError(
+                f"{op.__name__} has no source form, so cannot be applied to lanes."
+            )
+        # The output has lanes whenever any input does
+        lanes = [n for n, lane in zip(names, is_lane) if lane]
+        if lanes:
+            lanes.append("out")
+
+        # Partials which do not depend on any lane are computed once
+        body = ", ".join(_lanewise(p, _uses(p, lanes)) for p in partials)
+        kernel = _kernels[key] = _compile("backward", ["out", *names], f"({body},)")
+    return kernel
+
+
+def _values(args: Iterable[Vertex]) -> tuple[list, tuple[bool, ...]]:
+    values = [v.value for v in args]
+    return values, tuple(isinstance(x, Lanes) for x in values)
+
+
+class LaneFunction(Function):
+    """
+    A function applied to lanes, whose context holds the applied Function and its
+    output lanes.
+    """
+
+    # Every applied Function is a LaneFunction, told apart only by its context,
+    # which forward does not rebuild from the inputs
+    mergeable = False
+    serialisable = False
+
+    @staticmethod
+    def forward(ctx: Context, *args: Vertex) -> Vertex:
+        op, _ = ctx.saved
+        values, is_lane = _values(args)
+        z = Vertex(_forward_kernel(op, is_lane)(*values))
+        ctx.save_for_backward(op, z.value)
+        return z
+
+    @staticmethod
+    def backward(ctx: Context, *args: Vertex) -> tuple:
+        op, out = ctx.saved
+        values, is_lane = _values(args)
+        return _backward_kernel(op, is_lane)(out, *values)
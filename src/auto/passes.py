@@ -0,0 +1,203 @@
+import math
+from collections.abc import Sequence
+
+from src.auto.functional import _as_tuple
+from src.auto.graph import topo_sort
+from src.auto.Vertex import Vertex
+
+
+def _graph(roots: tuple[Vertex, ...]) -> list[Vertex]:
+    if any(u._tape is not None for u in roots):
+        raise ValueError("Taped vertices do not link their parents.")
+    return topo_sort(roots)
+
+
+def _rewire(order: list[Vertex], replacements: dict[Vertex, Vertex]) -> None:
+    # Point every child at the replacement of each of its parents
+    for u in order:
+        if any(v in replacements for v in u._parents):
+            u._parents = tuple(replacements.get(v, v) for v in u._parents)
+
+
+def _reset(roots: tuple[Vertex, ...]) -> None:
+    # Cached orderings may still list removed vertices
+    for u in roots:
+        u._topo_sort = None
+
+
+def fold_constants(roots: Vertex | Sequence[Vertex]) -> int:
+    """
+    Replace operations whose parents are all constants by constant leaves.
+
+    Such operations are not recorded in the first place, but can remain in a graph
+    whose leaves stopped requiring gradients after it was recorded, e.g. frozen
+    parameters. Their value is already computed, so they simply drop their parents.
+
+    Args:
+        roots: Output vertices of the graph
+
+    Returns:
+        int: Number of folded operations
+    """
+    roots = _as_tuple(roots)
+
+    folded = 0
+    for u in _graph(roots):
+        if u._op is not None and not any(v.requires_grad for v in u._parents):
+            u._op = None
+            u._parents = ()
+            u._ctx = None
+            u.requires_grad = False
+            folded += 1
+
+    _reset(roots)
+    return folded
+
+
+def intern_constants(roots: Vertex | Sequence[Vertex]) -> int:
+    """
+    Share a single vertex between all constant leaves with the same value.
+
+    Scalar broadcasting and literal operands create a fresh constant for every
+    operation, e.g. each `x * 2`. Constants are assumed not to be modified after
+    the graph is recorded.
+
+    Args:
+        roots: Output vertices of the graph
+
+    Returns:
+        int: Number of constants replaced by an equal one
+    """
+    roots = _as_tuple(roots)
+    order = _graph(roots)
+
+    # The sign is part of the key, so that 0.0 and -0.0 are kept apart
+    interned: dict[tuple[float, float], Vertex] = {}
+    replacements: dict[Vertex, Vertex] = {}
+    for u in order:
+        if u._op is None and not u.requires_grad and u not in roots:
+            key = (u.value, math.copysign(1.0, u.value))
+            replacements[u] = interned.setdefault(key, u)
+
+    replacements = {u: v for u, v in replacements.items() if u is not v}
+    _rewire(order, replacements)
+    _reset(roots)
+    return len(replacements)
+
+
+def eliminate_common_subexpressions(roots: Vertex | Sequence[Vertex]) -> int:
+    """
+    Merge operations which apply the same Function to the same parents.
+
+    Functions which are not `mergeable`, e.g. the outputs of a checkpointed segment
+    which differ only in their context, are left as they are. Vertices are visited in topological order, so merging a subexpression exposes
+    the expressions built on top of it as duplicates in turn. Gradients of a merged
+    vertex are accumulated from the children of both.
+
+    Args:
+        roots: Output vertices of the graph
+
+    Returns:
+        int: Number of operations merged into an identical one
+    """
+    roots = _as_tuple(roots)
+
+    seen: dict[tuple, Vertex] = {}
+    replacements: dict[Vertex, Vertex] = {}
+    for u in _graph(roots):
+        if any(v in replacements for v in u._parents):
+            u._parents = tuple(replacements.get(v, v) for v in u._parents)
+        if u._op is None or not u._op.mergeable:
+            continue
+
+        key = (u._op, *map(id, u._parents))
+        v = seen.setdefault(key, u)
+        if v is not u:
+            replacements[u] = v
+
+    _reset(roots)
+    return len(replacements)
+
+
+def fuse_reductions(roots: Vertex | Sequence[Vertex]) -> int:
+    """
+    Collapse chains of binary additions and multiplications into n-ary ones.
+
+    An addition (or multiplication) whose operand is itself an addition (or
+    multiplication) used nowhere else absorbs that operand's parents, so e.g.
+    `a + b + c + d` becomes a single `F.add(a, b, c, d)` vertex instead of three.
+
+    Args:
+        roots: Output vertices of the graph
+
+    Returns:
+        int: Number of operations absorbed into another
+    """
+    # src.functions builds on src.auto, so is only imported when needed
+    import src.functions.functions as F
+    from src.auto.Function import _DISCARDED, Context
+    from src.auto.Vertex import Add, Mul
+
+    roots = _as_tuple(roots)
+    order = _graph(roots)
+
+    children: dict[Vertex, int] = {}
+    for u in order:
+        for v in u._parents:
+            children[v] = children.get(v, 0) + 1
+
+    fused = {Add: F.Add, F.Add: F.Add, Mul: F.Mult, F.Mult: F.Mult}
+
+    absorbed = 0
+    for u in order:
+        op = fused.get(u._op)
+        if op is None or u._ctx is None:
+            continue
+
+        parents = []
+        changed = False
+        for v in u._parents:
+            if (
+                fused.get(v._op) is op
+                and v._ctx is not None
+                and children[v] == 1
+                and v not in roots
+            ):
+                parents.extend(v._parents)
+                changed = True
+                absorbed += 1
+            else:
+                parents.append(v)
+
+        if changed:
+            ctx = Context() if op.saves else _DISCARDED
+            u.value = op.forward(ctx, *parents).value
+            u._op = op
+            u._parents = tuple(parents)
+            u._ctx = ctx
+
+    _reset(roots)
+    return absorbed
+
+
+def optimise(roots: Vertex | Sequence[Vertex]) -> int:
+    """
+    Shrink a recorded graph by folding, interning, merging and fusing vertices.
+
+    Run before backward, or before building a StaticGraph, since both traverse
+    the optimised graph afterwards.
+
+    Args:
+        roots: Output vertices of the graph
+
+    Returns:
+        int: Number of vertices removed from the graph
+    """
+    roots = _as_tuple(roots)
+    n = len(_graph(roots))
+
+    fold_constants(roots)
+    intern_constants(roots)
+    eliminate_common_subexpressions(roots)
+    fuse_reductions(roots)
+    return n - len(topo_sort(roots))
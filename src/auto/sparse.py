@@ -0,0 +1,198 @@
+from collections.abc import Callable, Sequence
+
+from src.auto.functional import (
+    _as_tuple,
+    _jacobian_forward,
+    _jacobian_reverse,
+    grad,
+)
+from src.auto.graph import topo_sort
+from src.auto.SparseMatrix import SparseMatrix
+from src.auto.Vertex import Vertex
+
+
+def _dependencies(
+    order: list[Vertex], inputs: tuple[Vertex, ...]
+) -> dict[Vertex, frozenset[int]]:
+    # Indices of the inputs each vertex depends on, vertices with a single
+    # dependent parent share its set rather than copying it
+    empty: frozenset[int] = frozenset()
+    deps: dict[Vertex, frozenset[int]] = {}
+    for j, x in enumerate(inputs):
+        deps[x] = deps.get(x, empty) | {j}
+
+    for u in order:
+        d = deps.get(u, empty)
+        for v in u._parents:
+            d_v = deps.get(v, empty)
+            if not d_v <= d:
+                d = d | d_v
+        deps[u] = d
+    return deps
+
+
+def sparsity_pattern(
+    outputs: Vertex | Sequence[Vertex], inputs: Vertex | Sequence[Vertex]
+) -> list[set[int]]:
+    """
+    Detect which inputs each output structurally depends on.
+
+    Dependencies are propagated along the `_parents` links in a single forward
+    sweep over the graph, without evaluating any derivatives. An entry of the
+    pattern may still be numerically zero (e.g. the derivative of relu).
+
+    Args:
+        outputs: Vertices the rows of the pattern belong to
+        inputs: Vertices the columns of the pattern belong to
+
+    Returns:
+        list[set[int]]: Indices of the inputs each output depends on
+    """
+    outputs = _as_tuple(outputs)
+    inputs = _as_tuple(inputs)
+
+    deps = _dependencies(topo_sort(outputs, skip_constants=True), inputs)
+    return [set(deps[u]) for u in outputs]
+
+
+def _colour(groups: Sequence[set[int]], n: int) -> list[int]:
+    """
+    Greedily colour n items, such that no two items in the same group share a colour.
+
+    Items are visited by decreasing number of groups (largest first), and each gets
+    the smallest colour not yet taken within its groups.
+
+    Args:
+        groups: Sets of item indices which must all have distinct colours
+        n: Number of items
+
+    Returns:
+        list[int]: Colour of each item, numbered from zero
+    """
+    memberships: list[list[int]] = [[] for _ in range(n)]
+    for g, group in enumerate(groups):
+        for item in group:
+            memberships[item].append(g)
+
+    colours = [-1] * n
+    for item in sorted(range(n), key=lambda i: -len(memberships[i])):
+        taken = {
+            colours[other]
+            for g in memberships[item]
+            for other in groups[g]
+            if colours[other] >= 0
+        }
+        colour = 0
+        while colour in taken:
+            colour += 1
+        colours[item] = colour
+    return colours
+
+
+def _one_hot(colours: list[int]) -> list[list[float]]:
+    k = max(colours, default=-1) + 1
+    return [[float(c == colour) for c in range(k)] for colour in colours]
+
+
+def _sparse_jacobian(
+    inputs: tuple[Vertex, ...], outputs: tuple[Vertex, ...], mode: str | None
+) -> SparseMatrix:
+    m, n = len(outputs), len(inputs)
+    order = topo_sort(outputs, skip_constants=True)
+    deps = _dependencies(order, inputs)
+    rows = [deps[u] for u in outputs]
+    columns: list[set[int]] = [set() for _ in range(n)]
+    for i, row in enumerate(rows):
+        for j in row:
+            columns[j].add(i)
+
+    # Structurally orthogonal columns share no row, so can be seeded together in
+    # one forward direction, and likewise rows sharing no column in reverse
+    if mode is None:
+        column_colours = _colour(rows, n)
+        row_colours = _colour(columns, m)
+        n_forward = max(column_colours, default=-1) + 1
+        n_reverse = max(row_colours, default=-1) + 1
+        mode = "forward" if n_forward < n_reverse else "reverse"
+    elif mode == "forward":
+        column_colours = _colour(rows, n)
+    elif mode == "reverse":
+        row_colours = _colour(columns, m)
+    else:
+        raise ValueError(f"Mode must be 'forward' or 'reverse', got {mode!r}.")
+
+    if mode == "forward":
+        compressed = _jacobian_forward(order, inputs, outputs, _one_hot(column_colours))
+        entries = [
+            {j: compressed[i][column_colours[j]] for j in rows[i]} for i in range(m)
+        ]
+    else:
+        compressed = _jacobian_reverse(order, inputs, outputs, _one_hot(row_colours))
+        entries = [
+            {j: compressed[row_colours[i]][j] for j in rows[i]} for i in range(m)
+        ]
+
+    return SparseMatrix.from_rows(entries, n)
+
+
+def sparse_jacobian(
+    f: Callable[..., Vertex | Sequence[Vertex]],
+    inputs: Sequence[float | Vertex],
+    mode: str | None = None,
+) -> SparseMatrix:
+    """
+    Compute a structurally sparse Jacobian with one direction per colour.
+
+    The sparsity pattern is detected from the graph, then structurally orthogonal
+    columns (forward) or rows (reverse) are grouped by greedy colouring. Every group
+    is seeded as a single direction, so the cost scales with the number of colours
+    rather than the number of inputs or outputs, and each entry is read back from
+    the compressed result.
+
+    Args:
+        f: Function of one Vertex per input, returning a Vertex or a sequence of them
+        inputs: Point to evaluate the Jacobian at
+        mode: "forward" or "reverse", by default whichever needs fewer colours
+
+    Returns:
+        SparseMatrix: Jacobian of shape (n_outputs, n_inputs), storing the entries
+            of the sparsity pattern
+    """
+    xs = tuple(Vertex(float(x.value if isinstance(x, Vertex) else x)) for x in inputs)
+    outputs = _as_tuple(f(*xs))
+    if any(u._tape is not None for u in outputs):
+        raise ValueError("Taped vertices do not link their parents.")
+
+    return _sparse_jacobian(xs, outputs, mode)
+
+
+def sparse_hessian(
+    f: Callable[..., Vertex], inputs: Sequence[float | Vertex]
+) -> SparseMatrix:
+    """
+    Compute a structurally sparse Hessian with one direction per colour.
+
+    The gradient is built as a graph of Vertex operations (as for `hvp`), and its
+    sparse Jacobian is computed in reverse mode. Since the Hessian is symmetric,
+    this amounts to one Hessian-vector product per colour, all propagated in a
+    single sweep.
+
+    Args:
+        f: Function of one Vertex per input, returning a scalar Vertex
+        inputs: Point to evaluate the Hessian at
+
+    Returns:
+        SparseMatrix: Hessian of shape (n_inputs, n_inputs), storing the entries of
+            the sparsity pattern
+    """
+    xs = tuple(Vertex(float(x.value if isinstance(x, Vertex) else x)) for x in inputs)
+    output = f(*xs)
+    if output._tape is not None:
+        raise ValueError("Taped vertices do not link their parents.")
+
+    # Constant gradient entries have an empty row in the Hessian
+    grads = tuple(
+        g if isinstance(g, Vertex) else Vertex(g, requires_grad=False)
+        for g in grad(output, xs, create_graph=True)
+    )
+    return _sparse_jacobian(xs, grads, mode="reverse")
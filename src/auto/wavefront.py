@@ -0,0 +1,125 @@
+import typing
+from collections.abc import Sequence
+
+from src.auto.functional import _as_tuple
+from src.auto.graph import topo_sort
+from src.auto.Vertex import Vertex
+
+if typing.TYPE_CHECKING:
+    from src.auto.Function import Function
+
+
+Levels = list[dict[type["Function"], list[Vertex]]]
+
+
+def dependency_levels(roots: Vertex | Sequence[Vertex]) -> Levels:
+    """
+    Group the operations of a graph by dependency level, then by Function.
+
+    The roots are at level zero, and every other operation is one level past the
+    furthest of its children. So all children of a vertex are at lower levels, and
+    no two vertices within a level depend on each other.
+
+    Args:
+        roots: Output vertices of the graph
+
+    Returns:
+        list[dict[type[Function], list[Vertex]]]: Per level, the operations grouped
+            by the Function which produced them
+    """
+    roots = _as_tuple(roots)
+    if any(u._tape is not None for u in roots):
+        raise ValueError("Taped vertices do not link their parents.")
+
+    # A single root reuses the ordering cached for Vertex.backward
+    if len(roots) == 1:
+        order = roots[0].get_topo_sort()
+    else:
+        order = topo_sort(roots, skip_constants=True)[::-1]
+
+    # Children are visited before their parents, so each level is final when visited
+    depth: dict[Vertex, int] = {}
+    get = depth.get
+    levels: Levels = []
+    for u in order:
+        if u._op is None:
+            continue
+        d = depth.pop(u, 0)
+        if d == len(levels):
+            levels.append({})
+        levels[d].setdefault(u._op, []).append(u)
+
+        d += 1
+        for v in u._parents:
+            if v._op is not None and get(v, 0) < d:
+                depth[v] = d
+
+    return levels
+
+
+def wavefront_backward(
+    roots: Vertex | Sequence[Vertex],
+    seeds: Sequence[float] | None = None,
+    retain_graph: bool = False,
+    levels: Levels | None = None,
+) -> None:
+    """
+    Backpropagate level by level, with one kernel call per Function and level.
+
+    Every level's gradients are complete once the levels before it are done, so all
+    applications of a Function within a level are handed to its `backward_batch`
+    together. For wide graphs, e.g. the one vertex per cell of `Matrix.__matmul__`,
+    this replaces the per-vertex dispatch of `backward` by a few calls per level.
+    Gradients accumulate into `.grad` as with `Vertex.backward`.
+
+    Args:
+        roots: Output vertices to backpropagate from
+        seeds: Upstream gradient of each root, ones by default
+        retain_graph: Keep the graph intact, e.g. to backpropagate through it again
+        levels: Schedule from `dependency_levels`, to reuse it for a retained graph,
+            or `AutoBatch.levels` of the batch which recorded the graph
+    """
+    roots = _as_tuple(roots)
+    if seeds is None:
+        seeds = (1.0,) * len(roots)
+    if len(seeds) != len(roots):
+        raise ValueError(f"Expected {len(roots)} seeds, got {len(seeds)}.")
+    if levels is None:
+        levels = dependency_levels(roots)
+
+    # A retained graph keeps its intermediate gradients, so clear them first
+    for level in levels:
+        for group in level.values():
+            for u in group:
+                u.grad = 0
+    for u in roots:
+        u.grad = 0
+    for u, g in zip(roots, seeds):
+        u.grad += g
+
+    leaves: dict[Vertex, None] = {}
+    for level in levels:
+        for op, group in level.items():
+            for u in group:
+                if u._ctx is None:
+                    raise RuntimeError(
+                        "Trying to backpropagate through a released graph, "
+                        "call backward with retain_graph=True to keep it."
+                    )
+            op.backward_batch(group)
+
+            if not retain_graph:
+                # Consumed intermediate gradients do not leak into later passes
+                for u in group:
+                    u.grad = 0
+                    for v in u._parents:
+                        if v._op is None and v.requires_grad:
+                            leaves[v] = None
+                    u._parents = ()
+                    u._ctx = None
+                    u._topo_sort = None
+
+    if not retain_graph:
+        # Only the leaves remain reachable for zero_grad
+        for u in roots:
+            u._topo_sort = [u, *leaves]
@@ -1,3 +1,3 @@
-from .functions import add, mult, square, sin, cos, tan, exp
+from .functions import add, mult, dot, square, sin, cos, tan, exp, log
 
-__all__ = ["add", "mult", "square", "sin", "cos", "tan", "exp"]
+__all__ = ["add", "mult", "dot", "square", "sin", "cos", "tan", "exp", "log"]
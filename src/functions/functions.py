@@ -1,37 +1,83 @@
 import math
-from math import prod
 
-from src.auto.Function import Function
+from src.auto.Function import Context, Function
 from src.auto.Vertex import Vertex
 
 
 class Add(Function):
+    saves = False
+
     @staticmethod
-    def forward(*args) -> Vertex:
+    def forward(ctx: Context, *args) -> Vertex:
         z = Vertex(sum(v.value for v in args))
         return z
 
     @staticmethod
-    def backward(*args) -> tuple[float, ...]:
+    def forward_batch(vertices: list[Vertex]) -> None:
+        for u in vertices:
+            u.value = sum([v.value for v in u._parents])
+
+    @staticmethod
+    def backward(ctx: Context, *args) -> tuple[float, ...]:
         return (1.0,) * len(args)
 
+    @staticmethod
+    def backward_batch(vertices: list[Vertex]) -> None:
+        for u in vertices:
+            g = u.grad
+            for v in u._parents:
+                if v.requires_grad:
+                    v.grad += g
 
-add = Add()
+    @staticmethod
+    def tangent(ctx: Context, tangents: tuple[float, ...], *args) -> float:
+        return sum(tangents)
 
+    @staticmethod
+    def backward_graph(ctx: Context, out: Vertex, *args) -> tuple[float, ...]:
+        return (1.0,) * len(args)
 
-class Mult(Function):
     @staticmethod
-    def forward(*args) -> Vertex:
-        z = Vertex(prod(v.value for v in args))
-        return z
+    def forward_source(*args: str) -> str:
+        return f"sum(({', '.join(args)},))" if args else "0"
+
+    @staticmethod
+    def backward_source(out: str, *args: str) -> tuple[str, ...]:
+        return ("1.0",) * len(args)
+
+
+add = Add()
 
+
+class Mult(Function):
     @staticmethod
-    def backward(*args) -> tuple[float, ...]:
+    def forward(ctx: Context, *args) -> Vertex:
         n = len(args)
 
+        # Prefix products, saved so backward only needs to build the suffix products
         pre = [1 for _ in range(n)]
         for i in range(1, n):
             pre[i] = args[i - 1].value * pre[i - 1]
+        ctx.save_for_backward(pre)
+
+        z = Vertex(pre[-1] * args[-1].value if n > 0 else 1)
+        return z
+
+    @staticmethod
+    def forward_batch(vertices: list[Vertex]) -> None:
+        for u in vertices:
+            args = u._parents
+            n = len(args)
+            pre = [1 for _ in range(n)]
+            for i in range(1, n):
+                pre[i] = args[i - 1].value * pre[i - 1]
+            u._ctx.save_for_backward(pre)
+            u.value = pre[-1] * args[-1].value if n > 0 else 1
+
+    @staticmethod
+    def backward(ctx: Context, *args) -> tuple[float, ...]:
+        n = len(args)
+        (pre,) = ctx.saved
 
         post = [1 for _ in range(n)]
         for i in range(n - 2, -1, -1):
@@ -39,61 +85,278 @@ class Mult(Function):
 
         return tuple(pre[i] * post[i] for i in range(n))
 
+    @staticmethod
+    def tangent(ctx: Context, tangents: tuple[float, ...], *args) -> float:
+        return sum(t * d for t, d in zip(tangents, Mult.backward(ctx, *args)))
+
+    @staticmethod
+    def backward_graph(ctx: Context, out: Vertex, *args) -> tuple[Vertex | float, ...]:
+        if len(args) == 1:
+            return (1.0,)
+        return tuple(mult(*args[:i], *args[i + 1 :]) for i in range(len(args)))
+
+    @staticmethod
+    def forward_source(*args: str) -> str:
+        return f"math.prod(({', '.join(args)},))" if args else "1"
+
+    @staticmethod
+    def backward_source(out: str, *args: str) -> tuple[str, ...]:
+        return tuple(
+            f"math.prod(({', '.join(args[:i] + args[i + 1 :])},))"
+            if len(args) > 1
+            else "1.0"
+            for i in range(len(args))
+        )
+
 
 mult = Mult()
 
 
+# Inner product dot(x_1, ..., x_n, y_1, ..., y_n), one vertex rather than n products and a sum
+class Dot(Function):
+    saves = False
+
+    @staticmethod
+    def forward(ctx: Context, *args) -> Vertex:
+        n, odd = divmod(len(args), 2)
+        if odd:
+            raise ValueError(f"Expected an even number of arguments, got {len(args)}.")
+
+        z = Vertex(sum(x.value * y.value for x, y in zip(args[:n], args[n:])))
+        return z
+
+    @staticmethod
+    def forward_batch(vertices: list[Vertex]) -> None:
+        # Operands recur across a group (e.g. a weight row applied to every sample,
+        # or a sample's input to every row), so each one's values are gathered once
+        gathered: dict[tuple[Vertex, ...], list[float]] = {}
+        sumprod = math.sumprod
+        for u in vertices:
+            args = u._parents
+            n, odd = divmod(len(args), 2)
+            if odd:
+                raise ValueError(
+                    f"Expected an even number of arguments, got {len(args)}."
+                )
+            xs = args[:n]
+            ys = args[n:]
+            x = gathered.get(xs)
+            if x is None:
+                x = gathered[xs] = [v.value for v in xs]
+            y = gathered.get(ys)
+            if y is None:
+                y = gathered[ys] = [v.value for v in ys]
+            u.value = sumprod(x, y)
+
+    @staticmethod
+    def backward(ctx: Context, *args) -> tuple[float, ...]:
+        # d/dx_i = y_i and d/dy_i = x_i
+        n = len(args) // 2
+        return tuple(v.value for v in args[n:]) + tuple(v.value for v in args[:n])
+
+    @staticmethod
+    def backward_batch(vertices: list[Vertex]) -> None:
+        for u in vertices:
+            g = u.grad
+            args = u._parents
+            n = len(args) // 2
+            for x, y in zip(args[:n], args[n:]):
+                if x.requires_grad:
+                    x.grad += g * y.value
+                if y.requires_grad:
+                    y.grad += g * x.value
+
+    @staticmethod
+    def tangent(ctx: Context, tangents: tuple[float, ...], *args) -> float:
+        n = len(args) // 2
+        return sum(
+            dx * y.value + x.value * dy
+            for x, y, dx, dy in zip(args[:n], args[n:], tangents[:n], tangents[n:])
+        )
+
+    @staticmethod
+    def backward_graph(ctx: Context, out: Vertex, *args) -> tuple[Vertex, ...]:
+        n = len(args) // 2
+        return (*args[n:], *args[:n])
+
+    @staticmethod
+    def forward_source(*args: str) -> str:
+        n = len(args) // 2
+        return f"math.sumprod(({', '.join(args[:n])},), ({', '.join(args[n:])},))"
+
+    @staticmethod
+    def backward_source(out: str, *args: str) -> tuple[str, ...]:
+        n = len(args) // 2
+        return (*args[n:], *args[:n])
+
+
+dot = Dot()
+
+
 class Square(Function):
+    saves = False
+
     @staticmethod
-    def forward(v: Vertex) -> Vertex:
+    def forward(ctx: Context, v: Vertex) -> Vertex:
         z = Vertex(v.value**2)
         return z
 
     @staticmethod
-    def backward(v: Vertex) -> tuple[float]:
+    def forward_batch(vertices: list[Vertex]) -> None:
+        for u in vertices:
+            (v,) = u._parents
+            u.value = v.value**2
+
+    @staticmethod
+    def backward(ctx: Context, v: Vertex) -> tuple[float]:
         return (2 * v.value,)
 
+    @staticmethod
+    def backward_batch(vertices: list[Vertex]) -> None:
+        for u in vertices:
+            (v,) = u._parents
+            if v.requires_grad:
+                v.grad += 2 * u.grad * v.value
+
+    @staticmethod
+    def tangent(ctx: Context, tangents: tuple[float], v: Vertex) -> float:
+        (dv,) = tangents
+        return 2 * v.value * dv
+
+    @staticmethod
+    def backward_graph(ctx: Context, out: Vertex, v: Vertex) -> tuple[Vertex]:
+        return (2 * v,)
+
+    @staticmethod
+    def forward_source(v: str) -> str:
+        return f"{v} ** 2"
+
+    @staticmethod
+    def backward_source(out: str, v: str) -> tuple[str]:
+        return (f"2 * {v}",)
+
 
 square = Square()
 
 
 class Sin(Function):
+    saves = False
+
     @staticmethod
-    def forward(v: Vertex) -> Vertex:
+    def forward(ctx: Context, v: Vertex) -> Vertex:
         z = Vertex(math.sin(v.value))
         return z
 
     @staticmethod
-    def backward(v: Vertex) -> tuple[float]:
+    def forward_batch(vertices: list[Vertex]) -> None:
+        sin = math.sin
+        for u in vertices:
+            (v,) = u._parents
+            u.value = sin(v.value)
+
+    @staticmethod
+    def backward(ctx: Context, v: Vertex) -> tuple[float]:
         return (math.cos(v.value),)
 
+    @staticmethod
+    def tangent(ctx: Context, tangents: tuple[float], v: Vertex) -> float:
+        (dv,) = tangents
+        return math.cos(v.value) * dv
+
+    @staticmethod
+    def backward_graph(ctx: Context, out: Vertex, v: Vertex) -> tuple[Vertex]:
+        return (cos(v),)
+
+    @staticmethod
+    def forward_source(v: str) -> str:
+        return f"math.sin({v})"
+
+    @staticmethod
+    def backward_source(out: str, v: str) -> tuple[str]:
+        return (f"math.cos({v})",)
+
 
 sin = Sin()
 
 
 class Cos(Function):
+    saves = False
+
     @staticmethod
-    def forward(v: Vertex) -> Vertex:
+    def forward(ctx: Context, v: Vertex) -> Vertex:
         z = Vertex(math.cos(v.value))
         return z
 
     @staticmethod
-    def backward(v: Vertex) -> tuple[float]:
+    def forward_batch(vertices: list[Vertex]) -> None:
+        cos = math.cos
+        for u in vertices:
+            (v,) = u._parents
+            u.value = cos(v.value)
+
+    @staticmethod
+    def backward(ctx: Context, v: Vertex) -> tuple[float]:
         return (-math.sin(v.value),)
 
+    @staticmethod
+    def tangent(ctx: Context, tangents: tuple[float], v: Vertex) -> float:
+        (dv,) = tangents
+        return -math.sin(v.value) * dv
+
+    @staticmethod
+    def backward_graph(ctx: Context, out: Vertex, v: Vertex) -> tuple[Vertex]:
+        return (-sin(v),)
+
+    @staticmethod
+    def forward_source(v: str) -> str:
+        return f"math.cos({v})"
+
+    @staticmethod
+    def backward_source(out: str, v: str) -> tuple[str]:
+        return (f"-math.sin({v})",)
+
 
 cos = Cos()
 
 
 class Tan(Function):
     @staticmethod
-    def forward(v: Vertex) -> Vertex:
+    def forward(ctx: Context, v: Vertex) -> Vertex:
         z = Vertex(math.tan(v.value))
+        ctx.save_for_backward(z.value)
         return z
 
     @staticmethod
-    def backward(v: Vertex) -> tuple[float]:
-        return (1 / (math.cos(v.value) ** 2),)
+    def forward_batch(vertices: list[Vertex]) -> None:
+        tan = math.tan
+        for u in vertices:
+            (v,) = u._parents
+            u.value = z = tan(v.value)
+            u._ctx.save_for_backward(z)
+
+    @staticmethod
+    def backward(ctx: Context, v: Vertex) -> tuple[float]:
+        # sec^2(v) = 1 + tan^2(v)
+        (tan_v,) = ctx.saved
+        return (1 + tan_v * tan_v,)
+
+    @staticmethod
+    def tangent(ctx: Context, tangents: tuple[float], v: Vertex) -> float:
+        (dv,) = tangents
+        (tan_v,) = ctx.saved
+        return (1 + tan_v * tan_v) * dv
+
+    @staticmethod
+    def backward_graph(ctx: Context, out: Vertex, v: Vertex) -> tuple[Vertex]:
+        return (1 + out * out,)
+
+    @staticmethod
+    def forward_source(v: str) -> str:
+        return f"math.tan({v})"
+
+    @staticmethod
+    def backward_source(out: str, v: str) -> tuple[str]:
+        return (f"1 + {out} * {out}",)
 
 
 tan = Tan()
@@ -101,27 +364,81 @@ tan = Tan()
 
 class Exp(Function):
     @staticmethod
-    def forward(v: Vertex) -> Vertex:
+    def forward(ctx: Context, v: Vertex) -> Vertex:
         z = Vertex(math.exp(v.value))
+        ctx.save_for_backward(z.value)
         return z
 
     @staticmethod
-    def backward(v: Vertex) -> tuple[float]:
-        return (math.exp(v.value),)
+    def forward_batch(vertices: list[Vertex]) -> None:
+        exp = math.exp
+        for u in vertices:
+            (v,) = u._parents
+            u.value = z = exp(v.value)
+            u._ctx.save_for_backward(z)
+
+    @staticmethod
+    def backward(ctx: Context, v: Vertex) -> tuple[float]:
+        (exp_v,) = ctx.saved
+        return (exp_v,)
+
+    @staticmethod
+    def tangent(ctx: Context, tangents: tuple[float], v: Vertex) -> float:
+        (dv,) = tangents
+        (exp_v,) = ctx.saved
+        return exp_v * dv
+
+    @staticmethod
+    def backward_graph(ctx: Context, out: Vertex, v: Vertex) -> tuple[Vertex]:
+        return (out,)
+
+    @staticmethod
+    def forward_source(v: str) -> str:
+        return f"math.exp({v})"
+
+    @staticmethod
+    def backward_source(out: str, v: str) -> tuple[str]:
+        return (out,)
 
 
 exp = Exp()
 
 
 class Log(Function):
+    saves = False
+
     @staticmethod
-    def forward(v: Vertex) -> Vertex:
+    def forward(ctx: Context, v: Vertex) -> Vertex:
         z = Vertex(math.log(v.value))
         return z
 
     @staticmethod
-    def backward(v: Vertex) -> tuple[float]:
+    def forward_batch(vertices: list[Vertex]) -> None:
+        log = math.log
+        for u in vertices:
+            (v,) = u._parents
+            u.value = log(v.value)
+
+    @staticmethod
+    def backward(ctx: Context, v: Vertex) -> tuple[float]:
         return (1 / v.value,)
 
+    @staticmethod
+    def tangent(ctx: Context, tangents: tuple[float], v: Vertex) -> float:
+        (dv,) = tangents
+        return dv / v.value
+
+    @staticmethod
+    def backward_graph(ctx: Context, out: Vertex, v: Vertex) -> tuple[Vertex]:
+        return (1 / v,)
+
+    @staticmethod
+    def forward_source(v: str) -> str:
+        return f"math.log({v})"
+
+    @staticmethod
+    def backward_source(out: str, v: str) -> tuple[str]:
+        return (f"1 / {v}",)
+
 
 log = Log()
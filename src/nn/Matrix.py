@@ -8,7 +8,9 @@ from src.nn.Vector import Vector
 
 
 class Matrix(Sequence):
-    def __init__(self, data: Sequence[Sequence[float | Vertex]]):
+    def __init__(
+        self, data: Sequence[Sequence[float | Vertex]], requires_grad: bool = True
+    ):
         assert len(data) > 0, "At least one row of data must be supplied."
         m = len(data)
 
@@ -28,7 +30,7 @@ class Matrix(Sequence):
                 if isinstance(item, Vertex):
                     row.append(item)
                 elif isinstance(item, float):
-                    row.append(Vertex(item))
+                    row.append(Vertex(item, requires_grad=requires_grad))
                 else:
                     raise ValueError(
                         "All passed arguments must be either of type Vertex or float."
@@ -71,7 +73,9 @@ class Matrix(Sequence):
     ) -> Self:
         if isinstance(other, float) or isinstance(other, int):
             n_rows, n_cols = self.shape
-            other = type(self)([Vector([(other)] * n_cols)] * n_rows)  # n references
+            other = type(self)(
+                [Vector([(other)] * n_cols, requires_grad=False)] * n_rows
+            )  # n references
         other = typing.cast(Self, other)
 
         if len(self) != len(other):
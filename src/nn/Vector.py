@@ -9,7 +9,7 @@ from src.auto import Vertex
 
 
 class Vector(Sequence):
-    def __init__(self, *args):
+    def __init__(self, *args, requires_grad: bool = True):
         if len(args) == 0:
             raise ValueError("No data supplied.")
 
@@ -25,7 +25,7 @@ class Vector(Sequence):
             if isinstance(parsed_args[i], Vertex):
                 continue
             elif isinstance(parsed_args[i], float):
-                parsed_args[i] = Vertex(parsed_args[i])
+                parsed_args[i] = Vertex(parsed_args[i], requires_grad=requires_grad)
             else:
                 raise ValueError(
                     "All passed arguments must be either of type Vertex or float."
@@ -46,7 +46,9 @@ class Vector(Sequence):
         self, other: Self | float | int, op: Callable[[Vertex, Vertex], Vertex]
     ) -> Self:
         if isinstance(other, float) or isinstance(other, int):
-            other = type(self)([Vertex(other)] * len(self))  # n references
+            other = type(self)(
+                [Vertex(other, requires_grad=False)] * len(self)
+            )  # n references
         other = typing.cast(Self, other)
 
         if len(self) != len(other):
@@ -71,7 +73,7 @@ class Vector(Sequence):
         return self._element_wise_operation(other, sub)
 
     def __rsub__(self, other: float) -> Self:
-        return type(self)([Vertex(other) - v for v in self])
+        return type(self)([Vertex(other, requires_grad=False) - v for v in self])
 
     def __mul__(self, other: Self | float | int) -> Self:
         return self._element_wise_operation(other, mul)
@@ -83,10 +85,14 @@ class Vector(Sequence):
         return self._element_wise_operation(other, truediv)
 
     def __rtruediv__(self, other: float) -> Self:
-        return type(self)([Vertex(other) / v for v in self])
+        return type(self)([Vertex(other, requires_grad=False) / v for v in self])
 
     def __neg__(self) -> Self:
         return type(self)([-v for v in self._data])
 
     def dot(self, other: Self) -> Vertex:
-        return F.add(*(self * other))
+        if len(self) != len(other):
+            raise ValueError(
+                f"Vectors must be same length: {len(self)} != {len(other)}"
+            )
+        return F.dot(*self, *other)
@@ -1,43 +1,124 @@
 import math
-from src.auto import Function, Vertex
+from src.auto import Context, Function, Vertex
 
 
 class Sigmoid(Function):
     @staticmethod
-    def forward(x: Vertex) -> Vertex:
-        return Vertex(1.0 / (1.0 + math.exp(-x.value)))
+    def forward(ctx: Context, x: Vertex) -> Vertex:
+        z = Vertex(1.0 / (1.0 + math.exp(-x.value)))
+        ctx.save_for_backward(z.value)
+        return z
 
     @staticmethod
-    def backward(x: Vertex) -> tuple[float]:
-        sig_x = 1.0 / (1.0 + math.exp(-x.value))
+    def forward_batch(vertices: list[Vertex]) -> None:
+        exp = math.exp
+        for u in vertices:
+            (x,) = u._parents
+            u.value = z = 1.0 / (1.0 + exp(-x.value))
+            u._ctx.save_for_backward(z)
+
+    @staticmethod
+    def backward(ctx: Context, x: Vertex) -> tuple[float]:
+        (sig_x,) = ctx.saved
         return (sig_x * (1.0 - sig_x),)
 
+    @staticmethod
+    def tangent(ctx: Context, tangents: tuple[float], x: Vertex) -> float:
+        (dx,) = tangents
+        (sig_x,) = ctx.saved
+        return sig_x * (1.0 - sig_x) * dx
+
+    @staticmethod
+    def backward_graph(ctx: Context, out: Vertex, x: Vertex) -> tuple[Vertex]:
+        return (out * (1.0 - out),)
+
+    @staticmethod
+    def forward_source(x: str) -> str:
+        return f"1.0 / (1.0 + math.exp(-{x}))"
+
+    @staticmethod
+    def backward_source(out: str, x: str) -> tuple[str]:
+        return (f"{out} * (1.0 - {out})",)
+
 
 sigmoid = Sigmoid()
 
 
 class Tanh(Function):
     @staticmethod
-    def forward(x: Vertex) -> Vertex:
-        return Vertex(math.tanh(x.value))
+    def forward(ctx: Context, x: Vertex) -> Vertex:
+        z = Vertex(math.tanh(x.value))
+        ctx.save_for_backward(z.value)
+        return z
+
+    @staticmethod
+    def forward_batch(vertices: list[Vertex]) -> None:
+        tanh = math.tanh
+        for u in vertices:
+            (x,) = u._parents
+            u.value = z = tanh(x.value)
+            u._ctx.save_for_backward(z)
 
     @staticmethod
-    def backward(x: Vertex) -> tuple[float]:
-        tanh_x = math.tanh(x.value)
+    def backward(ctx: Context, x: Vertex) -> tuple[float]:
+        (tanh_x,) = ctx.saved
         return (1.0 - tanh_x * tanh_x,)
 
+    @staticmethod
+    def tangent(ctx: Context, tangents: tuple[float], x: Vertex) -> float:
+        (dx,) = tangents
+        (tanh_x,) = ctx.saved
+        return (1.0 - tanh_x * tanh_x) * dx
+
+    @staticmethod
+    def backward_graph(ctx: Context, out: Vertex, x: Vertex) -> tuple[Vertex]:
+        return (1.0 - out * out,)
+
+    @staticmethod
+    def forward_source(x: str) -> str:
+        return f"math.tanh({x})"
+
+    @staticmethod
+    def backward_source(out: str, x: str) -> tuple[str]:
+        return (f"1.0 - {out} * {out}",)
+
 
 tanh = Tanh()
 
 
 class ReLU(Function):
+    saves = False
+
     @staticmethod
-    def forward(x: Vertex) -> Vertex:
+    def forward(ctx: Context, x: Vertex) -> Vertex:
         return Vertex(max(0, x.value))
 
     @staticmethod
-    def backward(x: Vertex) -> tuple[float]:
+    def forward_batch(vertices: list[Vertex]) -> None:
+        for u in vertices:
+            (x,) = u._parents
+            u.value = max(0, x.value)
+
+    @staticmethod
+    def backward(ctx: Context, x: Vertex) -> tuple[float]:
+        return (1.0 if x.value >= 0.0 else 0.0,)
+
+    @staticmethod
+    def tangent(ctx: Context, tangents: tuple[float], x: Vertex) -> float:
+        (dx,) = tangents
+        return dx if x.value >= 0.0 else 0.0
+
+    @staticmethod
+    def backward_graph(ctx: Context, out: Vertex, x: Vertex) -> tuple[float]:
         return (1.0 if x.value >= 0.0 else 0.0,)
 
+    @staticmethod
+    def forward_source(x: str) -> str:
+        return f"max(0, {x})"
+
+    @staticmethod
+    def backward_source(out: str, x: str) -> tuple[str]:
+        return (f"(1.0 if {x} >= 0.0 else 0.0)",)
+
 
 relu = ReLU()
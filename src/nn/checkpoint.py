@@ -0,0 +1,210 @@
+import typing
+from collections.abc import Sequence
+
+from src.auto import (
+    AutoBatch,
+    Context,
+    DualLevel,
+    Function,
+    LaneBatch,
+    Tape,
+    Vertex,
+    enable_grad,
+    is_grad_enabled,
+    no_grad,
+)
+from src.auto.graph import backpropagate, topo_sort
+from src.nn.Vector import Vector
+
+if typing.TYPE_CHECKING:
+    from src.nn.components import Component
+
+
+class CheckpointStats:
+    """
+    Running totals of the memory saved and the compute spent by checkpointing.
+
+    Both are counted in vertices, and updated whenever a segment is recomputed
+    during backward.
+    """
+
+    __slots__ = ("saved_vertices", "recomputed_vertices")
+
+    def __init__(self) -> None:
+        """
+        Initialize the totals to zero.
+        """
+        self.saved_vertices = 0
+        self.recomputed_vertices = 0
+
+    def __repr__(self) -> str:
+        return (
+            f"{type(self).__name__}(saved_vertices={self.saved_vertices}, "
+            f"recomputed_vertices={self.recomputed_vertices})"
+        )
+
+    def reset(self) -> None:
+        """
+        Reset the totals to zero.
+        """
+        self.saved_vertices = 0
+        self.recomputed_vertices = 0
+
+
+class _Segment:
+    # State shared by a segment's Checkpoint vertex and its output vertices
+    __slots__ = ("layers", "n_inputs", "values", "grads", "outputs", "stats")
+
+    def __init__(
+        self, layers: Sequence["Component"], n_inputs: int, stats: CheckpointStats
+    ) -> None:
+        self.layers = layers
+        self.n_inputs = n_inputs
+        self.values: list[float] = []
+        self.grads: list[float] = []
+        self.outputs: list[Vertex] = []
+        self.stats = stats
+
+    def __call__(self, x: Vector) -> Vector:
+        for layer in self.layers:
+            x = layer(x)
+        return x
+
+
+class Checkpoint(Function):
+    """
+    Hub vertex of a checkpointed segment, whose parents are the segment's inputs
+    followed by the parameters of its layers.
+
+    Forward evaluates the segment without recording it. Backward recomputes the
+    segment's graph from its inputs, backpropagates the gradients collected by the
+    segment's outputs through it, and adds the resulting input gradients directly
+    to the inputs, so it does not send gradients through its partials.
+    """
+
+    # Backward reads and accumulates gradients of the recorded segment as a side effect
+    compilable = False
+    serialisable = False
+    mergeable = False
+    partials = False
+
+    @staticmethod
+    def forward(ctx: Context, *args: Vertex) -> Vertex:
+        (segment,) = ctx.saved
+        with no_grad():
+            x = Vector([Vertex(v.value) for v in args[: segment.n_inputs]])
+            segment.values = [v.value for v in segment(x)]
+        segment.grads = [0.0] * len(segment.values)
+        return Vertex(0.0)
+
+    @staticmethod
+    def backward(ctx: Context, *args: Vertex) -> tuple[float, ...]:
+        (segment,) = ctx.saved
+        inputs = args[: segment.n_inputs]
+
+        # The segment is recorded again even if backward runs under no_grad
+        x = Vector([Vertex(v.value, requires_grad=v.requires_grad) for v in inputs])
+        with enable_grad():
+            outputs = tuple(segment(x))
+
+        order = topo_sort(outputs, skip_constants=True)
+        n = sum(u._op is not None for u in order)
+        segment.stats.recomputed_vertices += n
+        # The recorded segment is replaced by this vertex and one per output
+        segment.stats.saved_vertices += n - len(outputs) - 1
+
+        # One shared sweep, parameter gradients accumulate as in an ordinary backward.
+        # Unlike `src.auto.backward`, no ordering is cached on the recomputed outputs.
+        for u in outputs:
+            u.grad = 0
+        for u, g in zip(outputs, segment.grads):
+            u.grad += g
+        backpropagate(order[::-1])
+        for v, x_i in zip(inputs, x):
+            if v.requires_grad:
+                v.grad += x_i.grad
+
+        segment.grads = [0.0] * len(segment.grads)
+        return (0.0,) * len(args)
+
+
+class CheckpointOutput(Function):
+    """
+    Output of a checkpointed segment, whose only parent is the segment's hub.
+
+    Backward hands its upstream gradient to the hub rather than a partial, since all
+    outputs are backpropagated through the recomputed segment together.
+    """
+
+    # Backward reads the gradient of the recorded output vertex, and the context
+    # holds which output of the segment it is
+    compilable = False
+    serialisable = False
+    mergeable = False
+    partials = False
+
+    @staticmethod
+    def forward(ctx: Context, hub: Vertex) -> Vertex:
+        segment, i = ctx.saved
+        return Vertex(segment.values[i])
+
+    @staticmethod
+    def backward(ctx: Context, hub: Vertex) -> tuple[float]:
+        segment, i = ctx.saved
+        segment.grads[i] += segment.outputs[i].grad
+        return (0.0,)
+
+
+def checkpoint(
+    layers: Sequence["Component"],
+    x: Vector,
+    parameters: Sequence[Vertex],
+    stats: CheckpointStats,
+) -> Vector:
+    """
+    Apply layers to an input, keeping only the output activations until backward.
+
+    Where no graph would be linked anyway (under `no_grad`, on a Tape, in forward
+    mode, or without any input requiring gradients), or where vertices hold lanes
+    (in a LaneBatch) or have no values yet (in an AutoBatch), the layers are
+    applied as is.
+
+    Args:
+        layers: Components to apply in sequence
+        x: Input vector
+        parameters: Parameter vertices used by the layers
+        stats: Totals to add the saved and recomputed vertices to
+
+    Returns:
+        Vector: Output of the last layer, recorded as one vertex per entry
+    """
+    segment = _Segment(layers, len(x), stats)
+    parents = (*x, *parameters)
+
+    if (
+        not is_grad_enabled()
+        or Tape._active is not None
+        or DualLevel._active is not None
+        or LaneBatch._active is not None
+        or AutoBatch._active is not None
+        or not any(v.requires_grad for v in parents)
+    ):
+        return segment(x)
+
+    ctx = Context()
+    ctx.save_for_backward(segment)
+    hub = Checkpoint.forward(ctx, *parents)
+    hub._parents = parents
+    hub._op = Checkpoint
+    hub._ctx = ctx
+
+    for i in range(len(segment.values)):
+        ctx = Context()
+        ctx.save_for_backward(segment, i)
+        z = CheckpointOutput.forward(ctx, hub)
+        z._parents = (hub,)
+        z._op = CheckpointOutput
+        z._ctx = ctx
+        segment.outputs.append(z)
+
+    return Vector(segment.outputs)
@@ -1,29 +1,66 @@
+from collections.abc import Sequence
+
+from src.auto import Vertex
 from src.nn import Vector
+from src.nn.checkpoint import CheckpointStats, checkpoint
 from src.nn.components import Component
 
 
+def _flatten(parameters: dict | Sequence | Vertex) -> list[Vertex]:
+    if isinstance(parameters, Vertex):
+        return [parameters]
+    if isinstance(parameters, dict):
+        parameters = parameters.values()
+    return [v for p in parameters for v in _flatten(p)]
+
+
 class Sequential(Component):
     """
     A sequential container of neural network components.
 
     This component chains multiple components together, passing the output
     of one component as input to the next.
+
+    With checkpointing, the layers are split into segments of a fixed number of
+    layers. Only the activations at segment boundaries are kept alive between
+    forward and backward, and each segment's graph is recomputed from its inputs
+    during backward, trading extra compute for memory. Checkpointed graphs support
+    `Vertex.backward` (and `src.auto.backward`), but not `grad` or `jacobian`.
     """
 
-    def __init__(self, layers: list[Component]) -> None:
+    def __init__(self, layers: list[Component], checkpoint: int | None = None) -> None:
         """
         Initialize a Sequential component with a list of layers.
 
         Args:
             layers: List of Component objects to be applied in sequence
+            checkpoint: Number of layers per checkpointed segment, e.g. 1 for every
+                layer, or None to keep the full graph
         """
         super().__init__()
+        if checkpoint is not None and checkpoint < 1:
+            raise ValueError(
+                f"Checkpoint segments need at least one layer, got {checkpoint}."
+            )
+
         self._layers = layers
         for i, layer in enumerate(layers):
             self._parameters[str(i)] = layer._parameters
 
+        self._checkpoint = checkpoint
+        self.checkpoint_stats = CheckpointStats()
+
     def forward(self, x: Vector) -> Vector:
+        if self._checkpoint is None:
+            z = x
+            for layer in self._layers:
+                z = layer(z)
+            return z
+
         z = x
-        for layer in self._layers:
-            z = layer(z)
+        k = self._checkpoint
+        for i in range(0, len(self._layers), k):
+            layers = self._layers[i : i + k]
+            parameters = _flatten([layer.parameters for layer in layers])
+            z = checkpoint(layers, z, parameters, self.checkpoint_stats)
         return z
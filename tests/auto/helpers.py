@@ -0,0 +1,38 @@
+"""
+Helpers shared by the tests of the autodiff engine.
+"""
+
+from src.auto import Context, Function, Vertex
+
+
+class Cube(Function):
+    # Only forward and backward, so no source form and no batched kernels
+    @staticmethod
+    def forward(ctx: Context, x: Vertex) -> Vertex:
+        ctx.save_for_backward(x.value)
+        return Vertex(x.value**3)
+
+    @staticmethod
+    def backward(ctx: Context, x: Vertex) -> tuple[float]:
+        (x_value,) = ctx.saved
+        return (3 * x_value**2,)
+
+
+cube = Cube()
+
+
+def parameters_of(parameters: dict | list | Vertex) -> list[Vertex]:
+    """
+    Flatten the nested parameters of a component (e.g. `model.parameters`).
+
+    Args:
+        parameters: Vertex, or dict or sequence nesting vertices
+
+    Returns:
+        list[Vertex]: Parameter vertices in a fixed order
+    """
+    if isinstance(parameters, Vertex):
+        return [parameters]
+    if isinstance(parameters, dict):
+        parameters = parameters.values()
+    return [v for p in parameters for v in parameters_of(p)]
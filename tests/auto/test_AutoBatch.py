@@ -0,0 +1,175 @@
+from src.auto import (
+    AutoBatch,
+    DualLevel,
+    Function,
+    Tape,
+    dependency_levels,
+    no_grad,
+    wavefront_backward,
+)
+from src.auto.Vertex import Vertex
+from src.functions import add, dot, sin, square
+from src.nn import Linear, Sequential, Vector, relu, sigmoid, tanh
+from helpers import cube, parameters_of
+import math
+import random
+import pytest
+
+
+def _batch_loss(model, X, y):
+    losses = []
+    for x_j, y_j in zip(X, y):
+        x = Vector([Vertex(v, requires_grad=False) for v in x_j])
+        losses.append(square(model(x)[0] - y_j))
+    return add(*losses)
+
+
+class TestAutoBatch:
+    def test_deferred(self):
+        x = Vertex(2.0)
+        with AutoBatch() as batch:
+            z = sin(x) * x + 1.0
+            assert z.value is None
+
+            batch.run()
+            assert z.value == pytest.approx(math.sin(2.0) * 2.0 + 1.0)
+
+        z.backward()
+        assert x.grad == pytest.approx(math.cos(2.0) * 2.0 + math.sin(2.0))
+
+    def test_groups(self):
+        xs = [Vertex(float(j)) for j in range(5)]
+        with AutoBatch() as batch:
+            zs = [square(x * 2.0) + 1.0 for x in xs]
+
+        # One kernel per depth: Mul, Square, Add
+        assert (batch.n_kernels, batch.n_applied) == (3, 15)
+        assert [z.value for z in zs] == [(2.0 * j) ** 2 + 1.0 for j in range(5)]
+
+    def test_default_forward_batch(self):
+        x = Vertex(2.0)
+        with AutoBatch():
+            z = cube(x) + cube(x * 2.0)
+
+        assert z.value == 72.0
+        z.backward()
+        assert x.grad == 3 * 4.0 + 2 * 3 * 16.0
+
+    def test_matches_eager(self):
+        random.seed(0)
+        X = [[random.uniform(-1, 1) for _ in range(3)] for _ in range(6)]
+        y = [random.uniform(-1, 1) for _ in range(6)]
+        model = Sequential(
+            [Linear(3, 5, activation=tanh), Linear(5, 4, activation=sigmoid)]
+            + [Linear(4, 3, activation=relu), Linear(3, 1)]
+        )
+        parameters = parameters_of(model.parameters)
+
+        expected = _batch_loss(model, X, y)
+        expected.backward()
+        grads = [p.grad for p in parameters]
+        for p in parameters:
+            p.grad = 0
+
+        with AutoBatch() as batch:
+            loss = _batch_loss(model, X, y)
+        assert loss.value == pytest.approx(expected.value)
+        assert batch.n_kernels < batch.n_applied
+
+        wavefront_backward(loss)
+        for p, g in zip(parameters, grads):
+            assert p.grad == pytest.approx(g)
+
+        for p in parameters:
+            p.grad = 0
+        with AutoBatch() as batch:
+            loss = _batch_loss(model, X, y)
+        wavefront_backward(loss, levels=batch.levels)
+        for p, g in zip(parameters, grads):
+            assert p.grad == pytest.approx(g)
+
+    def test_levels(self):
+        x = Vertex(2.0)
+        c = Vertex(3.0, requires_grad=False)
+        with AutoBatch() as batch:
+            z = square(sin(x) * square(c))
+        assert batch.levels == dependency_levels(z)
+
+        # Constants are computed in the batch, but not backpropagated
+        wavefront_backward(z, levels=batch.levels)
+        assert x.grad == pytest.approx(2 * math.sin(2.0) * 81.0 * math.cos(2.0))
+
+    def test_levels_outside_parent(self):
+        x = Vertex(2.0)
+        y = x * 2.0
+        with AutoBatch() as batch:
+            z = square(y)
+        assert batch.levels is None
+
+    def test_shared_operands(self):
+        w = [Vertex(1.0), Vertex(2.0)]
+        xs = [[Vertex(1.0), Vertex(-1.0)], [Vertex(3.0), Vertex(0.5)]]
+        with AutoBatch():
+            zs = [dot(*w, *x) for x in xs] + [dot(*xs[0], *xs[0])]
+
+        assert [z.value for z in zs] == [-1.0, 4.0, 2.0]
+
+    def test_constant(self):
+        x = Vertex(3.0, requires_grad=False)
+        with AutoBatch():
+            z = square(x)
+        assert z.value == 9.0
+        assert not z.requires_grad
+        assert z._parents == () and z._op is None
+
+        w = Vertex(3.0)
+        with no_grad(), AutoBatch():
+            z = square(w)
+        assert z.value == 9.0
+        assert z._op is None
+
+    def test_exception(self):
+        x = Vertex(1.0)
+        with pytest.raises(RuntimeError), AutoBatch() as batch:
+            z = square(x)
+            raise RuntimeError
+        assert z.value is None
+        assert AutoBatch._active is None
+        assert batch.n_applied == 0
+
+    def test_taped_parent(self):
+        # Tape entry indices are not depths
+        x = Vertex(1.0)
+        with Tape():
+            for _ in range(3):
+                z = x * 2
+        with AutoBatch():
+            y = square(z)
+        assert y.value == 4.0
+
+    def test_call_restored(self):
+        call = Function.__dict__["__call__"]
+        with pytest.raises(RuntimeError), AutoBatch():
+            assert Function.__dict__["__call__"] is not call
+            raise RuntimeError
+        assert Function.__dict__["__call__"] is call
+        assert square(Vertex(2.0)).value == 4.0
+
+    def test_dual_level(self):
+        x = Vertex(2.0)
+        with AutoBatch(), DualLevel() as level:
+            z = level.make_dual(x, 1.0) * 3.0
+            assert z.value == 6.0
+
+    def test_nested(self):
+        with AutoBatch(), pytest.raises(ValueError):
+            with AutoBatch():
+                pass
+
+    def test_tape(self):
+        with Tape(), AutoBatch(), pytest.raises(ValueError):
+            square(Vertex(1.0))
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
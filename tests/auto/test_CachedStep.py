@@ -0,0 +1,98 @@
+from src.auto import CachedStep, ProgramCache, Vertex
+from src.functions import square
+from src.nn import Linear, Sequential, Vector, tanh
+from helpers import parameters_of
+import random
+import pytest
+
+
+def _model():
+    random.seed(0)
+    return Sequential([Linear(2, 3, activation=tanh), Linear(3, 1)])
+
+
+def _step(model):
+    return lambda x0, x1, y: square(model(Vector([x0, x1]))[0] - y)
+
+
+def _gradients(model, samples):
+    # Gradients per sample, from recording every step
+    parameters = parameters_of(model.parameters)
+    grads = []
+    for x0, x1, y in samples:
+        loss = _step(model)(Vertex(x0), Vertex(x1), Vertex(y))
+        loss.backward()
+        grads.append([v.grad for v in parameters])
+        loss.zero_grad()
+    return grads
+
+
+SAMPLES = [(0.1, 0.2, 0.5), (-1.0, 0.3, 0.0), (0.7, -0.4, 1.0), (0.0, 1.0, -0.5)]
+
+
+class TestCachedStep:
+    def test_compiles_after_warmup(self):
+        step = CachedStep(_step(_model()), warmup=2)
+
+        step(*SAMPLES[0])
+        assert step.graph is None
+        step(*SAMPLES[1])
+        assert step.graph is not None
+
+        step(*SAMPLES[2])
+        assert step.n_recorded == 2
+
+    def test_gradients(self):
+        model = _model()
+        expected = _gradients(model, SAMPLES)
+
+        step = CachedStep(_step(model))
+        parameters = parameters_of(model.parameters)
+        for sample, grads in zip(SAMPLES, expected):
+            step(*sample)
+            assert [v.grad for v in parameters] == pytest.approx(grads)
+            step.zero_grad()
+            assert all(v.grad == 0 for v in parameters)
+
+    def test_changing_structure(self):
+        def fn(x):
+            # The number of terms depends on the value, so the graph is never stable
+            return square(x) if x.value > 0 else square(x) + x
+
+        step = CachedStep(fn)
+        for x in (1.0, -1.0, 1.0, -1.0):
+            step(x)
+        assert step.graph is None
+
+    def test_captured_data(self):
+        samples = iter([1.0, 2.0, 3.0, 4.0])
+
+        def fn(x):
+            # The sample is captured rather than passed, so becomes a new constant
+            return square(x - next(samples))
+
+        step = CachedStep(fn)
+        assert [step(0.0) for _ in range(4)] == [1.0, 4.0, 9.0, 16.0]
+        assert step.graph is None
+
+    def test_warm_start(self, tmp_path):
+        model = _model()
+        step = CachedStep(_step(model), cache=ProgramCache(tmp_path), warmup=2)
+        step(*SAMPLES[0])
+        step(*SAMPLES[1])
+        assert step.graph is not None
+
+        # A later run finds the program, so compiles on its first call
+        cache = ProgramCache(tmp_path)
+        step = CachedStep(_step(model), cache=cache, warmup=2)
+        step(*SAMPLES[0])
+        assert step.graph is not None
+        assert cache.hits >= 1
+
+    def test_warmup(self):
+        with pytest.raises(ValueError):
+            CachedStep(lambda x: x, warmup=0)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
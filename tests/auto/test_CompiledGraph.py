@@ -0,0 +1,215 @@
+from src.auto import (
+    CompiledGraph,
+    ProgramCache,
+    StaticGraph,
+    Tape,
+    fingerprint,
+    no_grad,
+)
+from src.auto.Vertex import Vertex
+import src.functions.functions as F
+from src.functions import cos, exp, log, sin, square, tan
+from src.nn import Linear, Sequential, Vector, relu, sigmoid, tanh
+from helpers import cube, parameters_of
+import math
+import random
+import pytest
+
+
+def _loss(model, x, y):
+    return square(model(x)[0] - y)
+
+
+class TestCompiledGraph:
+    def test_replay_forward(self):
+        x = Vertex(0.0)
+        y = Vertex(0.0)
+        graph = CompiledGraph(square(x - y) + sin(x), inputs=[x, y])
+
+        assert graph(3.0, 1.0) == pytest.approx(4.0 + math.sin(3.0))
+        assert graph(1.0, 3.0) == pytest.approx(4.0 + math.sin(1.0))
+        assert graph.root.value == pytest.approx(4.0 + math.sin(1.0))
+
+    def test_replay_backward(self):
+        w = Vertex(2.0)
+        x = Vertex(0.0)
+        graph = CompiledGraph(square(w * x), inputs=[x])
+
+        graph(1.0)
+        graph.backward()
+        assert w.grad == 4.0
+
+        graph.zero_grad()
+        graph(3.0)
+        graph.backward()
+        assert w.grad == 36.0
+
+    def test_functions(self):
+        def f(x, y):
+            a = F.mult(x, y, x + 1) - x / y
+            b = F.dot(x, y, sin(a), cos(y)) + tan(x) * exp(-y)
+            return log(square(b) + 1) + sigmoid(a) * tanh(b) + relu(a - b)
+
+        x, y = Vertex(0.3), Vertex(1.7)
+        f(x, y).backward()
+        expected = [x.grad, y.grad]
+
+        x, y = Vertex(1.0), Vertex(1.0)
+        graph = CompiledGraph(f(x, y), inputs=[x, y], wrt=[x, y])
+        graph(0.3, 1.7)
+        graph.backward()
+        assert [x.grad, y.grad] == pytest.approx(expected)
+
+    def test_negation_precedence(self):
+        # Inlined negations must keep their parentheses, e.g. (-p) ** 2
+        p = Vertex(3.0)
+        x = Vertex(0.0)
+        graph = CompiledGraph(square(-p) + x, inputs=[x])
+
+        assert graph(1.0) == 10.0
+        graph.backward()
+        assert p.grad == 6.0
+
+    def test_matches_static_graph(self):
+        random.seed(0)
+        model = Sequential([Linear(3, 5, activation=tanh), Linear(5, 1)])
+        parameters = parameters_of(model.parameters)
+        x, y = Vector([0.0] * 3), Vertex(0.0)
+        static = StaticGraph(_loss(model, x, y), inputs=[*x, y])
+        compiled = CompiledGraph(_loss(model, x, y), inputs=[*x, y])
+
+        assert set(compiled.parameters) == set(parameters)
+        for sample in ([0.1, -0.5, 2.0, 0.3], [1.0, 0.0, -1.0, -0.7]):
+            value = static(*sample)
+            static.backward()
+            expected = [v.grad for v in parameters]
+            static.zero_grad()
+
+            assert compiled(*sample) == pytest.approx(value)
+            compiled.backward()
+            assert [v.grad for v in parameters] == pytest.approx(expected)
+            compiled.zero_grad()
+
+    def test_reads_parameters(self):
+        w = Vertex(2.0)
+        x = Vertex(0.0)
+        graph = CompiledGraph(w * x, inputs=[x])
+
+        assert graph(3.0) == 6.0
+        w.value = 5.0
+        assert graph(3.0) == 15.0
+
+    def test_constants(self):
+        x = Vertex(0.0)
+        c = Vertex(4.0, requires_grad=False)
+        graph = CompiledGraph(x * c + 2, inputs=[x])
+
+        assert graph(1.5) == 8.0
+        assert graph.parameters == ()
+
+    def test_input_gradients_dropped(self):
+        w = Vertex(2.0)
+        x = Vertex(0.0)
+        graph = CompiledGraph(sin(w * x), inputs=[x])
+
+        graph(1.0)
+        graph.backward()
+        assert x.grad == 0
+        assert w.grad == pytest.approx(math.cos(2.0))
+        assert graph.wrt == (w,)
+
+        # The partial with respect to x is dead code
+        both = CompiledGraph(sin(w * x), inputs=[x], wrt=[w, x])
+        assert len(graph.source) < len(both.source)
+
+    def test_fallback(self):
+        w = Vertex(0.5)
+        x = Vertex(0.0)
+        graph = CompiledGraph(cube(w * x) + w, inputs=[x])
+
+        assert graph(2.0) == pytest.approx(2.0**3 * 0.5**3 + 0.5)
+        graph.backward()
+        assert w.grad == pytest.approx(3 * 0.5**2 * 2.0**3 + 1)
+
+    def test_not_compilable(self):
+        # Checkpointed segments share state with the recorded graph
+        model = Sequential([Linear(2, 2, activation=tanh), Linear(2, 1)], checkpoint=1)
+        x, y = Vector([0.0] * 2), Vertex(0.0)
+        loss = _loss(model, x, y)
+
+        with pytest.raises(ValueError):
+            CompiledGraph(loss, inputs=[*x, y])
+        with pytest.raises(ValueError):
+            fingerprint(loss, [*x, y])
+
+    def test_no_grad(self):
+        w = Vertex(3.0)
+        x = Vertex(0.0)
+        graph = CompiledGraph(square(w * x), inputs=[x])
+
+        with no_grad():
+            assert graph(2.0) == 36.0
+        graph.backward()
+        assert w.grad == 24.0
+
+    def test_long_chain(self):
+        xs = [Vertex(float(i)) for i in range(2_000)]
+        z = xs[0]
+        for x in xs[1:]:
+            z = z + x * x
+        graph = CompiledGraph(F.add(z, *xs), inputs=[])
+
+        assert graph() == pytest.approx(z.value + sum(x.value for x in xs))
+        graph.backward()
+        assert xs[3].grad == pytest.approx(7.0)
+
+    def test_taped(self):
+        x = Vertex(0.0)
+        with Tape():
+            z = x * 2
+
+        with pytest.raises(ValueError):
+            CompiledGraph(z, inputs=[x])
+
+    def test_cache(self, tmp_path):
+        w = Vertex(2.0)
+        x = Vertex(0.0)
+        graph = CompiledGraph(square(w * x), inputs=[x], cache=ProgramCache(tmp_path))
+        assert graph.fingerprint is not None
+
+        cache = ProgramCache(tmp_path)
+        v = Vertex(3.0)
+        y = Vertex(0.0)
+        graph = CompiledGraph(square(v * y), inputs=[y], cache=cache)
+        assert cache.hits == 1
+        assert graph(2.0) == 36.0
+        graph.backward()
+        assert v.grad == 24.0
+
+
+class TestFingerprint:
+    def test_values_ignored(self):
+        def f(x, w):
+            return square(sin(x * w) + 2)
+
+        x, w = Vertex(0.5), Vertex(1.0)
+        y, v = Vertex(-3.0), Vertex(7.0)
+        assert fingerprint(f(x, w), [x]) == fingerprint(f(y, v), [y])
+
+    def test_structure(self):
+        x, w = Vertex(0.5), Vertex(1.0)
+
+        assert fingerprint(x * w, [x]) != fingerprint(x + w, [x])
+        assert fingerprint(x * w, [x]) != fingerprint(w * x, [x])
+        assert fingerprint(x * w, [x]) != fingerprint(x * w, [w])
+        assert fingerprint(x * w, [x]) != fingerprint(x * w, [x], wrt=[x, w])
+
+    def test_roles(self):
+        x, w = Vertex(0.5), Vertex(1.0)
+        c = Vertex(1.0, requires_grad=False)
+
+        assert fingerprint(x * w, [x]) != fingerprint(x * c, [x])
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,160 @@
+from src.auto import (
+    CompiledGraph,
+    Context,
+    Function,
+    GraphBuffer,
+    LaneBatch,
+    Lanes,
+    ProgramCache,
+    Tape,
+    fingerprint,
+)
+from src.auto.Vertex import Vertex
+from src.functions import exp, mult, sin, square
+from src.nn import Linear, Sequential, Vector, sigmoid, tanh
+import pickle
+import pytest
+
+
+def _model_loss():
+    model = Sequential([Linear(2, 3, activation=tanh), Linear(3, 1)])
+    x = [Vertex(0.5), Vertex(-1.0)]
+    y = Vertex(0.2)
+    return square(model(Vector(x))[0] - y), [*x, y]
+
+
+class TestGraphBuffer:
+    def test_round_trip(self):
+        w = Vertex(2.0)
+        x = Vertex(3.0, requires_grad=False)
+        z = sigmoid(w * x) + mult(w, x, exp(w)) / sin(x)
+        z.backward(retain_graph=True)
+
+        buffer = GraphBuffer(GraphBuffer.from_graph(z, inputs=[x]).tobytes())
+        vertices = buffer.to_graph()
+        root = vertices[buffer.roots[0]]
+        (x_loaded,) = [vertices[i] for i in buffer.inputs]
+        assert len(buffer) == len(vertices)
+        assert root.value == z.value
+        assert x_loaded.value == 3.0 and not x_loaded.requires_grad
+
+        # Gradients are stored, and the rebuilt contexts backpropagate the same
+        w_loaded = [v for v in vertices if v._op is None and v.requires_grad][0]
+        assert w_loaded.grad == w.grad
+        w_loaded.grad = 0
+        root.backward()
+        assert w_loaded.grad == pytest.approx(w.grad)
+
+    def test_layout(self):
+        x = Vertex(1.0)
+        z = square(x) + x
+
+        buffer = GraphBuffer.from_graph(z)
+        assert list(buffer.codes) == [-1, 0, 1]
+        assert buffer.functions == (type(square), z._op)
+        assert list(buffer.parents_of(1)) == [0]
+        assert list(buffer.parents_of(2)) == [1, 0]
+        assert list(buffer.values) == [1.0, 1.0, 2.0]
+        assert list(buffer.requires_grad) == [1, 1, 1]
+
+    def test_zero_copy(self):
+        x = Vertex(1.0)
+        data = bytearray(GraphBuffer.from_graph(square(x)).tobytes())
+
+        buffer = GraphBuffer(data)
+        buffer.grads[0] = 5.0
+        assert GraphBuffer(data).grads[0] == 5.0
+        assert buffer.tobytes() == bytes(data)
+
+    def test_pickle_deep(self):
+        z = Vertex(1.0)
+        for _ in range(10_000):
+            z = z * 1.0001
+
+        buffer = pickle.loads(pickle.dumps(GraphBuffer.from_graph(z)))
+        vertices = buffer.to_graph()
+        assert vertices[buffer.roots[0]].value == z.value
+
+    def test_compiled(self, tmp_path):
+        loss, inputs = _model_loss()
+        cache = ProgramCache(tmp_path)
+        CompiledGraph(loss, inputs, cache=cache)
+
+        buffer = pickle.loads(pickle.dumps(GraphBuffer.from_graph(loss, inputs)))
+        vertices = buffer.to_graph()
+        loaded = [vertices[i] for i in buffer.inputs]
+        root = vertices[buffer.roots[0]]
+        assert fingerprint(root, loaded) == fingerprint(loss, inputs)
+
+        graph = CompiledGraph(root, loaded, cache=cache)
+        assert cache.hits == 1
+        assert graph(0.5, -1.0, 0.2) == pytest.approx(loss.value)
+
+    def test_invalid(self):
+        x = Vertex(1.0)
+        z = square(x)
+
+        with pytest.raises(ValueError):
+            GraphBuffer(b"not a graph at all, just bytes")
+        with pytest.raises(ValueError):
+            GraphBuffer(GraphBuffer.from_graph(z).tobytes()[:-8])
+        with pytest.raises(ValueError):
+            GraphBuffer.from_graph(z, inputs=[Vertex(2.0)])
+
+        z.backward()
+        with pytest.raises(RuntimeError):
+            GraphBuffer.from_graph(z)
+
+    def test_unsupported(self):
+        class Local(Function):
+            @staticmethod
+            def forward(ctx: Context, x: Vertex) -> Vertex:
+                return Vertex(x.value)
+
+            @staticmethod
+            def backward(ctx: Context, x: Vertex) -> tuple[float]:
+                return (1.0,)
+
+        with pytest.raises(ValueError):
+            GraphBuffer.from_graph(Local()(Vertex(1.0)))
+
+        with Tape():
+            z = square(Vertex(1.0))
+        with pytest.raises(ValueError):
+            GraphBuffer.from_graph(z)
+
+        with LaneBatch() as batch:
+            z = square(batch.lanes([1.0, 2.0], requires_grad=True))
+        with pytest.raises(ValueError):
+            GraphBuffer.from_graph(z)
+
+        # Lane applications hold a single value when no input has lanes
+        w = Vertex(1.0)
+        with LaneBatch():
+            z = w * 2.0
+        assert not isinstance(z.value, Lanes)
+        with pytest.raises(ValueError):
+            GraphBuffer.from_graph(z)
+
+        # Checkpointed segments cannot rebuild their contexts
+        model = Sequential([Linear(2, 2, activation=tanh), Linear(2, 1)], checkpoint=1)
+        with pytest.raises(ValueError):
+            GraphBuffer.from_graph(model(Vector([0.5, -1.0]))[0])
+
+    def test_only_functions_loaded(self):
+        x = Vertex(1.0)
+        data = GraphBuffer.from_graph(mult(square(x), x)).tobytes()
+
+        # Forge names of the same length, which resolve to a float and to a
+        # Function whose context cannot be rebuilt
+        for name, forged in (
+            (b"src.functions.functions:Square", b"src.functions.functions:math.e"),
+            (b"src.functions.functions:Mult", b"src.nn.checkpoint:Checkpoint"),
+        ):
+            assert len(name) == len(forged) and name in data
+            with pytest.raises(ValueError):
+                GraphBuffer(data.replace(name, forged))
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
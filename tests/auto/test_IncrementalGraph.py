@@ -0,0 +1,123 @@
+from src.auto import IncrementalGraph
+from src.auto.Vertex import Vertex
+from src.functions import add, exp, mult, sin, square
+import pytest
+
+
+def build(xs: list[Vertex], w: Vertex) -> Vertex:
+    return mult(add(*[square(sin(x * w) + exp(x)) for x in xs]), w)
+
+
+def reference(values: list[float], w_value: float) -> tuple[float, list[float], float]:
+    xs = [Vertex(v) for v in values]
+    w = Vertex(w_value)
+    z = build(xs, w)
+    z.backward()
+    return z.value, [x.grad for x in xs], w.grad
+
+
+class TestIncrementalGraph:
+    def test_recompute_only_affected(self):
+        xs = [Vertex(0.1 * i) for i in range(10)]
+        w = Vertex(0.7)
+        graph = IncrementalGraph(build(xs, w))
+
+        graph.set(xs[3], 0.5)
+        value = graph.recompute()
+
+        # x * w, sin, exp, +, square, the sum and the product
+        assert graph.n_recomputed == 7
+        assert value == pytest.approx(reference([x.value for x in xs], 0.7)[0])
+
+    def test_unchanged_value_stops(self):
+        x = Vertex(0.0)
+        y = Vertex(2.0)
+        graph = IncrementalGraph(exp(x * 0.0) + y)
+
+        graph.set(x, 3.0)
+        graph.recompute()
+
+        assert graph.n_recomputed == 1
+
+    def test_same_value_not_marked(self):
+        x = Vertex(2.0)
+        graph = IncrementalGraph(sin(x))
+
+        graph.set(x, 2.0)
+
+        assert graph.recompute() == pytest.approx(sin(Vertex(2.0)).value)
+        assert graph.n_recomputed == 0
+
+    def test_incremental_gradients(self):
+        xs = [Vertex(0.1 * i - 0.5) for i in range(10)]
+        w = Vertex(0.7)
+        graph = IncrementalGraph(build(xs, w))
+        graph.backward()
+
+        for i, value, w_value in [(3, 0.4, 0.7), (7, -0.2, 0.8), (3, 0.9, 0.8)]:
+            graph.set(xs[i], value)
+            graph.set(w, w_value)
+            graph.recompute()
+            graph.backward()
+
+            expected, x_grads, w_grad = reference([x.value for x in xs], w.value)
+            assert graph.root.value == pytest.approx(expected)
+            assert [x.grad for x in xs] == pytest.approx(x_grads)
+            assert w.grad == pytest.approx(w_grad)
+
+    def test_gradient_region(self):
+        xs = [Vertex(0.1 * i) for i in range(10)]
+        y = Vertex(2.0)
+        graph = IncrementalGraph(add(*[square(x) for x in xs]) + y)
+        graph.backward()
+
+        graph.set(xs[0], 1.0)
+        graph.recompute()
+        graph.backward()
+
+        assert graph.n_backpropagated == 3
+        assert xs[0].grad == 2.0
+        assert xs[1].grad == pytest.approx(0.2)
+
+    def test_feed(self):
+        x = Vertex(1.0)
+        y = Vertex(2.0)
+        graph = IncrementalGraph(x * y + sin(y), inputs=[x, y])
+
+        assert graph(3.0, 2.0) == pytest.approx(6.0 + sin(Vertex(2.0)).value)
+        assert graph.n_recomputed == 2
+
+    def test_zero_grad_resets(self):
+        x = Vertex(1.0)
+        graph = IncrementalGraph(square(x))
+        graph.backward()
+        graph.zero_grad()
+
+        graph.set(x, 3.0)
+        graph.recompute()
+        graph.backward()
+
+        assert x.grad == 6.0
+        assert graph.n_backpropagated == 1
+
+    def test_stale_backward(self):
+        x = Vertex(1.0)
+        graph = IncrementalGraph(square(x))
+
+        graph.set(x, 3.0)
+        with pytest.raises(RuntimeError):
+            graph.backward()
+
+    def test_set_non_leaf(self):
+        x = Vertex(1.0)
+        h = square(x)
+        graph = IncrementalGraph(h * x)
+
+        with pytest.raises(ValueError):
+            graph.set(h, 2.0)
+        with pytest.raises(ValueError):
+            graph.set(Vertex(1.0), 2.0)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,122 @@
+from src.auto import (
+    LaneBatch,
+    Lanes,
+    Tape,
+    eliminate_common_subexpressions,
+    no_grad,
+)
+from src.auto.Vertex import Vertex
+from src.functions import cos, exp, log, sin, square
+from src.nn import Linear, Sequential, Vector, sigmoid, tanh
+from helpers import cube, parameters_of
+import math
+import random
+import pytest
+
+
+class TestLaneBatch:
+    def test_forward(self):
+        with LaneBatch() as batch:
+            x = batch.lanes([0.5, 1.0, 2.0])
+            z = sin(x) * 2 + exp(x) / x - log(x)
+
+        assert isinstance(z.value, Lanes)
+        for z_value, x_value in zip(z.value, [0.5, 1.0, 2.0]):
+            expected = 2 * math.sin(x_value) + math.exp(x_value) / x_value
+            assert z_value == pytest.approx(expected - math.log(x_value))
+
+    def test_broadcast_gradient(self):
+        w = Vertex(3.0)
+        with LaneBatch() as batch:
+            x = batch.lanes([1.0, 2.0, -1.0])
+            loss = square(w * x - 1.0)
+
+        loss.backward()
+        # d/dw sum (w x - 1)^2 = sum 2 (w x - 1) x
+        assert w.grad == pytest.approx(2 * (2 * 1 + 5 * 2 + 4 * 1))
+
+    def test_lane_gradient(self):
+        with LaneBatch() as batch:
+            x = batch.lanes([1.0, 2.0], requires_grad=True)
+            z = x * x
+
+        z.backward()
+        assert x.grad == Lanes([2.0, 4.0])
+
+    def test_accumulates(self):
+        w = Vertex(1.0)
+        w.grad = 10.0
+        with LaneBatch() as batch:
+            loss = w * batch.lanes([1.0, 2.0])
+
+        loss.backward()
+        assert w.grad == 13.0
+
+    def test_matches_per_sample(self):
+        random.seed(0)
+        X = [[random.uniform(-1, 1) for _ in range(3)] for _ in range(8)]
+        y = [random.uniform(-1, 1) for _ in range(8)]
+        model = Sequential(
+            [Linear(3, 5, activation=tanh), Linear(5, 4, activation=sigmoid)]
+            + [Linear(4, 1)]
+        )
+        parameters = parameters_of(model.parameters)
+
+        for x_j, y_j in zip(X, y):
+            x = Vector([Vertex(v, requires_grad=False) for v in x_j])
+            square(model(x)[0] - y_j).backward()
+        expected = [p.grad for p in parameters]
+        for p in parameters:
+            p.grad = 0
+
+        with LaneBatch() as batch:
+            x = Vector([batch.lanes(column) for column in zip(*X)])
+            loss = square(model(x)[0] - batch.lanes(y))
+        loss.backward()
+
+        assert len(loss.value) == 8
+        for p, g in zip(parameters, expected):
+            assert p.grad == pytest.approx(g)
+
+    def test_constant(self):
+        with LaneBatch() as batch:
+            z = square(batch.lanes([1.0, 2.0]))
+        assert z.value == Lanes([1.0, 4.0])
+        assert not z.requires_grad
+
+        w = Vertex(2.0)
+        with no_grad(), LaneBatch() as batch:
+            z = w * batch.lanes([1.0, 2.0])
+        assert z.value == Lanes([2.0, 4.0])
+        assert z._op is None
+
+    def test_common_subexpressions(self):
+        # Different Functions applied to the same lanes must not be merged
+        with LaneBatch() as batch:
+            x = batch.lanes([0.5, 1.0], requires_grad=True)
+            z = sin(x) + cos(x)
+        eliminate_common_subexpressions(z)
+
+        z.backward()
+        assert list(x.grad) == pytest.approx(
+            [math.cos(v) - math.sin(v) for v in (0.5, 1.0)]
+        )
+
+    def test_no_source(self):
+        with LaneBatch() as batch, pytest.raises(NotImplementedError):
+            cube(batch.lanes([1.0, 2.0]))
+
+    def test_tape(self):
+        with Tape(), LaneBatch() as batch, pytest.raises(ValueError):
+            Vertex(1.0) * batch.lanes([1.0, 2.0])
+
+    def test_nested(self):
+        with LaneBatch() as outer:
+            with LaneBatch():
+                pass
+            assert LaneBatch._active is outer
+        assert LaneBatch._active is None
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,40 @@
+from src.auto import Lanes
+import pytest
+
+
+class TestLanes:
+    def test_elementwise(self):
+        x = Lanes([1.0, 2.0, 3.0])
+        y = Lanes([4.0, 5.0, 6.0])
+
+        assert x + y == Lanes([5.0, 7.0, 9.0])
+        assert y - x == Lanes([3.0, 3.0, 3.0])
+        assert x * y == Lanes([4.0, 10.0, 18.0])
+        assert y / x == Lanes([4.0, 2.5, 2.0])
+        assert -x == Lanes([-1.0, -2.0, -3.0])
+
+    def test_broadcast(self):
+        x = Lanes([1.0, 2.0])
+
+        assert x + 1 == Lanes([2.0, 3.0])
+        assert 1 + x == Lanes([2.0, 3.0])
+        assert 1 - x == Lanes([0.0, -1.0])
+        assert 2 * x == Lanes([2.0, 4.0])
+        assert 2 / x == Lanes([2.0, 1.0])
+
+    def test_length_mismatch(self):
+        with pytest.raises(ValueError):
+            Lanes([1.0, 2.0]) + Lanes([1.0])
+
+    def test_reduce(self):
+        x = Lanes([1.0, 2.0, 3.5])
+
+        assert len(x) == 3
+        assert x.sum() == 6.5
+        assert x.tolist() == [1.0, 2.0, 3.5]
+        assert list(x) == [1.0, 2.0, 3.5]
+        assert x[1] == 2.0
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,57 @@
+from src.auto import ProgramCache
+import pytest
+
+
+def _program(value):
+    return compile(f"x = {value}", "<test>", "exec")
+
+
+def _run(program):
+    namespace = {}
+    exec(program, namespace)
+    return namespace["x"]
+
+
+class TestProgramCache:
+    def test_round_trip(self, tmp_path):
+        cache = ProgramCache(tmp_path)
+        assert cache.get("a") is None
+        assert "a" not in cache
+
+        cache.put("a", _program(1))
+        assert "a" in cache
+        assert _run(cache.get("a")) == 1
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    def test_persists(self, tmp_path):
+        ProgramCache(tmp_path).put("a", _program(2))
+
+        cache = ProgramCache(tmp_path)
+        assert "a" in cache
+        assert _run(cache.get("a")) == 2
+
+    def test_creates_directory(self, tmp_path):
+        cache = ProgramCache(tmp_path / "nested" / "cache")
+        cache.put("a", _program(3))
+
+        assert cache.directory.is_dir()
+
+    def test_corrupt_file(self, tmp_path):
+        cache = ProgramCache(tmp_path)
+        cache.put("a", _program(4))
+        for path in tmp_path.iterdir():
+            path.write_bytes(b"\x00")
+
+        assert ProgramCache(tmp_path).get("a") is None
+
+    def test_clear(self, tmp_path):
+        cache = ProgramCache(tmp_path)
+        cache.put("a", _program(5))
+        cache.clear()
+
+        assert "a" not in cache
+        assert list(tmp_path.iterdir()) == []
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,41 @@
+from src.auto import SparseMatrix
+import pytest
+
+
+class TestSparseMatrix:
+    def test_from_rows(self):
+        A = SparseMatrix.from_rows([{2: 3.0, 0: 1.0}, {}, {1: -2.0}], n_cols=3)
+
+        assert A.shape == (3, 3)
+        assert A.nnz == 3
+        assert list(A.indptr) == [0, 2, 2, 3]
+        assert list(A.indices) == [0, 2, 1]
+        assert list(A.data) == [1.0, 3.0, -2.0]
+
+    def test_getitem(self):
+        A = SparseMatrix.from_rows([{0: 1.0, 2: 3.0}, {1: -2.0}], n_cols=3)
+
+        assert A[0, 2] == 3.0
+        assert A[1, 1] == -2.0
+        assert A[0, 1] == 0.0
+        assert A[1, 2] == 0.0
+
+    def test_row(self):
+        A = SparseMatrix.from_rows([{0: 1.0, 2: 3.0}, {1: -2.0}], n_cols=3)
+
+        assert A.row(0) == {0: 1.0, 2: 3.0}
+
+    def test_to_dense(self):
+        A = SparseMatrix.from_rows([{0: 1.0, 2: 3.0}, {1: -2.0}], n_cols=3)
+
+        assert A.to_dense() == [[1.0, 0.0, 3.0], [0.0, -2.0, 0.0]]
+
+    def test_inconsistent_buffers(self):
+        with pytest.raises(ValueError):
+            SparseMatrix((2, 2), [0, 1], [0], [1.0])
+        with pytest.raises(ValueError):
+            SparseMatrix((1, 2), [0, 1], [0, 1], [1.0])
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,90 @@
+from src.auto import StaticGraph
+from src.auto.Vertex import Vertex
+from src.functions import cos, exp, log, mult, sin, square, tan
+from src.nn import sigmoid, tanh
+import math
+import pytest
+
+
+class TestStaticGraph:
+    def test_replay_forward(self):
+        x = Vertex(0.0)
+        y = Vertex(0.0)
+        graph = StaticGraph(square(x - y) + sin(x), inputs=[x, y])
+
+        assert graph(3.0, 1.0) == pytest.approx(4.0 + math.sin(3.0))
+        assert graph(1.0, 3.0) == pytest.approx(4.0 + math.sin(1.0))
+
+    def test_replay_backward(self):
+        w = Vertex(2.0)
+        x = Vertex(0.0)
+        graph = StaticGraph(square(w * x), inputs=[x])
+
+        graph(1.0)
+        graph.backward()
+        assert w.grad == 4.0
+
+        graph.zero_grad()
+        graph(3.0)
+        graph.backward()
+        assert w.grad == 36.0
+
+    def test_reuses_vertices(self):
+        x = Vertex(0.0)
+        z = x * x + x
+        graph = StaticGraph(z, inputs=[x])
+
+        assert graph(2.0) == 6.0
+        assert graph.root is z
+        assert z.value == 6.0
+
+    def test_feed_vertices(self):
+        x = Vertex(0.0)
+        graph = StaticGraph(x * 2, inputs=[x])
+
+        assert graph(Vertex(5.0)) == 10.0
+
+    def test_wrong_number_of_inputs(self):
+        x = Vertex(0.0)
+        graph = StaticGraph(x * 2, inputs=[x])
+
+        with pytest.raises(ValueError):
+            graph(1.0, 2.0)
+
+    def test_non_leaf_input(self):
+        x = Vertex(0.0)
+        y = x * 2
+
+        with pytest.raises(ValueError):
+            StaticGraph(y * y, inputs=[y])
+
+    def test_replay_in_place(self, monkeypatch):
+        x = Vertex(1.0)
+        y = Vertex(1.0)
+        root = mult(exp(x), tan(y), sigmoid(x)) + log(square(y)) - cos(tanh(x / y))
+        graph = StaticGraph(root, inputs=[x, y])
+
+        def f(x, y):
+            s = 1 / (1 + math.exp(-x))
+            return (
+                math.exp(x) * math.tan(y) * s
+                + math.log(y**2)
+                - math.cos(math.tanh(x / y))
+            )
+
+        def no_vertex(*args, **kwargs):
+            raise AssertionError("Replay created a vertex.")
+
+        monkeypatch.setattr(Vertex, "__init__", no_vertex)
+        assert graph(0.5, 0.25) == pytest.approx(f(0.5, 0.25))
+        monkeypatch.undo()
+
+        # Saved intermediates are refreshed along with the values
+        graph.backward()
+        h = 1e-6
+        assert x.grad == pytest.approx((f(0.5 + h, 0.25) - f(0.5 - h, 0.25)) / (2 * h))
+        assert y.grad == pytest.approx((f(0.5, 0.25 + h) - f(0.5, 0.25 - h)) / (2 * h))
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
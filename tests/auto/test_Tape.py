@@ -0,0 +1,109 @@
+from src.auto import Tape
+from src.auto.Vertex import Vertex
+from src.functions import exp, mult, square
+from helpers import cube
+import math
+import pytest
+
+
+class TestTape:
+    def test_records_ops(self):
+        x = Vertex(2.0)
+        y = Vertex(3.0)
+
+        with Tape() as tape:
+            z = (x + y) * x
+
+        assert z.value == 10.0
+        assert len(tape) == 2
+        assert z._parents == ()
+        assert list(tape.values) == [5.0, 10.0]
+
+    def test_backward_matches_graph(self):
+        def f(x, y):
+            return square(mult(x, y, x) - exp(y)) / y
+
+        x1, y1 = Vertex(1.5), Vertex(0.5)
+        z1 = f(x1, y1)
+        z1.backward()
+
+        x2, y2 = Vertex(1.5), Vertex(0.5)
+        with Tape():
+            z2 = f(x2, y2)
+        z2.backward()
+
+        assert z2.value == z1.value
+        assert x2.grad == pytest.approx(x1.grad)
+        assert y2.grad == pytest.approx(y1.grad)
+
+    def test_shared_leaf(self):
+        x = Vertex(3.0)
+
+        with Tape() as tape:
+            z = x * x + x
+
+        z.backward()
+
+        assert x.grad == 7.0
+        assert len(tape._leaf_index) == 1
+
+    def test_zero_grad(self):
+        x = Vertex(3.0)
+
+        with Tape():
+            z = x * x
+
+        z.backward()
+        assert x.grad == 6.0
+
+        z.zero_grad()
+        assert x.grad == 0
+
+    def test_released_after_backward(self):
+        x = Vertex(3.0)
+
+        with Tape() as tape:
+            z = x * x
+
+        tape.backward(z, retain_graph=True)
+        z.backward()
+        assert x.grad == 12.0
+        assert tape._contexts == {}
+
+        with pytest.raises(RuntimeError):
+            z.backward()
+
+    def test_backward_foreign_root(self):
+        x = Vertex(3.0)
+
+        with Tape() as tape:
+            x * x
+
+        with pytest.raises(ValueError):
+            tape.backward(x)
+
+    def test_stores_values_not_vertices(self):
+        x = Vertex(2.0)
+
+        with Tape() as tape:
+            z = exp(x) * x
+        z.value = 0.0
+
+        # Backward reads the recorded values rather than the handles
+        tape.backward(z)
+        assert x.grad == pytest.approx(3 * math.exp(2.0))
+        assert tape._contexts == {}
+
+    def test_without_source(self):
+        x = Vertex(0.5)
+
+        with Tape() as tape:
+            z = cube(x * 2) + x
+        assert list(tape._contexts) == [1]
+
+        z.backward()
+        assert x.grad == pytest.approx(3 * 2 * 1.0**2 + 1)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
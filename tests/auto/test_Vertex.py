@@ -169,5 +169,142 @@ class TestNeg:
         assert z3.value == -6.0
 
 
+class TestTraversal:
+    def test_deep_chain_backward(self):
+        x = Vertex(1.0)
+        z = x
+        for _ in range(10_000):
+            z = z + x
+
+        z.backward()
+
+        assert z.value == 10_001.0
+        assert x.grad == 10_001.0
+
+    def test_topo_sort_cached(self):
+        x = Vertex(2.0)
+        y = Vertex(3.0)
+        z = (x + y) * x
+
+        topo_sort = z.get_topo_sort()
+
+        assert topo_sort[0] is z
+        assert z.get_topo_sort() is topo_sort
+        assert len(topo_sort) == 4
+
+    def test_zero_grad(self):
+        x = Vertex(2.0)
+        y = Vertex(3.0)
+        z = (x + y) * x
+
+        z.backward()
+        assert x.grad == 7.0
+        assert y.grad == 2.0
+
+        z.zero_grad()
+        assert x.grad == 0
+        assert y.grad == 0
+        assert z.grad == 0
+
+
+class TestReleaseGraph:
+    def test_graph_released(self):
+        x = Vertex(2.0)
+        y = x * x
+        z = y + x
+
+        z.backward()
+
+        assert x.grad == 5.0
+        assert y._parents == ()
+        assert y.grad == 0
+        assert z._parents == ()
+
+    def test_backward_twice_raises(self):
+        x = Vertex(2.0)
+        z = x * x
+
+        z.backward()
+
+        with pytest.raises(RuntimeError):
+            z.backward()
+
+    def test_retain_graph(self):
+        x = Vertex(2.0)
+        y = x * x
+        z = y + x
+
+        z.backward(retain_graph=True)
+        assert x.grad == 5.0
+        assert y.grad == 1.0
+        assert y._parents == (x, x)
+
+        # Kept gradients are cleared before the next pass, rather than accumulated
+        z.backward()
+        assert x.grad == 10.0
+        assert y.grad == 0
+
+    def test_zero_grad_after_release(self):
+        x = Vertex(2.0)
+        z = x * x + x
+
+        z.backward()
+        z.zero_grad()
+
+        assert x.grad == 0
+
+
+class TestRequiresGrad:
+    def test_propagates(self):
+        x = Vertex(2.0)
+        c = Vertex(3.0, requires_grad=False)
+
+        assert (x * c).requires_grad
+        assert not (c * c).requires_grad
+
+    def test_constant_not_recorded(self):
+        c = Vertex(3.0, requires_grad=False)
+        z = c * c + 1
+
+        assert z.value == 10.0
+        assert z._parents == ()
+        assert z._op is None
+
+    def test_constants_skipped_in_backward(self):
+        x = Vertex(2.0)
+        c = Vertex(3.0, requires_grad=False)
+        z = (x * c) / 2
+
+        assert len(z.get_topo_sort()) == 3
+
+        z.backward()
+
+        assert x.grad == 1.5
+        assert c.grad == 0
+
+    def test_literals_are_constants(self):
+        x = Vertex(2.0)
+        z = x * 4
+        c = z._parents[1]
+
+        z.backward()
+
+        assert x.grad == 4.0
+        assert not c.requires_grad
+        assert c.grad == 0
+
+    def test_context_only_when_saving(self):
+        x = Vertex(2.0)
+        y = Vertex(3.0)
+        a = x * y
+        b = -(x + y)
+        c = x / y
+
+        assert a._ctx is b._ctx
+        assert a._ctx.saved == ()
+        assert c._ctx is not a._ctx
+        assert c._ctx.saved == (2.0 / 3.0,)
+
+
 if __name__ == "__main__":
     pytest.main([__file__])
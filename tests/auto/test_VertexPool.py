@@ -0,0 +1,100 @@
+from src.auto import VertexPool
+from src.auto.Vertex import Vertex
+from src.functions import exp, square
+import pytest
+
+
+class TestVertexPool:
+    def test_recycles_after_reset(self):
+        x = Vertex(2.0)
+        pool = VertexPool()
+
+        with pool:
+            h = exp(x)
+            z = square(h)
+        taken = {id(h), id(z)}
+
+        assert pool.allocated == 2
+        assert pool.reused == 0
+
+        pool.reset()
+        assert len(pool) == 2
+
+        with pool:
+            z = exp(x) * x
+
+        assert pool.allocated == 2
+        assert pool.reused == 2
+        assert id(z) in taken
+        assert len(pool) == 0
+
+    def test_recycled_vertices_are_fresh(self):
+        x = Vertex(2.0)
+        pool = VertexPool()
+
+        with pool:
+            z = square(exp(x))
+            z.backward(retain_graph=True)
+        pool.reset()
+        x.grad = 0
+
+        with pool:
+            z = x * x
+            assert z.grad == 0
+            assert z._parents == (x, x)
+            z.backward()
+
+        assert z.value == 4.0
+        assert x.grad == 4.0
+
+    def test_reset_drops_references(self):
+        x = Vertex(2.0)
+        pool = VertexPool()
+
+        with pool:
+            z = square(x)
+        pool.reset()
+
+        assert z._parents == ()
+        assert z._ctx is None
+
+    def test_inactive_outside(self):
+        pool = VertexPool()
+
+        with pool:
+            pass
+        Vertex(1.0)
+
+        assert VertexPool._active is None
+        assert pool.allocated == 0
+
+    def test_call_restored(self):
+        # Vertices outside of any pool are allocated without checking for one
+        with VertexPool():
+            with VertexPool():
+                pass
+            assert "__call__" in type(Vertex).__dict__
+
+        assert "__call__" not in type(Vertex).__dict__
+
+        with pytest.raises(RuntimeError):
+            with VertexPool():
+                raise RuntimeError
+        assert "__call__" not in type(Vertex).__dict__
+
+    def test_nested(self):
+        outer = VertexPool()
+        inner = VertexPool()
+
+        with outer:
+            with inner:
+                Vertex(1.0)
+            Vertex(2.0)
+
+        assert inner.allocated == 1
+        assert outer.allocated == 1
+        assert VertexPool._active is None
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,321 @@
+from src.auto import Function, Tape, backward, grad, hvp, jacobian, jvp
+from src.auto.Vertex import Vertex
+from src.functions import add, cos, exp, log, mult, sin, square, tan
+from src.nn import Linear, Matrix, Sequential, Vector, sigmoid, tanh
+import math
+import pytest
+
+
+class TestBackward:
+    def test_multiple_roots(self):
+        x = Vertex(2.0)
+        y = Vertex(3.0)
+
+        backward([x * y, square(x)], seeds=[1.0, 0.5])
+
+        assert x.grad == 5.0
+        assert y.grad == 2.0
+
+    def test_default_seeds(self):
+        x = Vertex(2.0)
+
+        backward([x * 3, x * 4])
+
+        assert x.grad == 7.0
+
+    def test_shared_subgraph(self):
+        x = Vertex(2.0)
+        h = square(x)
+        roots = [h * 2, h * 3]
+
+        backward(roots)
+
+        assert x.grad == 20.0
+
+        roots[0].zero_grad()
+        assert x.grad == 0
+
+    def test_root_is_ancestor(self):
+        x = Vertex(2.0)
+        h = x * x
+        z = h * 3
+
+        backward([h, z])
+
+        assert x.grad == 16.0
+
+    def test_tape(self):
+        x = Vertex(2.0)
+        with Tape():
+            roots = [x * 3, x * x]
+
+        backward(roots, seeds=[2.0, 1.0])
+
+        assert x.grad == 10.0
+
+    def test_wrong_number_of_seeds(self):
+        x = Vertex(2.0)
+
+        with pytest.raises(ValueError):
+            backward([x * 3], seeds=[1.0, 2.0])
+
+
+class TestGrad:
+    def test_single_input(self):
+        x = Vertex(2.0)
+        y = Vertex(3.0)
+        z = x * y + square(x)
+
+        assert grad(z, [x]) == (7.0,)
+
+    def test_subset_of_inputs(self):
+        x = Vertex(2.0)
+        y = Vertex(3.0)
+        z = x * y + sin(y)
+
+        (dy,) = grad(z, [y])
+
+        assert dy == pytest.approx(2.0 + math.cos(3.0))
+
+    def test_does_not_mutate_grad(self):
+        x = Vertex(2.0)
+        y = Vertex(3.0)
+        z = x * y
+
+        grad(z, [x, y])
+
+        assert x.grad == 0
+        assert y.grad == 0
+        assert z._parents == (x, y)
+
+    def test_only_visits_path(self, monkeypatch):
+        x = Vertex(2.0)
+        y = Vertex(3.0)
+        a = sin(y)
+        z = x * a
+
+        calls = []
+        backward = a._op.backward
+
+        def counting_backward(ctx, *args):
+            calls.append(args)
+            return backward(ctx, *args)
+
+        monkeypatch.setattr(a._op, "backward", staticmethod(counting_backward))
+
+        assert grad(z, [x]) == (pytest.approx(math.sin(3.0)),)
+        assert calls == []
+
+    def test_skips_constants(self):
+        class Untraversed(tuple):
+            def __iter__(self):
+                raise AssertionError("A constant's parents were traversed.")
+
+        x = Vertex(2.0)
+        a = sin(Vertex(3.0))
+        a.requires_grad = False
+        a._parents = Untraversed(a._parents)
+
+        assert grad(x * a, [x]) == (pytest.approx(math.sin(3.0)),)
+
+    def test_intermediate_input(self):
+        x = Vertex(2.0)
+        y = x * x
+        z = y * 3
+
+        assert grad(z, [y, x]) == (3.0, 12.0)
+
+    def test_multiple_outputs(self):
+        x = Vertex(2.0)
+
+        assert grad([x * x, x * 3], [x], grad_outputs=[1.0, 2.0]) == (10.0,)
+
+    def test_unreachable_input(self):
+        x = Vertex(2.0)
+        y = Vertex(3.0)
+
+        assert grad(x * x, [y]) == (0.0,)
+
+    def test_constant_input(self):
+        x = Vertex(2.0, requires_grad=False)
+        w = Vertex(3.0)
+
+        assert grad(w * x, [x]) == (3.0,)
+
+
+class TestJvp:
+    @pytest.mark.parametrize(
+        "f",
+        [
+            lambda x, y: x * y - x / y,
+            lambda x, y: add(sin(x), exp(y), -x),
+            lambda x, y: mult(x, y, x) + log(y),
+            lambda x, y: sigmoid(x) * tanh(y),
+        ],
+    )
+    def test_matches_reverse_mode(self, f):
+        x = Vertex(0.7)
+        y = Vertex(1.3)
+        z = f(x, y)
+        dx, dy = grad(z, [x, y])
+
+        value, tangent = jvp(f, [0.7, 1.3], [2.0, -1.0])
+
+        assert value == z.value
+        assert tangent == pytest.approx(2.0 * dx - dy)
+
+    def test_vector_output(self):
+        model = Sequential([Linear(2, 3, activation=tanh), Linear(3, 2)])
+
+        values, tangents = jvp(lambda *x: model(Vector(x)), [0.5, -0.2], [1.0, 0.0])
+
+        x = Vertex(0.5)
+        out = model(Vector([x, Vertex(-0.2)]))
+        assert values == tuple(v.value for v in out)
+        for v, t in zip(out, tangents):
+            assert t == pytest.approx(grad(v, [x])[0])
+
+    def test_no_graph_recorded(self):
+        outputs = []
+
+        def f(x):
+            outputs.append(x * x)
+            return outputs[-1]
+
+        assert jvp(f, [2.0], [1.0]) == (4.0, 4.0)
+        assert outputs[0]._parents == ()
+
+    def test_default_tangent_rule(self):
+        class Cube(Function):
+            @staticmethod
+            def forward(ctx, x):
+                return Vertex(x.value**3)
+
+            @staticmethod
+            def backward(ctx, x):
+                return (3 * x.value**2,)
+
+        assert jvp(Cube(), [2.0], [0.5]) == (8.0, 6.0)
+
+
+class TestHvp:
+    def test_second_derivative(self):
+        x = Vertex(0.5)
+        z = sin(x) * exp(x)
+
+        (d2x,) = hvp(z, [x], [1.0])
+
+        assert d2x == pytest.approx(2 * math.cos(0.5) * math.exp(0.5))
+
+    def test_matches_analytic_hessian(self):
+        # f = x^2 y + log(y) x, H = [[2y, 2x + 1/y], [2x + 1/y, -x / y^2]]
+        x = Vertex(1.5)
+        y = Vertex(2.0)
+        z = mult(x, x, y) + log(y) * x
+
+        h = hvp(z, [x, y], [1.0, -2.0])
+
+        assert h[0] == pytest.approx(2 * 2.0 - 2 * (2 * 1.5 + 1 / 2.0))
+        assert h[1] == pytest.approx((2 * 1.5 + 1 / 2.0) + 2 * 1.5 / 4.0)
+
+    @pytest.mark.parametrize(
+        "f", [lambda x: tan(x) / x, lambda x: cos(square(x)), lambda x: -sigmoid(x)]
+    )
+    def test_matches_finite_differences(self, f):
+        eps = 1e-6
+        x = Vertex(0.3)
+        (d2x,) = hvp(f(x), [x], [1.0])
+
+        xp, xm = Vertex(0.3 + eps), Vertex(0.3 - eps)
+        (g_plus,) = grad(f(xp), [xp])
+        (g_minus,) = grad(f(xm), [xm])
+
+        assert d2x == pytest.approx((g_plus - g_minus) / (2 * eps), rel=1e-4)
+
+    def test_linear_is_zero(self):
+        x = Vertex(1.0)
+        y = Vertex(2.0)
+
+        assert hvp(x * 3 + y, [x, y], [1.0, 1.0]) == (0.0, 0.0)
+
+    def test_create_graph_backward(self):
+        x = Vertex(3.0)
+        z = x * x * x
+
+        z.backward(create_graph=True)
+        dx = x.grad
+
+        assert isinstance(dx, Vertex)
+        assert dx.value == 27.0
+        assert grad(dx, [x]) == (18.0,)
+
+
+class TestJacobian:
+    @staticmethod
+    def f(x, y):
+        return [x * y, sin(x), x + y, exp(y), Vertex(1.0, requires_grad=False)]
+
+    @staticmethod
+    def expected(x, y):
+        return [
+            [y, x],
+            [math.cos(x), 0.0],
+            [1.0, 1.0],
+            [0.0, math.exp(y)],
+            [0.0, 0.0],
+        ]
+
+    @pytest.mark.parametrize("mode", [None, "forward", "reverse"])
+    def test_matches_analytic(self, mode):
+        J = jacobian(self.f, [0.5, 2.0], mode=mode)
+
+        assert isinstance(J, Matrix)
+        assert J.shape == (5, 2)
+        for r, row in enumerate(self.expected(0.5, 2.0)):
+            for c, value in enumerate(row):
+                assert J[r, c].value == pytest.approx(value)
+                assert not J[r, c].requires_grad
+
+    @pytest.mark.parametrize("mode", ["forward", "reverse"])
+    def test_matches_backward(self, mode):
+        model = Sequential([Linear(3, 4, activation=tanh), Linear(4, 2)])
+        point = [0.1, -0.4, 0.7]
+
+        J = jacobian(lambda *x: model(Vector(x)), point, mode=mode)
+
+        for r in range(2):
+            x = Vector(point)
+            model(x)[r].backward()
+            for c in range(3):
+                assert J[r, c].value == pytest.approx(x[c].grad)
+
+    def test_single_output(self):
+        J = jacobian(lambda x, y: square(x) * y, [3.0, 2.0])
+
+        assert J.shape == (1, 2)
+        assert [v.value for v in J[0]] == [12.0, 9.0]
+
+    @pytest.mark.parametrize("mode", ["forward", "reverse"])
+    def test_partials_evaluated_once(self, monkeypatch, mode):
+        op = (Vertex(1.0) * Vertex(1.0))._op
+
+        calls = []
+        backward = op.backward
+
+        def counting_backward(ctx, *args):
+            calls.append(args)
+            return backward(ctx, *args)
+
+        monkeypatch.setattr(op, "backward", staticmethod(counting_backward))
+
+        jacobian(lambda x, y: [x * y, x * y * x, x * y * y], [1.0, 2.0], mode=mode)
+
+        assert len(calls) == 5
+
+    def test_unknown_mode(self):
+        with pytest.raises(ValueError):
+            jacobian(self.f, [0.5, 2.0], mode="central")
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,49 @@
+import gc
+
+from src.auto import training_scope
+import pytest
+
+
+class TestTrainingScope:
+    def test_restores_collector(self):
+        threshold = gc.get_threshold()
+
+        with training_scope(threshold=12_345):
+            assert gc.get_threshold()[0] == 12_345
+            assert gc.get_freeze_count() > 0
+
+        assert gc.get_threshold() == threshold
+        assert gc.get_freeze_count() == 0
+
+    def test_without_freeze(self):
+        with training_scope(freeze=False):
+            assert gc.get_freeze_count() == 0
+
+    def test_nested(self):
+        with training_scope():
+            count = gc.get_freeze_count()
+            with training_scope(threshold=100):
+                assert gc.get_threshold()[0] == 100
+            assert gc.get_freeze_count() == count
+            assert gc.get_threshold()[0] == 50_000
+
+    def test_counts_collections(self):
+        with training_scope() as scope:
+            gc.collect()
+
+        assert scope.collections == 1
+        assert scope.pause_time > 0
+
+    def test_decorator(self):
+        threshold = gc.get_threshold()
+
+        @training_scope(threshold=777)
+        def train():
+            return gc.get_threshold()[0]
+
+        assert train() == 777
+        assert gc.get_threshold() == threshold
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
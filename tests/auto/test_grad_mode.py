@@ -0,0 +1,81 @@
+from src.auto import enable_grad, is_grad_enabled, no_grad
+from src.auto.Function import _DISCARDED
+from src.auto.Vertex import Vertex
+from src.functions import exp
+import pytest
+
+
+class TestNoGrad:
+    def test_context_manager(self):
+        x = Vertex(2.0)
+
+        with no_grad():
+            assert not is_grad_enabled()
+            z = exp(x * x + 1)
+
+        assert is_grad_enabled()
+        assert z.value == pytest.approx(2.718281828459045**5)
+        assert z._parents == ()
+        assert z._op is None
+        assert z._ctx is None
+
+    def test_decorator(self):
+        @no_grad()
+        def f(x):
+            return x * x
+
+        z = f(Vertex(3.0))
+
+        assert z.value == 9.0
+        assert z._parents == ()
+        assert is_grad_enabled()
+
+    def test_nested(self):
+        with no_grad():
+            with no_grad():
+                pass
+            assert not is_grad_enabled()
+        assert is_grad_enabled()
+
+    def test_restored_after_exception(self):
+        with pytest.raises(RuntimeError):
+            with no_grad():
+                raise RuntimeError
+        assert is_grad_enabled()
+
+    def test_backward_stops(self):
+        x = Vertex(2.0)
+        with no_grad():
+            y = x * x
+        z = y * x
+
+        z.backward()
+
+        assert x.grad == 4.0
+
+    def test_nothing_saved(self):
+        # Values saved by forward would otherwise outlive the discarded graph
+        x = Vertex(2.0)
+        with no_grad():
+            z = exp(x) / x
+
+        assert z.value == pytest.approx(2.718281828459045**2 / 2)
+        assert _DISCARDED.saved == ()
+
+
+class TestEnableGrad:
+    def test_inside_no_grad(self):
+        x = Vertex(2.0)
+
+        with no_grad():
+            with enable_grad():
+                assert is_grad_enabled()
+                z = x * x
+            assert not is_grad_enabled()
+
+        z.backward()
+        assert x.grad == 4.0
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,180 @@
+from src.auto import (
+    StaticGraph,
+    Tape,
+    eliminate_common_subexpressions,
+    fold_constants,
+    fuse_reductions,
+    intern_constants,
+    optimise,
+)
+from src.auto.graph import topo_sort
+from src.auto.Vertex import Vertex
+import src.functions.functions as F
+from src.functions import exp, sin, square
+from src.nn import Linear, Sequential, Vector, tanh
+import math
+import pytest
+
+
+class TestFoldConstants:
+    def test_frozen_leaf(self):
+        x = Vertex(2.0)
+        w = Vertex(3.0)
+        z = x * exp(w * 2)
+
+        w.requires_grad = False
+        assert fold_constants(z) == 2
+
+        (_, b) = z._parents
+        assert b._op is None
+        assert b._parents == ()
+        assert not b.requires_grad
+
+        z.backward()
+        assert x.grad == pytest.approx(b.value)
+
+    def test_nothing_to_fold(self):
+        x = Vertex(2.0)
+
+        assert fold_constants(sin(x) * 2) == 0
+
+
+class TestInternConstants:
+    def test_literals(self):
+        x = Vertex(2.0)
+        z = (x * 2) * 2 + (x - 2)
+
+        assert intern_constants(z) == 2
+        assert len({id(v) for v in topo_sort([z]) if not v.requires_grad}) == 1
+
+    def test_broadcast(self):
+        x = Vector([1.0, 2.0])
+        z = (x + 1.0).dot(x * 1.0)
+
+        intern_constants(z)
+
+        assert len([v for v in topo_sort([z]) if not v.requires_grad]) == 1
+
+    def test_signed_zero(self):
+        x = Vertex(2.0)
+        z = x * 0.0 + x * -0.0
+
+        assert intern_constants(z) == 0
+
+
+class TestEliminateCommonSubexpressions:
+    def test_duplicate_subexpression(self):
+        x = Vertex(0.5)
+        y = Vertex(1.5)
+        z = square(sin(x) * y) + square(sin(x) * y)
+
+        assert eliminate_common_subexpressions(z) == 3
+
+        a, b = z._parents
+        assert a is b
+
+        z.backward()
+        assert x.grad == pytest.approx(4 * math.sin(0.5) * math.cos(0.5) * 1.5**2)
+        assert y.grad == pytest.approx(4 * math.sin(0.5) ** 2 * 1.5)
+
+    def test_different_ops(self):
+        x = Vertex(0.5)
+
+        assert eliminate_common_subexpressions(sin(x) + exp(x)) == 0
+
+
+class TestFuseReductions:
+    def test_sum_chain(self):
+        x = [Vertex(float(i)) for i in range(1, 5)]
+        z = x[0] + x[1] + x[2] + x[3]
+
+        assert fuse_reductions(z) == 2
+        assert z._op is F.Add
+        assert z._parents == tuple(x)
+        assert z.value == 10.0
+
+        z.backward()
+        assert [v.grad for v in x] == [1.0] * 4
+
+    def test_product_chain(self):
+        x = [Vertex(float(i)) for i in range(1, 5)]
+        z = x[0] * (x[1] * x[2]) * x[3]
+
+        assert fuse_reductions(z) == 2
+        assert z._op is F.Mult
+        assert z._parents == tuple(x)
+
+        z.backward()
+        assert [v.grad for v in x] == [24.0, 12.0, 8.0, 6.0]
+
+    def test_shared_operand_kept(self):
+        x = Vertex(2.0)
+        y = Vertex(3.0)
+        h = x + y
+        z = (h + x) * h
+
+        assert fuse_reductions(z) == 0
+        assert z._parents[1] is h
+
+    def test_mixed_chain(self):
+        x = Vertex(2.0)
+        y = Vertex(3.0)
+        h = x + y
+        z = h * (x * y) + 1
+
+        assert fuse_reductions(z) == 1
+        (p, _) = z._parents
+        assert p._op is F.Mult
+        assert p._parents == (h, x, y)
+
+    def test_root_not_absorbed(self):
+        x = Vertex(2.0)
+        h = x + 1
+        z = h + 2
+
+        assert fuse_reductions([h, z]) == 0
+
+
+class TestOptimise:
+    def test_gradients_unchanged(self):
+        def f(x):
+            model = Sequential([Linear(3, 4, activation=tanh), Linear(4, 1)])
+            h = model(x * 2.0)[0]
+            return square(h - 1) + square(model(x * 2.0)[0] - 1)
+
+        x1 = Vector([0.1, 0.2, 0.3])
+        f(x1).backward()
+
+        x2 = Vector([0.1, 0.2, 0.3])
+        z = f(x2)
+        n = len(topo_sort([z]))
+        removed = optimise(z)
+
+        assert removed > 0
+        assert len(topo_sort([z])) == n - removed
+
+        z.backward()
+        for a, b in zip(x1, x2):
+            assert b.grad == pytest.approx(a.grad)
+
+    def test_static_graph(self):
+        x = Vertex(0.0)
+        z = sin(x * 3) * sin(x * 3)
+        optimise(z)
+
+        graph = StaticGraph(z, inputs=[x])
+
+        assert len(graph._ops) == 3
+        assert graph(0.2) == pytest.approx(math.sin(0.6) ** 2)
+
+    def test_taped(self):
+        x = Vertex(0.0)
+        with Tape():
+            z = x * 3
+
+        with pytest.raises(ValueError):
+            optimise(z)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
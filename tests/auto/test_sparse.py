@@ -0,0 +1,126 @@
+from src.auto import jacobian, sparse_hessian, sparse_jacobian, sparsity_pattern
+import src.auto.sparse as sparse
+from src.auto.sparse import _colour
+from src.auto.Vertex import Vertex
+from src.functions import add, exp, sin, square
+import pytest
+
+
+def chain(*x):
+    # Banded Jacobian, each output depends on two neighbouring inputs
+    return [x[i] * x[i + 1] + sin(x[i]) for i in range(len(x) - 1)]
+
+
+def rosenbrock(*x):
+    return add(
+        *[
+            100 * square(x[i + 1] - square(x[i])) + square(1 - x[i])
+            for i in range(len(x) - 1)
+        ]
+    )
+
+
+class TestSparsityPattern:
+    def test_pattern(self):
+        x, y, z = Vertex(1.0), Vertex(2.0), Vertex(3.0)
+        outputs = [x * y, exp(z), x + 2, Vertex(1.0, requires_grad=False)]
+
+        assert sparsity_pattern(outputs, [x, y, z]) == [{0, 1}, {2}, {0}, set()]
+
+    def test_shared_subgraph(self):
+        x, y = Vertex(1.0), Vertex(2.0)
+        h = square(x)
+
+        assert sparsity_pattern([h * y, h + 1], [x, y]) == [{0, 1}, {0}]
+
+
+class TestColour:
+    def test_groups_distinct(self):
+        groups = [{0, 1}, {1, 2}, {2, 3}, {0, 3}]
+
+        colours = _colour(groups, 4)
+
+        for group in groups:
+            assert len({colours[i] for i in group}) == len(group)
+        assert max(colours) == 1
+
+    def test_no_groups(self):
+        assert _colour([], 3) == [0, 0, 0]
+
+
+class TestSparseJacobian:
+    @pytest.mark.parametrize("mode", [None, "forward", "reverse"])
+    def test_matches_dense(self, mode):
+        point = [0.1 * i + 0.1 for i in range(10)]
+
+        J = sparse_jacobian(chain, point, mode=mode)
+        dense = jacobian(chain, point)
+
+        assert J.shape == dense.shape
+        assert J.nnz == 18
+        for r, row in enumerate(J.to_dense()):
+            assert row == pytest.approx([v.value for v in dense[r]])
+
+    @pytest.mark.parametrize("mode", ["forward", "reverse"])
+    def test_directions_per_colour(self, monkeypatch, mode):
+        op = (Vertex(1.0) * Vertex(1.0))._op
+
+        calls = []
+        backward = op.backward
+
+        def counting_backward(ctx, *args):
+            calls.append(args)
+            return backward(ctx, *args)
+
+        monkeypatch.setattr(op, "backward", staticmethod(counting_backward))
+
+        seeds = []
+        helper = getattr(sparse, f"_jacobian_{mode}")
+
+        def recording_helper(order, inputs, outputs, s):
+            seeds.append(s)
+            return helper(order, inputs, outputs, s)
+
+        monkeypatch.setattr(sparse, f"_jacobian_{mode}", recording_helper)
+
+        sparse_jacobian(chain, [0.5] * 20, mode=mode)
+
+        # 19 products, each evaluating its partials once for all colours
+        assert len(calls) == 19
+        assert len(seeds[0][0]) == 2
+
+    def test_unknown_mode(self):
+        with pytest.raises(ValueError):
+            sparse_jacobian(chain, [1.0, 2.0], mode="central")
+
+
+class TestSparseHessian:
+    def test_rosenbrock(self):
+        point = [0.5, -0.3, 1.2, 0.8]
+
+        H = sparse_hessian(rosenbrock, point)
+
+        expected = [[0.0] * 4 for _ in range(4)]
+        for i in range(3):
+            x, y = point[i], point[i + 1]
+            expected[i][i] += 1200 * x * x - 400 * y + 2
+            expected[i][i + 1] += -400 * x
+            expected[i + 1][i] += -400 * x
+            expected[i + 1][i + 1] += 200
+
+        assert H.shape == (4, 4)
+        assert H.nnz == 10
+        for row, expected_row in zip(H.to_dense(), expected):
+            assert row == pytest.approx(expected_row)
+
+    def test_separable_is_diagonal(self):
+        H = sparse_hessian(lambda x, y, z: sin(x) + exp(y) + z, [0.2, 0.4, 1.0])
+
+        assert H.nnz == 2
+        assert H[0, 0] == pytest.approx(-0.19866933)
+        assert H[1, 1] == pytest.approx(1.4918247)
+        assert H.row(2) == {}
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
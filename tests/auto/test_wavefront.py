@@ -0,0 +1,142 @@
+from src.auto import Tape, dependency_levels, wavefront_backward
+from src.auto.Vertex import Add, Mul, Vertex
+import src.functions.functions as F
+from src.functions import exp, sin, square
+from src.nn import Linear, Matrix, Sequential, Vector, tanh
+from helpers import parameters_of
+import math
+import random
+import pytest
+
+
+def _reference(build, leaves):
+    # Gradients of the same graph from the vertex by vertex backward
+    build().backward()
+    grads = [v.grad for v in leaves]
+    for v in leaves:
+        v.grad = 0
+    return grads
+
+
+class TestDependencyLevels:
+    def test_furthest_child(self):
+        x = Vertex(2.0)
+        a = x * 3
+        b = sin(a)
+        z = a + b
+
+        levels = dependency_levels(z)
+        assert levels == [{Add: [z]}, {F.Sin: [b]}, {Mul: [a]}]
+
+    def test_grouped_by_function(self):
+        xs = [Vertex(float(i)) for i in range(4)]
+        z = F.add(*[x * x for x in xs[:2]], *[sin(x) for x in xs[2:]])
+
+        (root, products) = dependency_levels(z)
+        assert root == {F.Add: [z]}
+        assert {op: len(group) for op, group in products.items()} == {Mul: 2, F.Sin: 2}
+
+    def test_matmul_width(self):
+        a = Matrix([[1.0, 2.0], [3.0, 4.0]])
+        b = Matrix([[5.0, 6.0], [7.0, 8.0]])
+        z = F.add(*[v for row in a @ b for v in row])
+
+        levels = dependency_levels(z)
+        assert len(levels) == 2
+        assert set(levels[1]) == {F.Dot}
+        assert {id(v) for v in levels[1][F.Dot]} == {id(v) for v in z._parents}
+
+    def test_taped(self):
+        with Tape():
+            z = Vertex(2.0) * 3
+
+        with pytest.raises(ValueError):
+            dependency_levels(z)
+
+
+class TestWavefrontBackward:
+    def test_matches_backward(self):
+        x, y = Vertex(0.3), Vertex(-1.2)
+
+        def build():
+            a = x * y - x
+            return F.add(square(a), exp(-a) * y, F.dot(x, a, y, y)) / (x + 2)
+
+        expected = _reference(build, [x, y])
+        wavefront_backward(build())
+        assert [x.grad, y.grad] == pytest.approx(expected)
+
+    def test_matmul(self):
+        random.seed(0)
+        a = Matrix([[random.uniform(-1, 1) for _ in range(3)] for _ in range(4)])
+        b = Matrix([[random.uniform(-1, 1) for _ in range(5)] for _ in range(3)])
+        leaves = [v for m in (a, b) for row in m for v in row]
+
+        def build():
+            return F.add(*[square(v) for row in a @ b for v in row])
+
+        expected = _reference(build, leaves)
+        wavefront_backward(build())
+        assert [v.grad for v in leaves] == pytest.approx(expected)
+
+    def test_mlp(self):
+        random.seed(1)
+        model = Sequential([Linear(3, 4, activation=tanh), Linear(4, 2)])
+        x = Vector([0.5, -0.25, 1.0])
+        parameters = parameters_of(model.parameters)
+
+        def build():
+            return F.add(*[square(v) for v in model(x)])
+
+        expected = _reference(build, parameters)
+        wavefront_backward(build())
+        assert [v.grad for v in parameters] == pytest.approx(expected)
+
+    def test_repeated_parent(self):
+        x = Vertex(3.0)
+        wavefront_backward(x * x + x)
+        assert x.grad == pytest.approx(7.0)
+
+    def test_constants(self):
+        x = Vertex(2.0)
+        c = Vertex(5.0, requires_grad=False)
+        wavefront_backward(F.dot(x, c, c, x))
+        assert x.grad == pytest.approx(10.0)
+        assert c.grad == 0
+
+    def test_seeds(self):
+        x = Vertex(2.0)
+        roots = [x * 3, square(x)]
+
+        wavefront_backward(roots, seeds=[1.0, 0.5])
+        assert x.grad == pytest.approx(5.0)
+
+        with pytest.raises(ValueError):
+            wavefront_backward([x * 3], seeds=[1.0, 2.0])
+
+    def test_retain_graph(self):
+        x = Vertex(2.0)
+        z = sin(x * x)
+        levels = dependency_levels(z)
+
+        wavefront_backward(z, retain_graph=True, levels=levels)
+        first = x.grad
+        assert z._parents[0].grad == pytest.approx(math.cos(4.0))
+        wavefront_backward(z, levels=levels)
+        assert x.grad == pytest.approx(2 * first)
+
+        with pytest.raises(RuntimeError):
+            wavefront_backward(z, levels=levels)
+
+    def test_zero_grad(self):
+        x = Vertex(2.0)
+        z = exp(x) * 2
+
+        wavefront_backward(z)
+        assert z._parents == ()
+        z.zero_grad()
+        assert x.grad == 0
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -1,5 +1,7 @@
 import pytest
-from src.functions.functions import add, mult
+import math
+import src.functions.functions as functions
+from src.functions.functions import add, dot, exp, mult, tan
 from src.auto.Vertex import Vertex
 
 
@@ -131,5 +133,68 @@ class TestMult:
         assert z.grad == 6.0
 
 
+class TestDot:
+    def test_dot(self):
+        x = [Vertex(1.0), Vertex(2.0)]
+        y = [Vertex(3.0), Vertex(4.0)]
+        z = dot(*x, *y)
+
+        assert z.value == 11.0
+        assert z._parents == (*x, *y)
+
+        z.backward()
+        assert [v.grad for v in x] == [3.0, 4.0]
+        assert [v.grad for v in y] == [1.0, 2.0]
+
+    def test_dot_shared_vertex(self):
+        x = Vertex(3.0)
+        z = dot(x, x)
+
+        z.backward()
+        assert x.grad == 6.0
+
+    def test_dot_odd_arguments(self):
+        with pytest.raises(ValueError):
+            dot(Vertex(1.0), Vertex(2.0), Vertex(3.0))
+
+
+class TestExp:
+    def test_exp(self):
+        x = Vertex(1.5)
+        z = exp(x)
+
+        assert z.value == pytest.approx(math.exp(1.5))
+
+        z.backward()
+        assert x.grad == pytest.approx(math.exp(1.5))
+
+    def test_exp_not_recomputed(self, monkeypatch):
+        calls = []
+        math_exp = math.exp
+
+        def counting_exp(v):
+            calls.append(v)
+            return math_exp(v)
+
+        monkeypatch.setattr(functions.math, "exp", counting_exp)
+
+        x = Vertex(0.5)
+        z = exp(x)
+        z.backward()
+
+        assert len(calls) == 1
+
+
+class TestTan:
+    def test_tan(self):
+        x = Vertex(0.3)
+        z = tan(x)
+
+        assert z.value == pytest.approx(math.tan(0.3))
+
+        z.backward()
+        assert x.grad == pytest.approx(1 / math.cos(0.3) ** 2)
+
+
 if __name__ == "__main__":
     pytest.main([__file__])
@@ -246,6 +246,19 @@ class TestMatMul:
         assert len(result) == 2
         assert result.shape == (2, 1)
 
+    def test_one_vertex_per_cell(self):
+        m1 = Matrix([[1.0, 2.0, 3.0], [4.0, 5.0, 6.0]])
+        m2 = Matrix([[7.0, 8.0], [9.0, 10.0], [11.0, 12.0]])
+        result = m1 @ m2
+
+        for r in range(2):
+            for c in range(2):
+                assert result[r, c]._parents == (*m1[r], *m2._cols[c])
+
+        result[0, 1].backward()
+        assert [v.grad for v in m1[0]] == [8.0, 10.0, 12.0]
+        assert [v.grad for v in m2._cols[1]] == [1.0, 2.0, 3.0]
+
     def test_incompatible_dimensions(self):
         m1 = Matrix([[1.0, 2.0], [3.0, 4.0]])
         m2 = Matrix([[5.0, 6.0, 7.0], [8.0, 9.0, 10.0]])
@@ -29,6 +29,11 @@ class TestConstructor:
         assert v[2].value == 3.0
         assert len(v) == 3
 
+    def test_requires_grad(self):
+        v = Vector([1.0, 2.0], requires_grad=False)
+        assert not v[0].requires_grad
+        assert not v[1].requires_grad
+
     def test_no_args(self):
         with pytest.raises(ValueError):
             Vector()
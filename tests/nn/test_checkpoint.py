@@ -0,0 +1,180 @@
+from src.auto import (
+    AutoBatch,
+    IncrementalGraph,
+    LaneBatch,
+    StaticGraph,
+    Vertex,
+    eliminate_common_subexpressions,
+    grad,
+    jacobian,
+    no_grad,
+    sparse_jacobian,
+)
+from src.auto.graph import topo_sort
+from src.functions import square
+from src.nn import Linear, Sequential, Vector, relu, tanh
+import pytest
+
+
+def build_model(checkpoint: int | None) -> Sequential:
+    return Sequential(
+        [Linear(2, 4, activation=relu)]
+        + [Linear(4, 4, activation=tanh, seed=i) for i in range(4)]
+        + [Linear(4, 1)],
+        checkpoint=checkpoint,
+    )
+
+
+def gradients(model: Sequential) -> list[float]:
+    grads = []
+    for layer in model.parameters.values():
+        for row in layer["W"]:
+            grads.extend(v.grad for v in row)
+        grads.extend(v.grad for v in layer["b"])
+    return grads
+
+
+class TestCheckpoint:
+    @pytest.mark.parametrize("k", [1, 2, 4, 6])
+    def test_gradients_match(self, k):
+        reference = build_model(None)
+        x1 = Vector([0.3, -0.7])
+        square(reference(x1)[0] - 0.5).backward()
+
+        model = build_model(k)
+        x2 = Vector([0.3, -0.7])
+        loss = square(model(x2)[0] - 0.5)
+        loss.backward()
+
+        assert gradients(model) == pytest.approx(gradients(reference))
+        assert [v.grad for v in x2] == pytest.approx([v.grad for v in x1])
+
+    def test_fewer_vertices_kept(self):
+        x = Vector([0.3, -0.7], requires_grad=False)
+
+        full = len(topo_sort([build_model(None)(x)[0]]))
+        checkpointed = len(topo_sort([build_model(2)(x)[0]]))
+
+        assert checkpointed < full
+
+    def test_stats(self):
+        model = build_model(2)
+        x = Vector([0.3, -0.7], requires_grad=False)
+
+        loss = square(model(x)[0] - 0.5)
+        assert model.checkpoint_stats.recomputed_vertices == 0
+
+        loss.backward()
+        stats = model.checkpoint_stats
+        assert stats.recomputed_vertices > stats.saved_vertices > 0
+
+        stats.reset()
+        assert stats.saved_vertices == stats.recomputed_vertices == 0
+
+    def test_zero_grad(self):
+        model = build_model(3)
+        loss = square(model(Vector([0.3, -0.7]))[0] - 0.5)
+
+        loss.backward()
+        loss.zero_grad()
+
+        assert all(g == 0 for g in gradients(model))
+
+    def test_static_graph(self):
+        reference = build_model(None)
+        model = build_model(2)
+
+        x = Vector([0.0, 0.0])
+        y = Vertex(0.0)
+        graph = StaticGraph(square(model(x)[0] - y), inputs=[*x, y])
+
+        for sample in ([0.3, -0.7, 0.5], [-0.2, 0.9, 1.0]):
+            loss = square(reference(Vector(sample[:2]))[0] - sample[2])
+            loss.backward()
+
+            assert graph(*sample) == pytest.approx(loss.value)
+            graph.backward()
+            assert gradients(model) == pytest.approx(gradients(reference))
+
+            loss.zero_grad()
+            graph.zero_grad()
+
+    def test_common_subexpressions(self):
+        # Outputs of a segment share their hub, but not their index
+        reference = build_model(None)
+        square(reference(Vector([0.3, -0.7]))[0] - 0.5).backward()
+
+        model = build_model(2)
+        loss = square(model(Vector([0.3, -0.7]))[0] - 0.5)
+        eliminate_common_subexpressions(loss)
+        loss.backward()
+
+        assert gradients(model) == pytest.approx(gradients(reference))
+
+    def test_partials_required(self):
+        # The hub sends its gradients as a side effect, rather than as partials
+        model = build_model(2)
+        x = Vector([0.3, -0.7])
+        loss = square(model(x)[0] - 0.5)
+        W = model.parameters["0"]["W"][0]
+
+        with pytest.raises(ValueError):
+            grad(loss, [W[0], W[1]])
+        with pytest.raises(ValueError):
+            jacobian(lambda a, b: square(model(Vector([a, b]))[0]), [0.3, -0.7])
+        with pytest.raises(ValueError):
+            sparse_jacobian(lambda a, b: model(Vector([a, b])), [0.3, -0.7])
+        with pytest.raises(ValueError):
+            IncrementalGraph(loss, inputs=list(x))
+
+    def test_backward_under_no_grad(self):
+        reference = build_model(None)
+        square(reference(Vector([0.3, -0.7]))[0] - 0.5).backward()
+
+        model = build_model(2)
+        loss = square(model(Vector([0.3, -0.7]))[0] - 0.5)
+        with no_grad():
+            loss.backward()
+
+        assert gradients(model) == pytest.approx(gradients(reference))
+
+    def test_no_grad(self):
+        model = build_model(2)
+
+        with no_grad():
+            y = model(Vector([0.3, -0.7]))[0]
+
+        assert y._op is None
+        assert y.value == pytest.approx(build_model(None)(Vector([0.3, -0.7]))[0].value)
+
+    def test_lanes(self):
+        reference = build_model(None)
+        model = build_model(2)
+        X = [[0.3, -0.7], [-0.2, 0.9]]
+
+        for m in (reference, model):
+            with LaneBatch() as batch:
+                x = Vector([batch.lanes(column) for column in zip(*X)])
+                loss = square(m(x)[0] - 0.5)
+            loss.backward()
+
+        assert gradients(model) == pytest.approx(gradients(reference))
+
+    def test_autobatch(self):
+        reference = build_model(None)
+        model = build_model(2)
+
+        for m in (reference, model):
+            with AutoBatch():
+                loss = square(m(Vector([0.3, -0.7]))[0] - 0.5)
+            loss.backward()
+
+        assert gradients(model) == pytest.approx(gradients(reference))
+
+    def test_invalid_segment_length(self):
+        with pytest.raises(ValueError):
+            Sequential([Linear(1, 1)], checkpoint=0)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])